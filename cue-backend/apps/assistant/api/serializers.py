@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from apps.assistant.models import VoiceCapture, VoiceJob
+
 
 class AssistantMessageRequestSerializer(serializers.Serializer):
     message = serializers.CharField()
@@ -30,3 +32,55 @@ class RefineTaskArtifactRequestSerializer(serializers.Serializer):
     task_id = serializers.IntegerField()
     instruction = serializers.CharField()
     timezone = serializers.CharField(required=False, allow_blank=True, max_length=64)
+
+
+class TaskStepsRequestSerializer(serializers.Serializer):
+    task_id = serializers.IntegerField()
+    max_steps = serializers.IntegerField(required=False, default=8, min_value=1, max_value=20)
+    timezone = serializers.CharField(required=False, allow_blank=True, max_length=64)
+
+
+class VoiceJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.IntegerField(source="id", read_only=True)
+
+    class Meta:
+        model = VoiceJob
+        fields = [
+            "job_id",
+            "status",
+            "result",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+
+class VoiceCaptureCreateRequestSerializer(serializers.Serializer):
+    session_id = serializers.IntegerField(required=False)
+    timezone = serializers.CharField(required=False, allow_blank=True, max_length=64)
+
+
+class VoiceChunkRequestSerializer(serializers.Serializer):
+    sequence = serializers.IntegerField(min_value=0)
+    audio = serializers.FileField()
+
+
+class VoiceCaptureFinishRequestSerializer(serializers.Serializer):
+    expected_chunks = serializers.IntegerField(required=False, min_value=0)
+
+
+class VoiceCaptureSerializer(serializers.ModelSerializer):
+    capture_id = serializers.IntegerField(source="id", read_only=True)
+    session_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = VoiceCapture
+        fields = [
+            "capture_id",
+            "session_id",
+            "status",
+            "transcript",
+            "created_at",
+            "finalized_at",
+        ]
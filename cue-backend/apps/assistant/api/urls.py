@@ -1,9 +1,35 @@
 from django.urls import path
 
-from .views import AssistantMessageView, AssistantVoiceTurnView, RefineTaskArtifactView
+from .views import (
+    AssistantMessageView,
+    AssistantVoiceJobCreateView,
+    AssistantVoiceJobDetailView,
+    AssistantVoiceTurnView,
+    RefineTaskArtifactView,
+    TaskStepsView,
+    VoiceCaptureCreateView,
+    VoiceCaptureDetailView,
+    VoiceCaptureFinishView,
+    VoiceChunkUploadView,
+)
 
 urlpatterns = [
     path("message", AssistantMessageView.as_view(), name="assistant-message"),
     path("voice-turn", AssistantVoiceTurnView.as_view(), name="assistant-voice-turn"),
+    path("voice-jobs", AssistantVoiceJobCreateView.as_view(), name="assistant-voice-job-create"),
+    path("voice-jobs/<int:job_id>", AssistantVoiceJobDetailView.as_view(), name="assistant-voice-job-detail"),
+    path("voice-sessions", VoiceCaptureCreateView.as_view(), name="assistant-voice-session-create"),
+    path("voice-sessions/<int:capture_id>", VoiceCaptureDetailView.as_view(), name="assistant-voice-session-detail"),
+    path(
+        "voice-sessions/<int:capture_id>/chunks",
+        VoiceChunkUploadView.as_view(),
+        name="assistant-voice-session-chunks",
+    ),
+    path(
+        "voice-sessions/<int:capture_id>/finish",
+        VoiceCaptureFinishView.as_view(),
+        name="assistant-voice-session-finish",
+    ),
     path("tasks/refine", RefineTaskArtifactView.as_view(), name="assistant-task-refine"),
+    path("tasks/steps", TaskStepsView.as_view(), name="assistant-task-steps"),
 ]
@@ -1,4 +1,6 @@
+from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework.views import APIView
 from rest_framework.parsers import FormParser, MultiPartParser
 
@@ -6,12 +8,26 @@ from apps.assistant.api.serializers import (
     AssistantMessageRequestSerializer,
     AssistantVoiceTurnRequestSerializer,
     RefineTaskArtifactRequestSerializer,
+    TaskStepsRequestSerializer,
+    VoiceCaptureCreateRequestSerializer,
+    VoiceCaptureFinishRequestSerializer,
+    VoiceCaptureSerializer,
+    VoiceChunkRequestSerializer,
+    VoiceJobSerializer,
 )
-from apps.assistant.models import ConversationSession
-from apps.assistant.services import AssistantOrchestrator
+from apps.assistant.models import (
+    ConversationSession,
+    VoiceCapture,
+    VoiceCaptureStatus,
+    VoiceChunk,
+    VoiceJob,
+    VoiceJobStatus,
+)
+from apps.assistant.services import AssistantOrchestrator, enqueue_voice_job, serialize_voice_turn
 from apps.core.services import get_request_user
 from apps.tasks.api.serializers import TaskSerializer
 from apps.tasks.models import Task
+from apps.tasks.services import attach_subtask_progress
 
 
 class AssistantMessageView(APIView):
@@ -64,18 +80,149 @@ class AssistantVoiceTurnView(APIView):
             session=session,
             user_timezone=serializer.validated_data.get("timezone") or getattr(request, "cue_timezone", None),
         )
-        response = result["response"]
-        speech = result.get("speech") or {}
+        return Response(serialize_voice_turn(result))
+
+
+class AssistantVoiceJobCreateView(APIView):
+    """Accepts a voice capture and processes it in a background worker."""
+
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        serializer = AssistantVoiceTurnRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = get_request_user(request)
+        session = None
+        session_id = serializer.validated_data.get("session_id")
+        if session_id:
+            session = ConversationSession.objects.filter(owner=user, id=session_id).first()
+
+        job = enqueue_voice_job(
+            user=user,
+            audio_file=serializer.validated_data["audio"],
+            session=session,
+            user_timezone=serializer.validated_data.get("timezone") or getattr(request, "cue_timezone", None),
+        )
+        status_url = reverse("assistant-voice-job-detail", kwargs={"job_id": job.id}, request=request)
         return Response(
-            {
-                "session_id": response.session_id,
-                "transcript": result["transcript"],
-                "reply": response.text,
-                "action_cards": response.action_cards,
-                "speech_audio_base64": speech.get("audio_base64"),
-                "speech_mime_type": speech.get("mime_type"),
-            }
+            {"job_id": job.id, "status": job.status, "status_url": status_url},
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": status_url},
+        )
+
+
+class AssistantVoiceJobDetailView(APIView):
+    POLL_INTERVAL_SECONDS = 1
+
+    def get(self, request, job_id: int):
+        user = get_request_user(request)
+        job = VoiceJob.objects.filter(owner=user, id=job_id).first()
+        if not job:
+            return Response({"detail": "Voice job not found."}, status=404)
+
+        headers = {}
+        if job.status in {VoiceJobStatus.QUEUED, VoiceJobStatus.PROCESSING}:
+            headers["Retry-After"] = str(self.POLL_INTERVAL_SECONDS)
+        return Response(VoiceJobSerializer(job).data, headers=headers)
+
+
+class VoiceCaptureCreateView(APIView):
+    """Opens a voice capture that accepts audio chunks while the user is still speaking."""
+
+    def post(self, request):
+        serializer = VoiceCaptureCreateRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = get_request_user(request)
+        session = None
+        session_id = serializer.validated_data.get("session_id")
+        if session_id:
+            session = ConversationSession.objects.filter(owner=user, id=session_id).first()
+
+        capture = VoiceCapture.objects.create(
+            owner=user,
+            session=session,
+            timezone=serializer.validated_data.get("timezone") or getattr(request, "cue_timezone", None) or "",
+        )
+        return Response(VoiceCaptureSerializer(capture).data, status=status.HTTP_201_CREATED)
+
+
+class VoiceCaptureDetailView(APIView):
+    def get(self, request, capture_id: int):
+        user = get_request_user(request)
+        capture = VoiceCapture.objects.filter(owner=user, id=capture_id).first()
+        if not capture:
+            return Response({"detail": "Voice capture not found."}, status=404)
+
+        data = VoiceCaptureSerializer(capture).data
+        if capture.status == VoiceCaptureStatus.OPEN:
+            data["transcript"] = AssistantOrchestrator.partial_transcript(capture)
+        data["chunks"] = list(
+            VoiceChunk.objects.filter(capture=capture)
+            .order_by("sequence")
+            .values("sequence", "transcribed_at")
+        )
+        return Response(data)
+
+
+class VoiceChunkUploadView(APIView):
+    """Chunks must be independently decodable audio segments (e.g. split on pauses)."""
+
+    orchestrator = AssistantOrchestrator()
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request, capture_id: int):
+        serializer = VoiceChunkRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = get_request_user(request)
+        capture = VoiceCapture.objects.filter(owner=user, id=capture_id).first()
+        if not capture:
+            return Response({"detail": "Voice capture not found."}, status=404)
+        if capture.status != VoiceCaptureStatus.OPEN:
+            return Response({"detail": "Voice capture is already finished."}, status=409)
+
+        chunk, created = self.orchestrator.append_voice_chunk(
+            capture=capture,
+            sequence=serializer.validated_data["sequence"],
+            audio_file=serializer.validated_data["audio"],
         )
+        if chunk is None:
+            return Response({"detail": "Voice capture is already finished."}, status=409)
+        return Response(
+            {"capture_id": capture.id, "sequence": chunk.sequence, "created": created},
+            status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK,
+        )
+
+
+class VoiceCaptureFinishView(APIView):
+    orchestrator = AssistantOrchestrator()
+
+    def post(self, request, capture_id: int):
+        serializer = VoiceCaptureFinishRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = get_request_user(request)
+        capture = VoiceCapture.objects.select_related("owner", "session").filter(owner=user, id=capture_id).first()
+        if not capture:
+            return Response({"detail": "Voice capture not found."}, status=404)
+        if capture.status != VoiceCaptureStatus.OPEN:
+            return Response({"detail": "Voice capture is already finished."}, status=409)
+
+        expected_chunks = serializer.validated_data.get("expected_chunks")
+        if expected_chunks is not None:
+            received = VoiceChunk.objects.filter(capture=capture).count()
+            if received != expected_chunks:
+                return Response(
+                    {"detail": "Not all chunks have been received.", "received_chunks": received},
+                    status=409,
+                )
+
+        result = self.orchestrator.finish_voice_capture(capture)
+        if result is None:
+            return Response({"detail": "Voice capture is already finished."}, status=409)
+        return Response(serialize_voice_turn(result))
 
 
 class RefineTaskArtifactView(APIView):
@@ -103,3 +250,32 @@ class RefineTaskArtifactView(APIView):
                 "task": TaskSerializer(result["task"]).data,
             }
         )
+
+
+class TaskStepsView(APIView):
+    orchestrator = AssistantOrchestrator()
+
+    def post(self, request):
+        serializer = TaskStepsRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user = get_request_user(request)
+        task = Task.objects.filter(owner=user, id=serializer.validated_data["task_id"]).first()
+        if not task:
+            return Response({"detail": "Task not found."}, status=404)
+
+        result = self.orchestrator.break_task_into_steps(
+            user=user,
+            task=task,
+            user_timezone=serializer.validated_data.get("timezone") or getattr(request, "cue_timezone", None),
+            max_steps=serializer.validated_data["max_steps"],
+        )
+        attach_subtask_progress([result["task"], *result["steps"]])
+        return Response(
+            {
+                "reply": result["reply"],
+                "task": TaskSerializer(result["task"]).data,
+                "steps": TaskSerializer(result["steps"], many=True).data,
+            },
+            status=201 if result["steps"] else 200,
+        )
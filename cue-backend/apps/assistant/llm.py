@@ -1,6 +1,8 @@
 import json
 import logging
 import re
+import threading
+import time
 import base64
 from datetime import datetime, timezone
 from io import BytesIO
@@ -8,6 +10,9 @@ from zoneinfo import ZoneInfo
 
 from django.conf import settings
 
+from apps.assistant.llm_cache import LLMResponseCache, fingerprint, normalize_text, timezone_day
+from apps.assistant.routing import ModelRouter, get_default_router
+
 try:
     from openai import OpenAI
 except ImportError:  # pragma: no cover
@@ -16,11 +21,32 @@ except ImportError:  # pragma: no cover
 
 logger = logging.getLogger(__name__)
 
+# Versioned planner system prompts. Add a new key rather than editing one in place so recorded
+# turns can be replayed against both versions (see the replay_turns management command).
+PLANNER_SYSTEM_PROMPTS = {
+    "v1": (
+        "You are Cue, a personal assistant that can drive backend task operations. "
+        "Interpret the user's intent and output STRICT JSON only. "
+        "Be concise and natural in reply text. "
+        "Use the provided timezone and current local time when interpreting dates/times. "
+        "When user gives a concrete date/time (for example 'Feb 19 noon'), prefer due_at_iso "
+        "instead of due_in_days, and due_at_iso must include timezone offset matching the provided timezone. "
+        "Do not invent large due_in_days values for explicit date/time requests. "
+        "For shopping/grocery/buying tasks, include metadata_json with structure like "
+        "{\"kind\":\"shopping_list\",\"shopping_list\":{\"items\":[{\"label\":\"Milk\",\"done\":false}]}}. "
+        "If user asks to add/remove shopping items, use update_task_metadata action. "
+        "If no backend write is needed, return actions as []."
+    ),
+}
+
 
 class OpenAILanguageService:
-    def __init__(self):
+    def __init__(self, cache: LLMResponseCache | None = None, router: ModelRouter | None = None):
         self.model = settings.CUE_OPENAI_MODEL
         self.client = None
+        self.cache = cache or LLMResponseCache()
+        self.router = router or get_default_router()
+        self._call_stats = threading.local()
 
         if settings.CUE_OPENAI_API_KEY and OpenAI is not None:
             self.client = OpenAI(api_key=settings.CUE_OPENAI_API_KEY)
@@ -29,14 +55,49 @@ class OpenAILanguageService:
     def enabled(self) -> bool:
         return self.client is not None
 
+    def _create_response(self, call_type: str, messages: list[dict], model: str | None = None):
+        model = model or self.router.model_for(call_type)
+        started = time.monotonic()
+        response = None
+        try:
+            response = self.client.responses.create(model=model, input=messages)
+            return response
+        finally:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            self.router.record(call_type, model, elapsed_ms)
+            usage = getattr(response, "usage", None)
+            self._call_stats.last = {
+                "call_type": call_type,
+                "model": model,
+                "elapsed_ms": elapsed_ms,
+                "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+                "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+            }
+            logger.info("OPENAI_CALL_TIMING call_type=%s model=%s elapsed_ms=%s", call_type, model, int(elapsed_ms))
+
+    def last_call_stats(self) -> dict | None:
+        """Timing and token usage of the most recent upstream call made on this thread."""
+        return getattr(self._call_stats, "last", None)
+
+    def reset_call_stats(self) -> None:
+        self._call_stats.last = None
+
     def rewrite_assistant_reply(self, draft_reply: str, user_text: str) -> str:
         if not self.enabled:
             return draft_reply
 
+        # Keyed on the routed model too, so a failover to another tier does not serve the other tier's output.
+        model = self.router.model_for("rewrite_assistant_reply")
+        cache_key = self.cache.build_key("rewrite", model, normalize_text(draft_reply), normalize_text(user_text))
+        cached = self.cache.get(cache_key)
+        if not self.cache.is_miss(cached):
+            logger.info("OPENAI_CACHE_HIT kind=rewrite")
+            return cached or draft_reply
+
         try:
-            response = self.client.responses.create(
-                model=self.model,
-                input=[
+            response = self._create_response(
+                "rewrite_assistant_reply",
+                [
                     {
                         "role": "system",
                         "content": (
@@ -53,9 +114,12 @@ class OpenAILanguageService:
                         ),
                     },
                 ],
+                model=model,
             )
-            rewritten = getattr(response, "output_text", "") or ""
-            return rewritten.strip() or draft_reply
+            rewritten = (getattr(response, "output_text", "") or "").strip()
+            if rewritten:
+                self.cache.set(cache_key, rewritten)
+            return rewritten or draft_reply
         except Exception:
             logger.exception("OpenAI rewrite failed, using deterministic reply")
             return draft_reply
@@ -64,10 +128,17 @@ class OpenAILanguageService:
         if not self.enabled:
             return None
 
+        model = self.router.model_for("extract_task_title")
+        cache_key = self.cache.build_key("extract_title", model, normalize_text(text))
+        cached = self.cache.get(cache_key)
+        if not self.cache.is_miss(cached):
+            logger.info("OPENAI_CACHE_HIT kind=extract_title")
+            return cached
+
         try:
-            response = self.client.responses.create(
-                model=self.model,
-                input=[
+            response = self._create_response(
+                "extract_task_title",
+                [
                     {
                         "role": "system",
                         "content": (
@@ -80,11 +151,12 @@ class OpenAILanguageService:
                         "content": text,
                     },
                 ],
+                model=model,
             )
             output = (getattr(response, "output_text", "") or "").strip()
-            if not output or output.upper() == "NONE":
-                return None
-            return output[:200]
+            title = None if not output or output.upper() == "NONE" else output[:200]
+            self.cache.set(cache_key, title)
+            return title
         except Exception:
             logger.exception("OpenAI extraction failed")
             return None
@@ -95,10 +167,34 @@ class OpenAILanguageService:
         recent_messages: list[dict],
         tasks: list[dict],
         timezone_name: str = "UTC",
+        prompt_version: str | None = None,
     ) -> dict | None:
         if not self.enabled:
             return None
 
+        prompt_version = prompt_version or settings.CUE_PLANNER_PROMPT_VERSION
+        if prompt_version not in PLANNER_SYSTEM_PROMPTS:
+            logger.warning("OPENAI_PLAN_UNKNOWN_PROMPT_VERSION version=%s", prompt_version)
+            prompt_version = "v1"
+
+        # Keyed on the routed model, the normalized text, the conversation and task context and the user's
+        # local day; only read-only plans are stored, so a cache hit can never replay a write.
+        model = self.router.model_for("plan_turn")
+        cache_key = self.cache.build_key(
+            "plan",
+            model,
+            prompt_version,
+            normalize_text(user_text),
+            fingerprint(recent_messages),
+            fingerprint(tasks),
+            timezone_name,
+            timezone_day(timezone_name),
+        )
+        cached = self.cache.get(cache_key)
+        if isinstance(cached, dict) and not cached.get("actions"):
+            logger.info("OPENAI_CACHE_HIT kind=plan timezone=%s task_count=%s", timezone_name, len(tasks))
+            return {**cached, "actions": []}
+
         now_local = datetime.now(ZoneInfo(timezone_name))
         prompt_payload = {
             "timezone": timezone_name,
@@ -155,39 +251,28 @@ class OpenAILanguageService:
         try:
             logger.info(
                 "OPENAI_PLAN_REQUEST model=%s timezone=%s user_text=%s recent_messages=%s task_count=%s",
-                self.model,
+                model,
                 timezone_name,
                 user_text[:300],
                 len(recent_messages),
                 len(tasks),
             )
-            response = self.client.responses.create(
-                model=self.model,
-                input=[
+            response = self._create_response(
+                "plan_turn",
+                [
                     {
                         "role": "system",
-                        "content": (
-                            "You are Cue, a personal assistant that can drive backend task operations. "
-                            "Interpret the user's intent and output STRICT JSON only. "
-                            "Be concise and natural in reply text. "
-                            "Use the provided timezone and current local time when interpreting dates/times. "
-                            "When user gives a concrete date/time (for example 'Feb 19 noon'), prefer due_at_iso "
-                            "instead of due_in_days, and due_at_iso must include timezone offset matching the provided timezone. "
-                            "Do not invent large due_in_days values for explicit date/time requests. "
-                            "For shopping/grocery/buying tasks, include metadata_json with structure like "
-                            "{\"kind\":\"shopping_list\",\"shopping_list\":{\"items\":[{\"label\":\"Milk\",\"done\":false}]}}. "
-                            "If user asks to add/remove shopping items, use update_task_metadata action. "
-                            "If no backend write is needed, return actions as []."
-                        ),
+                        "content": PLANNER_SYSTEM_PROMPTS[prompt_version],
                     },
                     {
                         "role": "user",
                         "content": json.dumps(prompt_payload, ensure_ascii=False),
                     },
                 ],
+                model=model,
             )
             output = (getattr(response, "output_text", "") or "").strip()
-            logger.info("OPENAI_PLAN_RAW_RESPONSE model=%s output=%s", self.model, output[:1000])
+            logger.info("OPENAI_PLAN_RAW_RESPONSE model=%s output=%s", model, output[:1000])
             payload = self._extract_json_object(output)
             if not isinstance(payload, dict):
                 logger.warning("OPENAI_PLAN_PARSE_FAILED output=%s", output[:1000])
@@ -197,10 +282,15 @@ class OpenAILanguageService:
             actions = payload.get("actions")
             if not isinstance(reply, str) or not isinstance(actions, list):
                 return None
-            return {
+            plan = {
                 "reply": reply.strip(),
                 "actions": actions,
+                "model": model,
+                "prompt_version": prompt_version,
             }
+            if not actions:
+                self.cache.set(cache_key, plan)
+            return plan
         except Exception:
             logger.exception("OpenAI planning failed")
             return None
@@ -294,9 +384,9 @@ class OpenAILanguageService:
         }
 
         try:
-            response = self.client.responses.create(
-                model=self.model,
-                input=[
+            response = self._create_response(
+                "build_task_render_spec",
+                [
                     {
                         "role": "system",
                         "content": (
@@ -359,9 +449,9 @@ class OpenAILanguageService:
         }
 
         try:
-            response = self.client.responses.create(
-                model=self.model,
-                input=[
+            response = self._create_response(
+                "refine_task_artifact",
+                [
                     {
                         "role": "system",
                         "content": (
@@ -395,6 +485,64 @@ class OpenAILanguageService:
             logger.exception("OpenAI artifact refinement failed")
             return None
 
+    def break_task_into_steps(self, task_payload: dict, timezone_name: str = "UTC", max_steps: int = 8) -> dict | None:
+        if not self.enabled:
+            return None
+
+        prompt_payload = {
+            "timezone": timezone_name,
+            "task": task_payload,
+            "max_steps": max_steps,
+            "output_contract": {
+                "reply": "string",
+                "steps": [{"title": "string", "estimated_minutes": "int_optional"}],
+            },
+        }
+
+        try:
+            response = self._create_response(
+                "break_task_into_steps",
+                [
+                    {
+                        "role": "system",
+                        "content": (
+                            "You break one task into small, concrete steps in the order they should be done. "
+                            "Return STRICT JSON only with reply + steps. "
+                            "Each step title is a short imperative phrase."
+                        ),
+                    },
+                    {
+                        "role": "user",
+                        "content": json.dumps(prompt_payload, ensure_ascii=False),
+                    },
+                ],
+            )
+            output = (getattr(response, "output_text", "") or "").strip()
+            payload = self._extract_json_object(output)
+            if not isinstance(payload, dict) or not isinstance(payload.get("steps"), list):
+                logger.warning("OPENAI_STEPS_PARSE_FAILED output=%s", output[:1000])
+                return None
+
+            steps = []
+            for step in payload["steps"][:max_steps]:
+                if not isinstance(step, dict) or not isinstance(step.get("title"), str) or not step["title"].strip():
+                    continue
+                minutes = step.get("estimated_minutes")
+                steps.append(
+                    {
+                        "title": step["title"].strip()[:200],
+                        "estimated_minutes": min(max(minutes, 5), 480) if isinstance(minutes, int) else None,
+                    }
+                )
+            reply = payload.get("reply")
+            return {
+                "reply": reply.strip() if isinstance(reply, str) else "",
+                "steps": steps,
+            }
+        except Exception:
+            logger.exception("OpenAI step breakdown failed")
+            return None
+
     @staticmethod
     def _extract_json_object(raw: str):
         raw = raw.strip()
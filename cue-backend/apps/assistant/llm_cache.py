@@ -0,0 +1,73 @@
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_MISS = object()
+
+
+def normalize_text(text: str) -> str:
+    normalized = _WHITESPACE_PATTERN.sub(" ", (text or "").casefold()).strip()
+    return normalized.rstrip(" ?!.")
+
+
+def fingerprint(value) -> str:
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def timezone_day(timezone_name: str) -> str:
+    try:
+        tz = ZoneInfo(timezone_name)
+    except Exception:
+        tz = ZoneInfo("UTC")
+    return datetime.now(tz).date().isoformat()
+
+
+class LLMResponseCache:
+    """Opt-in TTL cache for LLM calls whose output only depends on their inputs."""
+
+    KEY_PREFIX = "cue:llm"
+
+    def __init__(self, enabled: bool | None = None, ttl_seconds: int | None = None, alias: str | None = None):
+        self.enabled = settings.CUE_LLM_CACHE_ENABLED if enabled is None else enabled
+        self.ttl_seconds = settings.CUE_LLM_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.alias = alias or settings.CUE_LLM_CACHE_ALIAS
+
+    def build_key(self, kind: str, *parts) -> str:
+        return f"{self.KEY_PREFIX}:{kind}:{fingerprint(parts)}"
+
+    def get(self, key: str):
+        """Return the cached value, or the module-level miss sentinel when absent."""
+        if not self.enabled:
+            return _MISS
+        try:
+            entry = caches[self.alias].get(key)
+        except Exception:
+            logger.exception("LLM cache read failed key=%s", key)
+            return _MISS
+        if not isinstance(entry, dict) or "value" not in entry:
+            return _MISS
+        return entry["value"]
+
+    def set(self, key: str, value) -> None:
+        if not self.enabled:
+            return
+        try:
+            # Wrap values so that a cached None (e.g. "no task found") is distinguishable from a miss.
+            caches[self.alias].set(key, {"value": value}, timeout=self.ttl_seconds)
+        except Exception:
+            logger.exception("LLM cache write failed key=%s", key)
+
+    @staticmethod
+    def is_miss(value) -> bool:
+        return value is _MISS
@@ -0,0 +1,82 @@
+import json
+from datetime import datetime, time as dt_time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.assistant.replay import DEFAULT_TOKEN_PRICES, ReplayReport, build_planner, iter_recorded_turns
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay recorded assistant turns offline against one or more planner variants and report "
+        "latency percentiles, token cost, parse-failure rate and action agreement with the original turn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--variant",
+            action="append",
+            dest="variants",
+            help="Planner variant: 'rules' or 'llm[:model[:prompt_version]]'. Repeatable. Defaults to 'llm'.",
+        )
+        parser.add_argument("--limit", type=int, default=200, help="Maximum number of turns to replay.")
+        parser.add_argument("--since", help="Only replay turns recorded on or after this date (YYYY-MM-DD).")
+        parser.add_argument("--user-id", type=int, help="Only replay turns from this user's sessions.")
+        parser.add_argument(
+            "--price",
+            action="append",
+            default=[],
+            help="Token price override as MODEL=INPUT_USD_PER_MTOK:OUTPUT_USD_PER_MTOK. Repeatable.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        try:
+            planners = [build_planner(spec) for spec in (options["variants"] or ["llm"])]
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        prices = dict(DEFAULT_TOKEN_PRICES)
+        for raw in options["price"]:
+            try:
+                model, rates = raw.split("=", 1)
+                input_rate, output_rate = rates.split(":", 1)
+                prices[model] = (float(input_rate), float(output_rate))
+            except ValueError as exc:
+                raise CommandError(f"Invalid --price value: {raw}") from exc
+
+        since = None
+        if options["since"]:
+            try:
+                since = timezone.make_aware(
+                    datetime.combine(datetime.strptime(options["since"], "%Y-%m-%d").date(), dt_time.min)
+                )
+            except ValueError as exc:
+                raise CommandError("--since must be YYYY-MM-DD") from exc
+
+        reports = [ReplayReport(variant=planner.name, prices=prices) for planner in planners]
+        turns = iter_recorded_turns(since=since, user_id=options["user_id"])
+        for index, turn in enumerate(turns):
+            if index >= options["limit"]:
+                break
+            for planner, report in zip(planners, reports):
+                report.add(turn, planner.replay(turn))
+
+        results = [report.as_dict() for report in reports]
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for result in results:
+            latency = result["latency_ms"]
+            self.stdout.write(
+                f"{result['variant']}: turns={result['turns']} "
+                f"p50={latency['p50']}ms p90={latency['p90']}ms p95={latency['p95']}ms p99={latency['p99']}ms "
+                f"tokens_in={result['input_tokens']} tokens_out={result['output_tokens']} "
+                f"cost_usd={result['cost_usd']} parse_failure_rate={result['parse_failure_rate']} "
+                f"action_agreement={result['action_agreement']} "
+                f"action_type_agreement={result['action_type_agreement']}"
+            )
+            if result["unpriced_models"]:
+                self.stdout.write(f"  no price configured for: {', '.join(result['unpriced_models'])}")
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:35
+
+import apps.core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant', '0003_voice_capture'),
+    ]
+
+    operations = [
+        apps.core.fields.AlterToCompressedField(
+            model_name='conversationmessage',
+            name='payload',
+            field=apps.core.fields.CompressedJSONField(blank=True, default=dict),
+        ),
+    ]
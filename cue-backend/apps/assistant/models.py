@@ -1,6 +1,8 @@
 from django.conf import settings
 from django.db import models
 
+from apps.core.fields import CompressedJSONField
+
 
 class ConversationSession(models.Model):
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -17,7 +19,7 @@ class ConversationMessage(models.Model):
     )
     role = models.CharField(max_length=16)
     content = models.TextField()
-    payload = models.JSONField(default=dict, blank=True)
+    payload = CompressedJSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
 
@@ -43,3 +45,66 @@ class Nudge(models.Model):
 
     class Meta:
         ordering = ["-scheduled_at"]
+
+
+class VoiceJobStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    PROCESSING = "processing", "Processing"
+    SUCCEEDED = "succeeded", "Succeeded"
+    FAILED = "failed", "Failed"
+
+
+class VoiceJob(models.Model):
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="voice_jobs")
+    session = models.ForeignKey(ConversationSession, null=True, blank=True, on_delete=models.SET_NULL)
+    status = models.CharField(max_length=16, choices=VoiceJobStatus.choices, default=VoiceJobStatus.QUEUED)
+    audio = models.FileField(upload_to="voice_jobs/%Y/%m/%d/", blank=True)
+    timezone = models.CharField(max_length=64, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["owner", "-created_at"]),
+        ]
+
+
+class VoiceCaptureStatus(models.TextChoices):
+    OPEN = "open", "Open"
+    FINALIZED = "finalized", "Finalized"
+
+
+class VoiceCapture(models.Model):
+    """A voice message uploaded in chunks while the user is still speaking."""
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="voice_captures")
+    session = models.ForeignKey(ConversationSession, null=True, blank=True, on_delete=models.SET_NULL)
+    status = models.CharField(max_length=16, choices=VoiceCaptureStatus.choices, default=VoiceCaptureStatus.OPEN)
+    timezone = models.CharField(max_length=64, blank=True)
+    transcript = models.TextField(blank=True)
+    finalized_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+
+class VoiceChunk(models.Model):
+    capture = models.ForeignKey(VoiceCapture, on_delete=models.CASCADE, related_name="chunks")
+    sequence = models.PositiveIntegerField()
+    audio = models.FileField(upload_to="voice_chunks/%Y/%m/%d/", blank=True)
+    transcript = models.TextField(blank=True)
+    transcribed_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["sequence"]
+        constraints = [
+            models.UniqueConstraint(fields=["capture", "sequence"], name="assistant_voicechunk_unique_sequence"),
+        ]
@@ -0,0 +1,240 @@
+"""Offline replay of recorded assistant turns against alternative planners."""
+
+import math
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from apps.assistant.llm import OpenAILanguageService
+from apps.assistant.llm_cache import LLMResponseCache, normalize_text
+from apps.assistant.models import ConversationMessage
+from apps.assistant.routing import ModelRouter
+from apps.assistant.services import AssistantOrchestrator
+
+
+# USD per million tokens as (input, output). Override per run with --price.
+DEFAULT_TOKEN_PRICES = {
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+
+@dataclass
+class RecordedTurn:
+    message_id: int
+    session_id: int
+    user_text: str
+    recent_messages: list[dict]
+    timezone_name: str
+    task_context: list[dict]
+    original_path: str
+    original_actions: list[dict]
+
+
+@dataclass
+class ReplayResult:
+    plan: dict | None
+    elapsed_ms: float
+    model: str | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+def iter_recorded_turns(
+    since: datetime | None = None,
+    user_id: int | None = None,
+    history_size: int = 10,
+    include_uncaptured: bool = False,
+):
+    """Yield user turns paired with the context captured on the assistant reply that followed them.
+
+    Turns answered before task context was captured (or by the rules path) carry no task context
+    and are skipped unless ``include_uncaptured`` is set.
+    """
+    messages = ConversationMessage.objects.order_by("session_id", "created_at", "id").only(
+        "id",
+        "session_id",
+        "role",
+        "content",
+        "payload",
+        "created_at",
+    )
+    if since:
+        messages = messages.filter(created_at__gte=since)
+    if user_id:
+        messages = messages.filter(session__owner_id=user_id)
+
+    current_session = None
+    history: deque = deque(maxlen=history_size)
+    pending_user = None
+
+    for message in messages.iterator(chunk_size=500):
+        if message.session_id != current_session:
+            current_session = message.session_id
+            history.clear()
+            pending_user = None
+
+        if message.role == "user":
+            history.append({"role": "user", "content": message.content})
+            pending_user = (message, list(history))
+            continue
+
+        history.append({"role": message.role, "content": message.content})
+        if message.role != "assistant" or pending_user is None:
+            continue
+
+        user_message, recent_messages = pending_user
+        pending_user = None
+        turn = (message.payload or {}).get("turn") if isinstance(message.payload, dict) else None
+        if not isinstance(turn, dict):
+            if include_uncaptured:
+                turn = {}
+            else:
+                continue
+        task_context = turn.get("task_context")
+        if not isinstance(task_context, list):
+            if not include_uncaptured:
+                continue
+            task_context = []
+
+        yield RecordedTurn(
+            message_id=user_message.id,
+            session_id=user_message.session_id,
+            user_text=user_message.content,
+            recent_messages=recent_messages,
+            timezone_name=turn.get("timezone") or "UTC",
+            task_context=task_context,
+            original_path=turn.get("path") or "unknown",
+            original_actions=turn.get("actions") if isinstance(turn.get("actions"), list) else [],
+        )
+
+
+class LLMReplayPlanner:
+    def __init__(self, model: str | None = None, prompt_version: str | None = None):
+        if model:
+            router = ModelRouter(tiers={"planner": model}, routes={"plan_turn": ["planner"]})
+        else:
+            router = ModelRouter()
+        self.prompt_version = prompt_version
+        self.service = OpenAILanguageService(cache=LLMResponseCache(enabled=False), router=router)
+        self.name = ":".join(part for part in ["llm", model or "", prompt_version or ""] if part) or "llm"
+
+    def replay(self, turn: RecordedTurn) -> ReplayResult:
+        self.service.reset_call_stats()
+        started = time.monotonic()
+        plan = self.service.plan_turn(
+            user_text=turn.user_text,
+            recent_messages=turn.recent_messages,
+            tasks=turn.task_context,
+            timezone_name=turn.timezone_name,
+            prompt_version=self.prompt_version,
+        )
+        elapsed_ms = (time.monotonic() - started) * 1000
+        stats = self.service.last_call_stats() or {}
+        return ReplayResult(
+            plan=plan,
+            elapsed_ms=elapsed_ms,
+            model=stats.get("model"),
+            input_tokens=stats.get("input_tokens", 0),
+            output_tokens=stats.get("output_tokens", 0),
+        )
+
+
+class RulesReplayPlanner:
+    """Deterministic fast path: the intent regex used by the rules fallback, without any LLM call."""
+
+    name = "rules"
+
+    def replay(self, turn: RecordedTurn) -> ReplayResult:
+        started = time.monotonic()
+        title = AssistantOrchestrator._extract_task_title(turn.user_text)
+        actions = [{"type": "create_task", "title": title}] if title else []
+        elapsed_ms = (time.monotonic() - started) * 1000
+        return ReplayResult(plan={"reply": "", "actions": actions}, elapsed_ms=elapsed_ms)
+
+
+def build_planner(spec: str):
+    """Build a planner from ``rules`` or ``llm[:model[:prompt_version]]``."""
+    parts = spec.split(":")
+    if parts[0] == "rules":
+        return RulesReplayPlanner()
+    if parts[0] != "llm":
+        raise ValueError(f"Unknown planner variant: {spec}")
+    model = parts[1] if len(parts) > 1 and parts[1] else None
+    prompt_version = parts[2] if len(parts) > 2 and parts[2] else None
+    return LLMReplayPlanner(model=model, prompt_version=prompt_version)
+
+
+def action_signature(action) -> tuple[str, str] | None:
+    if not isinstance(action, dict):
+        return None
+    target = action.get("task_id") or action.get("title") or action.get("title_contains") or ""
+    return (str(action.get("type") or ""), normalize_text(str(target)))
+
+
+def percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+@dataclass
+class ReplayReport:
+    variant: str
+    prices: dict = field(default_factory=lambda: dict(DEFAULT_TOKEN_PRICES))
+    turns: int = 0
+    failures: int = 0
+    exact_agreement: int = 0
+    type_agreement: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    unpriced_models: set = field(default_factory=set)
+    latencies_ms: list = field(default_factory=list)
+
+    def add(self, turn: RecordedTurn, result: ReplayResult) -> None:
+        self.turns += 1
+        self.latencies_ms.append(result.elapsed_ms)
+        self.input_tokens += result.input_tokens
+        self.output_tokens += result.output_tokens
+        if result.model and (result.input_tokens or result.output_tokens):
+            price = self.prices.get(result.model)
+            if price:
+                self.cost_usd += (result.input_tokens * price[0] + result.output_tokens * price[1]) / 1_000_000
+            else:
+                self.unpriced_models.add(result.model)
+
+        if result.plan is None:
+            self.failures += 1
+            return
+
+        replayed = [action_signature(action) for action in result.plan.get("actions", [])]
+        original = [action_signature(action) for action in turn.original_actions]
+        if Counter(replayed) == Counter(original):
+            self.exact_agreement += 1
+        if Counter(sig[0] for sig in replayed if sig) == Counter(sig[0] for sig in original if sig):
+            self.type_agreement += 1
+
+    def as_dict(self) -> dict:
+        def rate(count: int) -> float:
+            return round(count / self.turns, 4) if self.turns else 0.0
+
+        return {
+            "variant": self.variant,
+            "turns": self.turns,
+            "latency_ms": {
+                f"p{pct}": round(value, 1) if value is not None else None
+                for pct, value in ((pct, percentile(self.latencies_ms, pct)) for pct in (50, 90, 95, 99))
+            },
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "unpriced_models": sorted(self.unpriced_models),
+            "parse_failure_rate": rate(self.failures),
+            "action_agreement": rate(self.exact_agreement),
+            "action_type_agreement": rate(self.type_agreement),
+        }
@@ -0,0 +1,96 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+_default_router = None
+_default_router_lock = threading.Lock()
+
+
+class ModelRouter:
+    """Maps each LLM call type to an ordered list of model tiers.
+
+    The first tier of a route is the primary. When its observed p95 latency for that call type
+    exceeds the failover threshold, the next tier is used instead. Samples older than the window
+    expire, so a recovered primary is retried automatically.
+    """
+
+    def __init__(
+        self,
+        tiers: dict[str, str] | None = None,
+        routes: dict[str, list[str]] | None = None,
+        failover_p95_ms: int | None = None,
+        window_seconds: int | None = None,
+        min_samples: int | None = None,
+    ):
+        self.tiers = tiers if tiers is not None else dict(settings.CUE_OPENAI_MODEL_TIERS)
+        self.routes = routes if routes is not None else dict(settings.CUE_OPENAI_MODEL_ROUTES)
+        self.failover_p95_ms = (
+            settings.CUE_OPENAI_FAILOVER_P95_MS if failover_p95_ms is None else failover_p95_ms
+        )
+        self.window_seconds = (
+            settings.CUE_OPENAI_LATENCY_WINDOW_SECONDS if window_seconds is None else window_seconds
+        )
+        self.min_samples = settings.CUE_OPENAI_LATENCY_MIN_SAMPLES if min_samples is None else min_samples
+        self._samples: dict[tuple[str, str], deque] = {}
+        self._lock = threading.Lock()
+
+    def models_for(self, call_type: str) -> list[str]:
+        tier_names = self.routes.get(call_type) or ["planner"]
+        models = []
+        for tier_name in tier_names:
+            model = self.tiers.get(tier_name)
+            if model and model not in models:
+                models.append(model)
+        return models or [settings.CUE_OPENAI_MODEL]
+
+    def model_for(self, call_type: str) -> str:
+        models = self.models_for(call_type)
+        for model in models[:-1]:
+            p95 = self.p95_ms(call_type, model)
+            if p95 is None or p95 <= self.failover_p95_ms:
+                return model
+            logger.warning(
+                "OPENAI_ROUTE_FAILOVER call_type=%s model=%s p95_ms=%s threshold_ms=%s",
+                call_type,
+                model,
+                int(p95),
+                self.failover_p95_ms,
+            )
+        return models[-1]
+
+    def record(self, call_type: str, model: str, elapsed_ms: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            samples = self._samples.setdefault((call_type, model), deque(maxlen=200))
+            samples.append((now, elapsed_ms))
+
+    def p95_ms(self, call_type: str, model: str) -> float | None:
+        cutoff = time.monotonic() - self.window_seconds
+        with self._lock:
+            samples = self._samples.get((call_type, model))
+            if not samples:
+                return None
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+            values = sorted(elapsed for _, elapsed in samples)
+
+        if len(values) < self.min_samples:
+            return None
+        index = max(math.ceil(0.95 * len(values)) - 1, 0)
+        return values[index]
+
+
+def get_default_router() -> ModelRouter:
+    """Process-wide router so latency samples are shared by every service instance."""
+    global _default_router
+    with _default_router_lock:
+        if _default_router is None:
+            _default_router = ModelRouter()
+        return _default_router
@@ -6,14 +6,37 @@ import time
 from zoneinfo import ZoneInfo
 
 from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.utils.dateparse import parse_datetime
 from django.utils import timezone
 
 from apps.assistant.llm import OpenAILanguageService
-from apps.assistant.models import AssistantDecisionLog, ConversationMessage, ConversationSession, Nudge
+from apps.assistant.models import (
+    AssistantDecisionLog,
+    ConversationMessage,
+    ConversationSession,
+    Nudge,
+    VoiceCapture,
+    VoiceCaptureStatus,
+    VoiceChunk,
+    VoiceJob,
+    VoiceJobStatus,
+)
+from apps.assistant.tasks import process_voice_job, transcribe_voice_chunk
+from apps.assistant.transcribers import get_transcriber
 from apps.preferences.services import get_or_create_preferences, is_within_quiet_hours
+from apps.tasks.dedup import near_duplicate_id
 from apps.tasks.models import Task
-from apps.tasks.services import log_task_activity, prioritized_tasks_for_user, task_priority_score
+from apps.tasks.renderers import render_summary, render_task_spec
+from apps.tasks.metadata import get_items
+from apps.tasks.services import (
+    after_task_write,
+    create_subtasks,
+    log_task_activity,
+    merge_into_duplicate,
+    prioritized_tasks_for_user,
+    task_snapshot,
+)
 
 
 TASK_INTENT_PATTERN = re.compile(r"(don't forget to|remember to|need to|todo:?)\\s+(.+)", re.IGNORECASE)
@@ -27,6 +50,49 @@ class AssistantResponse:
     action_cards: list[dict]
 
 
+def serialize_voice_turn(result: dict) -> dict:
+    response = result["response"]
+    speech = result.get("speech") or {}
+    return {
+        "session_id": response.session_id,
+        "transcript": result["transcript"],
+        "reply": response.text,
+        "action_cards": response.action_cards,
+        "speech_audio_base64": speech.get("audio_base64"),
+        "speech_mime_type": speech.get("mime_type"),
+    }
+
+
+def enqueue_voice_job(
+    user,
+    audio_file,
+    session: ConversationSession | None = None,
+    user_timezone: str | None = None,
+) -> VoiceJob:
+    job = VoiceJob.objects.create(
+        owner=user,
+        session=session,
+        audio=audio_file,
+        timezone=user_timezone or "",
+    )
+
+    def dispatch():
+        try:
+            process_voice_job.delay(job.id)
+        except Exception as exc:
+            logger.exception("ASSISTANT_VOICE_JOB_ENQUEUE_FAILED job_id=%s", job.id)
+            VoiceJob.objects.filter(id=job.id, status=VoiceJobStatus.QUEUED).update(
+                status=VoiceJobStatus.FAILED,
+                error=f"Could not queue voice job: {exc}"[:2000],
+                finished_at=timezone.now(),
+                updated_at=timezone.now(),
+            )
+
+    transaction.on_commit(dispatch)
+    logger.info("ASSISTANT_VOICE_JOB_QUEUED user_id=%s job_id=%s", user.id, job.id)
+    return job
+
+
 class NudgeEngine:
     def evaluate(self, user, now=None):
         now = now or timezone.now()
@@ -40,7 +106,7 @@ class NudgeEngine:
             if task.snoozed_until and task.snoozed_until > now:
                 continue
 
-            score = task_priority_score(task)
+            score = task.priority_score
             if score < 8:
                 continue
 
@@ -61,6 +127,7 @@ class AssistantOrchestrator:
     def __init__(self):
         self.nudge_engine = NudgeEngine()
         self.language_service = OpenAILanguageService()
+        self.transcriber = get_transcriber(self.language_service)
 
     def process_message(
         self,
@@ -115,11 +182,29 @@ class AssistantOrchestrator:
     ) -> dict:
         timezone_name = self._resolve_user_timezone(user, user_timezone)
         started = time.monotonic()
-        transcript = self.language_service.transcribe_audio(
-            audio_file=audio_file,
+        transcript = self.transcriber.transcribe(
+            audio_file,
             filename=getattr(audio_file, "name", "voice.m4a"),
         )
         transcribe_ms = int((time.monotonic() - started) * 1000)
+        return self._respond_to_voice_transcript(
+            user=user,
+            transcript=transcript,
+            session=session,
+            timezone_name=timezone_name,
+            started=started,
+            transcribe_ms=transcribe_ms,
+        )
+
+    def _respond_to_voice_transcript(
+        self,
+        user,
+        transcript: str | None,
+        session: ConversationSession | None,
+        timezone_name: str,
+        started: float,
+        transcribe_ms: int,
+    ) -> dict:
         if not transcript:
             safe_session = session or ConversationSession.objects.create(owner=user, title="Cue Assistant")
             logger.warning(
@@ -163,6 +248,175 @@ class AssistantOrchestrator:
             "speech": speech,
         }
 
+    def append_voice_chunk(self, capture: VoiceCapture, sequence: int, audio_file) -> tuple[VoiceChunk | None, bool]:
+        """Store one chunk append-only and queue its transcription. Re-sent sequences are ignored.
+
+        Returns ``(None, False)`` when the capture was finished meanwhile; the chunk is not stored.
+        """
+        with transaction.atomic():
+            # Holding the capture row keeps finish_voice_capture from claiming it until this chunk is in.
+            still_open = VoiceCapture.objects.select_for_update().filter(id=capture.id, status=VoiceCaptureStatus.OPEN)
+            if not still_open.exists():
+                return None, False
+            existing = VoiceChunk.objects.filter(capture=capture, sequence=sequence).first()
+            if existing:
+                return existing, False
+
+            chunk = VoiceChunk(capture=capture, sequence=sequence, audio=audio_file)
+            try:
+                with transaction.atomic():
+                    chunk.save()
+            except IntegrityError:
+                # The same sequence was stored concurrently; keep that one and drop this upload's file.
+                if chunk.audio:
+                    chunk.audio.delete(save=False)
+                return VoiceChunk.objects.get(capture=capture, sequence=sequence), False
+            transaction.on_commit(lambda: self._dispatch_chunk_transcription(chunk.id))
+        return chunk, True
+
+    @staticmethod
+    def _dispatch_chunk_transcription(chunk_id: int):
+        try:
+            transcribe_voice_chunk.delay(chunk_id)
+        except Exception:
+            # The chunk is transcribed inline when the capture is finished instead.
+            logger.exception("ASSISTANT_VOICE_CHUNK_ENQUEUE_FAILED chunk_id=%s", chunk_id)
+
+    def transcribe_voice_chunk(self, chunk_id: int) -> VoiceChunk | None:
+        chunk = VoiceChunk.objects.filter(id=chunk_id, transcribed_at__isnull=True).first()
+        if not chunk:
+            return None
+
+        started = time.monotonic()
+        with chunk.audio.open("rb") as audio_file:
+            transcript = self.transcriber.transcribe(audio_file, filename=chunk.audio.name)
+        chunk.transcript = (transcript or "").strip()
+        chunk.transcribed_at = timezone.now()
+        VoiceChunk.objects.filter(id=chunk.id, transcribed_at__isnull=True).update(
+            transcript=chunk.transcript,
+            transcribed_at=chunk.transcribed_at,
+        )
+        logger.info(
+            "ASSISTANT_VOICE_CHUNK_TRANSCRIBED capture_id=%s sequence=%s transcribe_ms=%s",
+            chunk.capture_id,
+            chunk.sequence,
+            int((time.monotonic() - started) * 1000),
+        )
+        return chunk
+
+    @staticmethod
+    def partial_transcript(capture: VoiceCapture) -> str:
+        parts = (
+            VoiceChunk.objects.filter(capture=capture, transcribed_at__isnull=False)
+            .order_by("sequence")
+            .values_list("transcript", flat=True)
+        )
+        return " ".join(part for part in parts if part).strip()
+
+    def finish_voice_capture(self, capture: VoiceCapture) -> dict | None:
+        """Transcribe whatever the worker has not reached yet, then run the normal voice turn.
+
+        Returns None when the capture is no longer open (e.g. a concurrent or retried finish claimed it).
+        """
+        now = timezone.now()
+        # Claim the capture atomically so a retried finish cannot run the turn twice; chunks arriving
+        # after the claim are rejected by append_voice_chunk.
+        claimed = VoiceCapture.objects.filter(id=capture.id, status=VoiceCaptureStatus.OPEN).update(
+            status=VoiceCaptureStatus.FINALIZED,
+            finalized_at=now,
+            updated_at=now,
+        )
+        if not claimed:
+            logger.info("ASSISTANT_VOICE_CAPTURE_FINISH_SKIPPED capture_id=%s", capture.id)
+            return None
+
+        timezone_name = self._resolve_user_timezone(capture.owner, capture.timezone or None)
+        started = time.monotonic()
+        pending_ids = list(
+            VoiceChunk.objects.filter(capture=capture, transcribed_at__isnull=True).values_list("id", flat=True)
+        )
+        try:
+            for chunk_id in pending_ids:
+                self.transcribe_voice_chunk(chunk_id)
+        except Exception:
+            # Nothing was answered yet, so release the claim and let the client retry the finish.
+            VoiceCapture.objects.filter(id=capture.id).update(
+                status=VoiceCaptureStatus.OPEN,
+                finalized_at=None,
+                updated_at=timezone.now(),
+            )
+            raise
+        transcript = self.partial_transcript(capture)
+        transcribe_ms = int((time.monotonic() - started) * 1000)
+
+        capture.status = VoiceCaptureStatus.FINALIZED
+        capture.transcript = transcript
+        capture.finalized_at = now
+        capture.save(update_fields=["status", "transcript", "finalized_at", "updated_at"])
+        for chunk in VoiceChunk.objects.filter(capture=capture).exclude(audio=""):
+            chunk.audio.delete(save=False)
+        VoiceChunk.objects.filter(capture=capture).update(audio="")
+
+        logger.info(
+            "ASSISTANT_VOICE_CAPTURE_FINISHED capture_id=%s pending_chunks=%s finish_transcribe_ms=%s",
+            capture.id,
+            len(pending_ids),
+            transcribe_ms,
+        )
+        result = self._respond_to_voice_transcript(
+            user=capture.owner,
+            transcript=transcript,
+            session=capture.session,
+            timezone_name=timezone_name,
+            started=started,
+            transcribe_ms=transcribe_ms,
+        )
+        if capture.session_id is None:
+            VoiceCapture.objects.filter(id=capture.id).update(session_id=result["response"].session_id)
+        return result
+
+    def process_voice_job(self, job_id: int) -> VoiceJob | None:
+        now = timezone.now()
+        # Claim the job atomically so a redelivered message cannot process it twice.
+        claimed = VoiceJob.objects.filter(id=job_id, status=VoiceJobStatus.QUEUED).update(
+            status=VoiceJobStatus.PROCESSING,
+            started_at=now,
+            updated_at=now,
+        )
+        if not claimed:
+            logger.info("ASSISTANT_VOICE_JOB_SKIPPED job_id=%s", job_id)
+            return None
+
+        job = VoiceJob.objects.select_related("owner", "session").get(id=job_id)
+        try:
+            with job.audio.open("rb") as audio_file:
+                result = self.process_voice_turn(
+                    user=job.owner,
+                    audio_file=audio_file,
+                    session=job.session,
+                    user_timezone=job.timezone or None,
+                )
+            job.result = serialize_voice_turn(result)
+            job.status = VoiceJobStatus.SUCCEEDED
+        except Exception as exc:
+            logger.exception("ASSISTANT_VOICE_JOB_FAILED job_id=%s", job.id)
+            job.status = VoiceJobStatus.FAILED
+            job.error = str(exc)[:2000]
+
+        job.finished_at = timezone.now()
+        update_fields = ["status", "result", "error", "finished_at", "updated_at"]
+        if job.status == VoiceJobStatus.SUCCEEDED and job.audio:
+            job.audio.delete(save=False)
+            update_fields.append("audio")
+        job.save(update_fields=update_fields)
+        logger.info(
+            "ASSISTANT_VOICE_JOB_DONE job_id=%s status=%s total_ms=%s",
+            job.id,
+            job.status,
+            int((job.finished_at - job.started_at).total_seconds() * 1000) if job.started_at else None,
+        )
+        return job
+
     def refine_task_artifact(self, user, task: Task, instruction: str, user_timezone: str | None = None) -> dict:
         timezone_name = self._resolve_user_timezone(user, user_timezone)
 
@@ -172,7 +426,7 @@ class AssistantOrchestrator:
             "notes": task.notes,
             "status": task.status,
             "due_at": task.due_at.isoformat() if task.due_at else None,
-            "metadata_json": task.metadata_json or {},
+            "metadata_json": self._metadata_with_render_spec(task),
             "metadata_html": task.metadata_html or "",
         }
 
@@ -193,6 +447,8 @@ class AssistantOrchestrator:
             task.notes = patch["notes"][:3000]
         if isinstance(patch.get("metadata_json"), dict):
             task.metadata_json = self._deep_merge(task.metadata_json or {}, patch["metadata_json"])
+            if isinstance(task.metadata_json.get("render_spec"), dict):
+                task.render_spec = self._deep_merge(task.render_spec, task.metadata_json.pop("render_spec"))
         if isinstance(patch.get("metadata_html"), str):
             task.metadata_html = patch["metadata_html"][:20000]
         if isinstance(patch.get("due_at_iso"), str):
@@ -207,6 +463,7 @@ class AssistantOrchestrator:
                 "notes",
                 "metadata_json",
                 "metadata_html",
+                "render_spec",
                 "due_at",
                 "updated_at",
             ]
@@ -219,6 +476,46 @@ class AssistantOrchestrator:
             "task": task,
         }
 
+    def break_task_into_steps(self, user, task: Task, user_timezone: str | None = None, max_steps: int = 8) -> dict:
+        """Create subtasks for ``task`` from a single LLM call, all inserted in one batch.
+
+        Without the LLM, unchecked shopping-list items or the note's lines become the steps.
+        """
+        timezone_name = self._resolve_user_timezone(user, user_timezone)
+        task_payload = {
+            "id": task.id,
+            "title": task.title,
+            "notes": task.notes,
+            "due_at": task.due_at.isoformat() if task.due_at else None,
+            "estimated_minutes": task.estimated_minutes,
+            "metadata_json": self._compact_metadata_for_llm(task.metadata_json),
+        }
+        llm_result = self.language_service.break_task_into_steps(
+            task_payload,
+            timezone_name=timezone_name,
+            max_steps=max_steps,
+        )
+        if llm_result and llm_result["steps"]:
+            steps = llm_result["steps"]
+            reply = llm_result["reply"] or f"Broke it into {len(steps)} steps."
+        else:
+            steps = self._fallback_steps(task)[:max_steps]
+            reply = f"Broke it into {len(steps)} steps." if steps else "I could not break that task into steps."
+
+        children = create_subtasks(task, steps)
+        if children:
+            log_task_activity(task, action="task_broken_into_steps", metadata={"steps": len(children)})
+        logger.info("ASSISTANT_TASK_STEPS_CREATED task_id=%s steps=%s llm=%s", task.id, len(children), bool(llm_result))
+        return {"reply": reply, "task": task, "steps": children}
+
+    @staticmethod
+    def _fallback_steps(task: Task) -> list[dict]:
+        items = [item for item in get_items(task.metadata_json) if not item["done"]]
+        if items:
+            return [{"title": f"Buy {item['label']}"} for item in items]
+        lines = (line.strip().lstrip("-*•").strip() for line in (task.notes or "").splitlines())
+        return [{"title": line} for line in lines if line]
+
     def _process_with_llm_agent(
         self,
         user,
@@ -239,10 +536,10 @@ class AssistantOrchestrator:
                 "title": task.title,
                 "status": task.status,
                 "due_at": task.due_at.isoformat() if task.due_at else None,
-                "priority_score": task_priority_score(task),
+                "priority_score": task.priority_score,
                 "metadata_json": self._compact_metadata_for_llm(task.metadata_json),
             }
-            for task in prioritized_tasks_for_user(user, limit=10)
+            for task in prioritized_tasks_for_user(user, limit=10, with_metadata=True)
         ]
 
         plan = self.language_service.plan_turn(
@@ -273,7 +570,18 @@ class AssistantOrchestrator:
             session=session,
             role="assistant",
             content=message,
-            payload={"action_cards": cards},
+            payload={
+                "action_cards": cards,
+                # Captured so recorded turns can be replayed offline against other planners.
+                "turn": {
+                    "path": "llm",
+                    "timezone": timezone_name,
+                    "task_context": task_context,
+                    "actions": plan.get("actions", []),
+                    "prompt_version": plan.get("prompt_version"),
+                    "model": plan.get("model"),
+                },
+            },
         )
         self._log_decision(
             user,
@@ -285,7 +593,13 @@ class AssistantOrchestrator:
 
     def _process_with_rules(self, user, text: str, session: ConversationSession) -> AssistantResponse:
         extracted_task = self._extract_task_title(text) or self.language_service.extract_task_title(text)
-        if extracted_task:
+        duplicate = self._near_duplicate(user, extracted_task) if extracted_task else None
+        if duplicate:
+            merge_into_duplicate(duplicate)
+            message = f"'{duplicate.title}' is already on your list, so I kept that one."
+            cards = [self._merged_card(duplicate, extracted_task)]
+            self._log_decision(user, "merge_duplicate_task", duplicate.priority_score, ["intent_detected", "near_duplicate"])
+        elif extracted_task:
             due_at = timezone.now() + timedelta(days=2)
             task = Task.objects.create(
                 owner=user,
@@ -309,7 +623,7 @@ class AssistantOrchestrator:
                     "actions": ["mark_done", "snooze", "change_due_date", "break_into_steps"],
                 }
             ]
-            self._log_decision(user, "create_task", task_priority_score(task), ["intent_detected"]) 
+            self._log_decision(user, "create_task", task.priority_score, ["intent_detected"]) 
         else:
             candidates = self.nudge_engine.evaluate(user)
             if candidates:
@@ -342,7 +656,13 @@ class AssistantOrchestrator:
             session=session,
             role="assistant",
             content=message,
-            payload={"action_cards": cards},
+            payload={
+                "action_cards": cards,
+                "turn": {
+                    "path": "rules",
+                    "actions": [{"type": "create_task", "title": extracted_task}] if extracted_task else [],
+                },
+            },
         )
 
         return AssistantResponse(session_id=session.id, text=message, action_cards=cards)
@@ -360,12 +680,31 @@ class AssistantOrchestrator:
                 title = (action.get("title") or "").strip()
                 if not title:
                     continue
+                metadata_json = action.get("metadata_json") if isinstance(action.get("metadata_json"), dict) else {}
+                duplicate = self._near_duplicate(user, title)
+                if duplicate:
+                    merged = merge_into_duplicate(
+                        duplicate,
+                        notes=(action.get("notes") or "")[:1000],
+                        metadata_json=metadata_json,
+                        due_at=self._resolve_due_at(action, default_days=None),
+                    )
+                    if merged:
+                        self._refresh_task_render_spec(duplicate, timezone_name, use_llm=False)
+                    logger.info(
+                        "ASSISTANT_ACTION_APPLIED type=merge_duplicate_task task_id=%s title=%s merged=%s",
+                        duplicate.id,
+                        title,
+                        ",".join(merged),
+                    )
+                    cards.append(self._merged_card(duplicate, title))
+                    continue
                 due_at = self._resolve_due_at(action, default_days=2)
                 task = Task.objects.create(
                     owner=user,
                     title=title[:200],
                     notes=(action.get("notes") or "")[:1000],
-                    metadata_json=action.get("metadata_json") if isinstance(action.get("metadata_json"), dict) else {},
+                    metadata_json=metadata_json,
                     metadata_html=(action.get("metadata_html") or "")[:20000],
                     due_at=due_at,
                     estimated_minutes=max(self._safe_int(action.get("estimated_minutes"), 30), 5),
@@ -396,9 +735,11 @@ class AssistantOrchestrator:
                 continue
 
             if action_type == "complete_task":
+                before = task_snapshot(task)
                 task.status = "done"
                 task.save(update_fields=["status", "updated_at"])
                 log_task_activity(task, action="task_completed_from_llm_agent")
+                after_task_write(task, before)
                 self._refresh_task_render_spec(task, timezone_name, use_llm=False)
                 logger.info("ASSISTANT_ACTION_APPLIED type=complete_task task_id=%s", task.id)
                 cards.append(
@@ -411,10 +752,12 @@ class AssistantOrchestrator:
                 )
             elif action_type == "snooze_task":
                 hours = max(self._safe_int(action.get("hours"), 24), 1)
+                before = task_snapshot(task)
                 task.status = "snoozed"
                 task.snoozed_until = timezone.now() + timedelta(hours=hours)
                 task.save(update_fields=["status", "snoozed_until", "updated_at"])
                 log_task_activity(task, action="task_snoozed_from_llm_agent", metadata={"hours": hours})
+                after_task_write(task, before)
                 self._refresh_task_render_spec(task, timezone_name, use_llm=False)
                 logger.info("ASSISTANT_ACTION_APPLIED type=snooze_task task_id=%s hours=%s", task.id, hours)
                 cards.append(
@@ -426,6 +769,7 @@ class AssistantOrchestrator:
                     }
                 )
             elif action_type == "update_task_due":
+                before = task_snapshot(task)
                 task.due_at = self._resolve_due_at(action, default_days=1)
                 task.status = "active"
                 task.save(update_fields=["due_at", "status", "updated_at"])
@@ -434,6 +778,7 @@ class AssistantOrchestrator:
                     action="task_due_updated_from_llm_agent",
                     metadata={"due_at": task.due_at.isoformat() if task.due_at else None},
                 )
+                after_task_write(task, before)
                 self._refresh_task_render_spec(task, timezone_name, use_llm=False)
                 logger.info(
                     "ASSISTANT_ACTION_APPLIED type=update_task_due task_id=%s due_at=%s",
@@ -466,15 +811,16 @@ class AssistantOrchestrator:
                     # Keep metadata clean when compact summary keys leak back from planner output.
                     task.metadata_json.pop("render_title", None)
                     task.metadata_json.pop("render_block_count", None)
+                    if has_render_spec_in_patch:
+                        task.render_spec = self._deep_merge(task.render_spec, task.metadata_json.pop("render_spec"))
                     if incoming_title:
                         task.title = incoming_title[:200]
-                        render_spec = task.metadata_json.get("render_spec")
-                        if isinstance(render_spec, dict):
-                            render_spec["title"] = task.title
+                        if task.render_spec:
+                            task.render_spec = {**task.render_spec, "title": task.title}
                 if isinstance(incoming_html, str):
                     task.metadata_html = incoming_html[:20000]
 
-                update_fields = ["metadata_json", "metadata_html", "updated_at"]
+                update_fields = ["metadata_json", "metadata_html", "render_spec", "updated_at"]
                 if incoming_title:
                     update_fields.append("title")
                 task.save(update_fields=update_fields)
@@ -523,7 +869,7 @@ class AssistantOrchestrator:
         except (TypeError, ValueError):
             return default
 
-    def _resolve_due_at(self, action: dict, default_days: int):
+    def _resolve_due_at(self, action: dict, default_days: int | None):
         due_at_iso = (action.get("due_at_iso") or "").strip()
         if due_at_iso:
             parsed = parse_datetime(due_at_iso)
@@ -534,8 +880,26 @@ class AssistantOrchestrator:
             logger.warning("ASSISTANT_INVALID_DUE_AT_ISO value=%s", due_at_iso)
 
         due_in_days = self._safe_int(action.get("due_in_days"), default_days)
+        if due_in_days is None:
+            return None
         return timezone.now() + timedelta(days=max(due_in_days, 0))
 
+    @staticmethod
+    def _near_duplicate(user, title: str) -> Task | None:
+        duplicate_id = near_duplicate_id(user.id, title)
+        return Task.objects.filter(id=duplicate_id).first() if duplicate_id is not None else None
+
+    @staticmethod
+    def _merged_card(task: Task, requested_title: str) -> dict:
+        return {
+            "type": "task_merged",
+            "task_id": task.id,
+            "title": task.title,
+            "requested_title": requested_title,
+            "due_at": task.due_at.isoformat() if task.due_at else None,
+            "actions": ["mark_done", "snooze", "change_due_date", "break_into_steps"],
+        }
+
     def _resolve_user_timezone(self, user, user_timezone: str | None) -> str:
         preferences = get_or_create_preferences(user)
         if user_timezone and self._is_valid_timezone(user_timezone) and preferences.timezone != user_timezone:
@@ -544,39 +908,24 @@ class AssistantOrchestrator:
         return preferences.timezone or settings.TIME_ZONE
 
     def _refresh_task_render_spec(self, task: Task, timezone_name: str, use_llm: bool = True):
-        task_payload = {
-            "id": task.id,
-            "title": task.title,
-            "notes": task.notes,
-            "status": task.status,
-            "due_at": task.due_at.isoformat() if task.due_at else None,
-            "metadata_json": task.metadata_json or {},
-            "updated_at": task.updated_at.isoformat() if task.updated_at else None,
-        }
-
-        render_spec = None
-        if use_llm:
+        # Well-known kinds render locally; only unknown ones cost an LLM call.
+        render_spec = render_task_spec(task)
+        if render_spec is None and use_llm:
+            task_payload = {
+                "id": task.id,
+                "title": task.title,
+                "notes": task.notes,
+                "status": task.status,
+                "due_at": task.due_at.isoformat() if task.due_at else None,
+                "metadata_json": self._metadata_with_render_spec(task),
+                "updated_at": task.updated_at.isoformat() if task.updated_at else None,
+            }
             render_spec = self.language_service.build_task_render_spec(task_payload, timezone_name=timezone_name)
         if not render_spec:
-            render_spec = self._fallback_render_spec(task)
+            render_spec = render_summary(task)
 
-        metadata_json = task.metadata_json or {}
-        metadata_json["render_spec"] = render_spec
-        task.metadata_json = metadata_json
-        task.save(update_fields=["metadata_json", "updated_at"])
-
-    @staticmethod
-    def _fallback_render_spec(task: Task) -> dict:
-        blocks = []
-        if task.notes:
-            blocks.append({"type": "text", "label": "Notes", "content": task.notes})
-        if task.due_at:
-            blocks.append({"type": "key_value", "key": "Due", "value": task.due_at.isoformat()})
-        blocks.append({"type": "key_value", "key": "Status", "value": task.status})
-        return {
-            "title": task.title,
-            "blocks": blocks,
-        }
+        task.render_spec = render_spec
+        task.save(update_fields=["render_spec", "updated_at"])
 
     def _deep_merge(self, base: dict, patch: dict) -> dict:
         if not isinstance(base, dict):
@@ -591,6 +940,13 @@ class AssistantOrchestrator:
                 merged[key] = value
         return merged
 
+    @staticmethod
+    def _metadata_with_render_spec(task: Task) -> dict:
+        metadata_json = dict(task.metadata_json or {})
+        if task.render_spec:
+            metadata_json["render_spec"] = task.render_spec
+        return metadata_json
+
     @staticmethod
     def _compact_metadata_for_llm(metadata_json: dict | None) -> dict:
         if not isinstance(metadata_json, dict):
@@ -607,15 +963,6 @@ class AssistantOrchestrator:
             if isinstance(items, list):
                 compact["shopping_list_item_count"] = len(items)
 
-        render_spec = metadata_json.get("render_spec")
-        if isinstance(render_spec, dict):
-            title = render_spec.get("title")
-            blocks = render_spec.get("blocks")
-            if isinstance(title, str):
-                compact["render_title"] = title[:120]
-            if isinstance(blocks, list):
-                compact["render_block_count"] = len(blocks)
-
         return compact
 
     @staticmethod
@@ -626,7 +973,8 @@ class AssistantOrchestrator:
         except Exception:
             return False
 
-    def _extract_task_title(self, text: str) -> str | None:
+    @staticmethod
+    def _extract_task_title(text: str) -> str | None:
         match = TASK_INTENT_PATTERN.search(text.strip())
         if not match:
             return None
@@ -0,0 +1,15 @@
+from celery import shared_task
+
+
+@shared_task(name="assistant.process_voice_job")
+def process_voice_job(job_id: int):
+    from apps.assistant.services import AssistantOrchestrator
+
+    AssistantOrchestrator().process_voice_job(job_id)
+
+
+@shared_task(name="assistant.transcribe_voice_chunk")
+def transcribe_voice_chunk(chunk_id: int):
+    from apps.assistant.services import AssistantOrchestrator
+
+    AssistantOrchestrator().transcribe_voice_chunk(chunk_id)
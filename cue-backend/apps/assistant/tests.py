@@ -0,0 +1,127 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from apps.assistant.api.views import VoiceChunkUploadView, VoiceCaptureFinishView
+from apps.assistant.models import ConversationMessage, VoiceCapture, VoiceCaptureStatus, VoiceChunk
+from apps.assistant.tasks import transcribe_voice_chunk
+from apps.assistant.transcribers import LocalTranscriber
+
+
+@override_settings(CUE_VOICE_TRANSCRIBER="local", CUE_ACTIVITY_LOG_MODE="sync")
+class VoiceCaptureChunkTests(APITestCase):
+    """Chunked voice captures, transcribed by LocalTranscriber (each chunk's bytes are its transcript)."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        for patcher in (
+            # The views build their orchestrators at import time, before the settings override.
+            mock.patch.object(VoiceChunkUploadView.orchestrator, "transcriber", LocalTranscriber()),
+            mock.patch.object(VoiceCaptureFinishView.orchestrator, "transcriber", LocalTranscriber()),
+            mock.patch.object(VoiceCaptureFinishView.orchestrator.language_service, "client", None),
+            # Run the worker's transcription inline instead of queueing it.
+            mock.patch("apps.assistant.services.transcribe_voice_chunk.delay", side_effect=transcribe_voice_chunk),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        response = self.client.post(reverse("assistant-voice-session-create"), {"timezone": "UTC"}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.capture_id = response.json()["capture_id"]
+
+    def upload(self, sequence: int, text: bytes):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                reverse("assistant-voice-session-chunks", args=[self.capture_id]),
+                {"sequence": sequence, "audio": SimpleUploadedFile(f"{sequence}.m4a", text)},
+                format="multipart",
+            )
+
+    def finish(self, **data):
+        return self.client.post(
+            reverse("assistant-voice-session-finish", args=[self.capture_id]), data, format="json"
+        )
+
+    def test_out_of_order_and_duplicate_chunks(self):
+        self.assertEqual(self.upload(2, b"after work").status_code, 202)
+        self.assertEqual(self.upload(0, b"remember to").status_code, 202)
+        duplicate = self.upload(2, b"something else")
+        self.assertEqual(duplicate.status_code, 200)
+        self.assertFalse(duplicate.json()["created"])
+
+        # Chunks are transcribed as they arrive; the partial transcript follows sequence order.
+        detail = self.client.get(reverse("assistant-voice-session-detail", args=[self.capture_id])).json()
+        self.assertEqual(detail["transcript"], "remember to after work")
+        self.assertEqual([chunk["sequence"] for chunk in detail["chunks"]], [0, 2])
+
+        missing = self.finish(expected_chunks=3)
+        self.assertEqual(missing.status_code, 409)
+        self.assertEqual(missing.json()["received_chunks"], 2)
+
+        self.assertEqual(self.upload(1, b"buy milk").status_code, 202)
+        response = self.finish(expected_chunks=3)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["transcript"], "remember to buy milk after work")
+
+        capture = VoiceCapture.objects.get(id=self.capture_id)
+        self.assertEqual(capture.status, VoiceCaptureStatus.FINALIZED)
+        self.assertEqual(capture.transcript, "remember to buy milk after work")
+        self.assertFalse(VoiceChunk.objects.filter(capture=capture).exclude(audio="").exists())
+        self.assertEqual(self.finish().status_code, 409)
+
+    def test_finish_transcribes_chunks_the_worker_has_not_reached(self):
+        with mock.patch("apps.assistant.services.transcribe_voice_chunk.delay") as delay:
+            for sequence, text in ((1, b"the dentist"), (0, b"call")):
+                self.upload(sequence, text)
+        self.assertEqual(delay.call_count, 2)
+        self.assertEqual(VoiceChunk.objects.filter(capture_id=self.capture_id, transcribed_at__isnull=True).count(), 2)
+
+        response = self.finish(expected_chunks=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["transcript"], "call the dentist")
+
+    def test_retried_finish_answers_once(self):
+        self.upload(0, b"remember to call mom")
+        self.assertEqual(self.finish().status_code, 200)
+        messages = ConversationMessage.objects.count()
+
+        # A retry that read the capture before the first finish committed still loses the claim.
+        capture = VoiceCapture.objects.get(id=self.capture_id)
+        capture.status = VoiceCaptureStatus.OPEN
+        self.assertIsNone(VoiceCaptureFinishView.orchestrator.finish_voice_capture(capture))
+        self.assertEqual(self.finish().status_code, 409)
+        self.assertEqual(ConversationMessage.objects.count(), messages)
+
+    def test_chunk_after_finish_is_rejected(self):
+        self.upload(0, b"water the plants")
+        self.assertEqual(self.finish().status_code, 200)
+
+        capture = VoiceCapture.objects.get(id=self.capture_id)
+        chunk, created = VoiceChunkUploadView.orchestrator.append_voice_chunk(
+            capture, 1, SimpleUploadedFile("1.m4a", b"late")
+        )
+        self.assertIsNone(chunk)
+        self.assertFalse(created)
+        self.assertFalse(VoiceChunk.objects.filter(capture=capture, sequence=1).exists())
+
+    def test_concurrent_resend_returns_the_stored_chunk(self):
+        self.upload(0, b"pick up the kids")
+        stored = VoiceChunk.objects.get(capture_id=self.capture_id, sequence=0)
+
+        # The re-send's existence check ran before the first insert committed.
+        with mock.patch("django.db.models.query.QuerySet.first", return_value=None):
+            chunk, created = VoiceChunkUploadView.orchestrator.append_voice_chunk(
+                VoiceCapture.objects.get(id=self.capture_id), 0, SimpleUploadedFile("0.m4a", b"other")
+            )
+        self.assertEqual(chunk.id, stored.id)
+        self.assertFalse(created)
+        self.assertEqual(VoiceChunk.objects.filter(capture_id=self.capture_id).count(), 1)
@@ -0,0 +1,41 @@
+import logging
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class OpenAITranscriber:
+    name = "openai"
+
+    def __init__(self, language_service):
+        self.language_service = language_service
+
+    def transcribe(self, audio_file, filename: str = "voice.m4a") -> str | None:
+        return self.language_service.transcribe_audio(audio_file=audio_file, filename=filename)
+
+
+class LocalTranscriber:
+    """Stand-in transcriber for tests and offline development.
+
+    Treats the uploaded bytes as UTF-8 text, so a chunk containing b"buy milk" transcribes to "buy milk".
+    """
+
+    name = "local"
+
+    def transcribe(self, audio_file, filename: str = "voice.m4a") -> str | None:
+        raw = audio_file.read()
+        if not raw:
+            return None
+        transcript = raw.decode("utf-8", errors="ignore").strip()
+        return transcript or None
+
+
+def get_transcriber(language_service, name: str | None = None):
+    name = (name or settings.CUE_VOICE_TRANSCRIBER).lower()
+    if name == "local":
+        return LocalTranscriber()
+    if name != "openai":
+        logger.warning("UNKNOWN_VOICE_TRANSCRIBER value=%s, falling back to openai", name)
+    return OpenAITranscriber(language_service)
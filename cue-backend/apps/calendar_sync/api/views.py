@@ -6,10 +6,18 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.calendar_sync.api.serializers import CalendarEventSerializer
-from apps.calendar_sync.services import events_between
+from apps.calendar_sync.services import events_between, events_version
+from apps.core.api.conditional import conditional_get
 from apps.core.services import get_request_user
 
 
+def _events_etag_parts(view, request):
+    user = get_request_user(request)
+    start_dt, end_dt = view._window(request)
+    # The default window moves with the clock, so the validator must name the window it covers.
+    return [user.id, start_dt.isoformat(), end_dt.isoformat(), events_version(user, start_dt, end_dt)]
+
+
 class CalendarEventsView(APIView):
     @staticmethod
     def _parse_dt(value: str):
@@ -19,18 +27,20 @@ class CalendarEventsView(APIView):
             return timezone.make_aware(parsed, timezone.get_current_timezone())
         return parsed
 
-    def get(self, request):
-        user = get_request_user(request)
-        now = timezone.now()
+    def _window(self, request):
+        # Minute resolution, so repeat requests within a minute share the default window (and its ETag).
+        now = timezone.now().replace(second=0, microsecond=0)
         start = request.query_params.get("from")
         end = request.query_params.get("to")
 
         if start and end:
-            start_dt = self._parse_dt(start)
-            end_dt = self._parse_dt(end)
-        else:
-            start_dt = now
-            end_dt = now + timedelta(days=7)
+            return self._parse_dt(start), self._parse_dt(end)
+        return now, now + timedelta(days=7)
+
+    @conditional_get(_events_etag_parts)
+    def get(self, request):
+        user = get_request_user(request)
+        start_dt, end_dt = self._window(request)
 
         serializer = CalendarEventSerializer(events_between(user, start_dt, end_dt), many=True)
         return Response(serializer.data)
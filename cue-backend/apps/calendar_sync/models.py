@@ -29,6 +29,10 @@ class CalendarEvent(models.Model):
     location = models.CharField(max_length=200, blank=True)
     is_all_day = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["starts_at"]
+        indexes = [
+            models.Index(fields=["owner", "starts_at"], name="calendar_event_owner_start_idx"),
+        ]
@@ -1,7 +1,19 @@
 from datetime import datetime
 
+from django.db.models import Count, Max
+
 from apps.calendar_sync.models import CalendarEvent
 
 
 def events_between(user, start: datetime, end: datetime):
     return CalendarEvent.objects.filter(owner=user, starts_at__lt=end, ends_at__gt=start)
+
+
+def events_version(user, start: datetime, end: datetime) -> list:
+    """Validator for the events in a window, computed with one aggregate query."""
+    aggregate = events_between(user, start, end).aggregate(
+        count=Count("id"),
+        last_updated=Max("updated_at"),
+        last_id=Max("id"),
+    )
+    return [aggregate["count"], aggregate["last_updated"], aggregate["last_id"]]
@@ -0,0 +1,58 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+
+def build_etag(request, parts) -> str:
+    """Strong ETag over the representation inputs: path, query, negotiated format, timezone and ``parts``."""
+    raw = json.dumps(
+        [
+            request.path,
+            request.META.get("QUERY_STRING", ""),
+            request.META.get("HTTP_ACCEPT", ""),
+            # Datetimes are serialized in the active (X-Cue-Timezone) timezone.
+            timezone.get_current_timezone_name(),
+            parts,
+        ],
+        default=str,
+    )
+    return f'"{hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]}"'
+
+
+def conditional_get(etag_parts):
+    """Answer ``If-None-Match`` with 304 before the view loads or serializes anything.
+
+    ``etag_parts(view, request, *args, **kwargs)`` must be cheap (a counter read or an aggregate) and
+    change whenever the response body would.
+    """
+
+    def decorator(view_method):
+        @wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in {"GET", "HEAD"}:
+                return view_method(view, request, *args, **kwargs)
+
+            etag = build_etag(request, etag_parts(view, request, *args, **kwargs))
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified.headers["ETag"] = etag
+                _patch_revalidation_headers(not_modified)
+                return not_modified
+
+            response = view_method(view, request, *args, **kwargs)
+            if response.status_code == 200:
+                response.headers["ETag"] = etag
+                _patch_revalidation_headers(response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _patch_revalidation_headers(response):
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Accept", "Authorization", "X-Cue-Timezone"])
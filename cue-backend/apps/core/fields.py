@@ -0,0 +1,119 @@
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.migrations.operations import AlterField
+
+
+# Stored values starting with this prefix are zlib streams; anything else is legacy raw UTF-8.
+# Text columns never contain NUL, so raw values cannot be mistaken for compressed ones.
+COMPRESSED_PREFIX = b"\x00z"
+# Below this size zlib's header outweighs the savings, so the value is stored raw.
+COMPRESSION_MIN_BYTES = 128
+
+
+def compress_bytes(raw: bytes) -> bytes:
+    if len(raw) < COMPRESSION_MIN_BYTES:
+        return raw
+    compressed = COMPRESSED_PREFIX + zlib.compress(raw, 6)
+    return compressed if len(compressed) < len(raw) else raw
+
+
+def decompress_bytes(stored) -> bytes:
+    """Decode a stored value: compressed bytes, legacy raw bytes, or legacy text (SQLite keeps TEXT as-is)."""
+    if isinstance(stored, str):
+        return stored.encode("utf-8")
+    stored = bytes(stored)
+    if stored.startswith(COMPRESSED_PREFIX):
+        return zlib.decompress(stored[len(COMPRESSED_PREFIX) :])
+    return stored
+
+
+def is_compressed(stored) -> bool:
+    return not isinstance(stored, str) and bytes(stored[: len(COMPRESSED_PREFIX)]) == COMPRESSED_PREFIX
+
+
+class CompressedFieldMixin:
+    """Stores the encoded value zlib-compressed in a binary column; reads are decoded transparently.
+
+    The codec between Python values and uncompressed bytes is compact UTF-8 JSON; subclasses storing
+    something else override ``encode``/``decode``. Values are neither indexed nor filterable by content.
+    Rows written before the column was converted keep working and are recompressed by
+    ``python manage.py compress_stored_fields``.
+    """
+
+    def encode(self, value) -> bytes:
+        return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, raw: bytes):
+        return json.loads(raw) if raw else None
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return None
+        return self.decode(decompress_bytes(value))
+
+    def to_python(self, value):
+        return value
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if value is None:
+            return None
+        return connection.Database.Binary(compress_bytes(self.encode(value)))
+
+    def value_to_string(self, obj):
+        return self.encode(self.value_from_object(obj)).decode("utf-8")
+
+
+class CompressedTextField(CompressedFieldMixin, models.BinaryField):
+    description = "Compressed text"
+
+    def _check_str_default_value(self):
+        # Defaults are Python values here (text), not raw column bytes.
+        return []
+
+    def encode(self, value) -> bytes:
+        return str(value).encode("utf-8")
+
+    def decode(self, raw: bytes) -> str:
+        return raw.decode("utf-8")
+
+
+class CompressedJSONField(CompressedFieldMixin, models.BinaryField):
+    description = "Compressed JSON"
+
+
+class AlterToCompressedField(AlterField):
+    """AlterField that converts a text/json column to a compressed one, keeping its contents.
+
+    PostgreSQL's default ``USING column::bytea`` would read backslashes as escapes, so the existing
+    text is converted with ``convert_to`` instead. Other backends copy the value unchanged and the
+    field decodes it as legacy raw text. Reversing requires decompressing rows first
+    (``compress_stored_fields --decompress``).
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        column = schema_editor.quote_name(model._meta.get_field(self.name).column)
+        schema_editor.execute(
+            f"ALTER TABLE {schema_editor.quote_name(model._meta.db_table)} "
+            f"ALTER COLUMN {column} TYPE bytea USING convert_to({column}::text, 'UTF8')"
+        )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        field = model._meta.get_field(self.name)
+        column = schema_editor.quote_name(field.column)
+        schema_editor.execute(
+            f"ALTER TABLE {schema_editor.quote_name(model._meta.db_table)} "
+            f"ALTER COLUMN {column} TYPE {field.db_type(schema_editor.connection)} "
+            f"USING convert_from({column}, 'UTF8')::{field.db_type(schema_editor.connection)}"
+        )
+
+    def describe(self):
+        return f"Compress field {self.name} on {self.model_name}"
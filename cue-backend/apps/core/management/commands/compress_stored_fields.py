@@ -0,0 +1,95 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.db.models.functions import Cast
+
+from apps.core.fields import CompressedFieldMixin, compress_bytes, decompress_bytes, is_compressed
+
+
+class Command(BaseCommand):
+    help = "Re-encode rows of compressed fields that were stored raw, in chunks, and report the bytes saved."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", action="append", help="Limit to app_label.Model (repeatable).")
+        parser.add_argument("--chunk-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Measure the savings without writing.")
+        parser.add_argument(
+            "--decompress",
+            action="store_true",
+            help="Rewrite compressed rows raw again, before reversing the column migration.",
+        )
+
+    def handle(self, *args, **options):
+        targets = self._targets(options["model"])
+        if not targets:
+            raise CommandError("No models with compressed fields matched.")
+
+        total_before = total_after = 0
+        for model, fields in targets:
+            for field in fields:
+                rewritten, before, after = self._reencode(
+                    model,
+                    field,
+                    chunk_size=options["chunk_size"],
+                    dry_run=options["dry_run"],
+                    decompress=options["decompress"],
+                )
+                total_before += before
+                total_after += after
+                self.stdout.write(
+                    f"{model._meta.label}.{field.name}: {rewritten} row(s), "
+                    f"{before} -> {after} bytes{self._saved(before, after)}"
+                )
+        self.stdout.write(f"Total: {total_before} -> {total_after} bytes{self._saved(total_before, total_after)}")
+
+    @staticmethod
+    def _targets(labels: list[str] | None) -> list[tuple[type[models.Model], list[models.Field]]]:
+        targets = []
+        for model in apps.get_models():
+            if labels and model._meta.label not in labels:
+                continue
+            fields = [field for field in model._meta.concrete_fields if isinstance(field, CompressedFieldMixin)]
+            if fields:
+                targets.append((model, fields))
+        return targets
+
+    def _reencode(self, model, field, chunk_size: int, dry_run: bool, decompress: bool) -> tuple[int, int, int]:
+        # Cast to a plain binary column so rows are read as stored, bypassing the field's decoding.
+        queryset = model._base_manager.annotate(stored=Cast(field.name, models.BinaryField())).order_by("pk")
+        rewritten = before = after = 0
+        last_pk = None
+        while True:
+            chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            rows = list(chunk.values_list("pk", "stored")[:chunk_size])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            updates = []
+            for pk, stored in rows:
+                if stored is None or is_compressed(stored) != decompress:
+                    continue
+                raw = decompress_bytes(stored)
+                encoded = raw if decompress else compress_bytes(field.encode(field.decode(raw)))
+                if encoded == bytes(stored):
+                    continue
+                before += len(stored)
+                after += len(encoded)
+                updates.append((pk, encoded))
+
+            if updates and not dry_run:
+                with transaction.atomic():
+                    for pk, encoded in updates:
+                        model._base_manager.filter(pk=pk).update(
+                            **{field.name: models.Value(encoded, output_field=models.BinaryField())}
+                        )
+            rewritten += len(updates)
+            if len(rows) < chunk_size:
+                break
+        return rewritten, before, after
+
+    @staticmethod
+    def _saved(before: int, after: int) -> str:
+        if not before:
+            return ""
+        return f" ({before - after} saved, {100 * (before - after) / before:.1f}%)"
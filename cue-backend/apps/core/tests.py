@@ -0,0 +1,31 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from apps.tasks.models import Task
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        owner = get_user_model().objects.create_user(username="etag-owner")
+        self.client.force_authenticate(owner)
+        Task.objects.create(owner=owner, title="Pay rent", due_at=timezone.now() + timedelta(days=1))
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.client.get(reverse("tasks-list"))["ETag"]
+        response = self.client.get(reverse("tasks-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_timezone_change_returns_new_representation(self):
+        utc = self.client.get(reverse("tasks-list"))
+        self.assertTrue(utc.json()[0]["due_at"].endswith("Z"))
+
+        tokyo = self.client.get(
+            reverse("tasks-list"), HTTP_IF_NONE_MATCH=utc["ETag"], HTTP_X_CUE_TIMEZONE="Asia/Tokyo"
+        )
+        self.assertEqual(tokyo.status_code, 200)
+        self.assertNotEqual(tokyo["ETag"], utc["ETag"])
+        self.assertTrue(tokyo.json()[0]["due_at"].endswith("+09:00"))
@@ -1,12 +1,19 @@
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.api.conditional import conditional_get
 from apps.core.services import get_request_user
 from apps.feed.api.serializers import DailyBriefingSerializer
-from apps.feed.services import build_today_briefing
+from apps.feed.services import build_today_briefing, today_briefing_version
+
+
+def _feed_etag_parts(view, request):
+    user = get_request_user(request)
+    return [user.id, today_briefing_version(user)]
 
 
 class TodayFeedView(APIView):
+    @conditional_get(_feed_etag_parts)
     def get(self, request):
         user = get_request_user(request)
         briefing = build_today_briefing(user)
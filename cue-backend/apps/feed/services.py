@@ -2,7 +2,18 @@ from django.utils import timezone
 
 from apps.calendar_sync.models import CalendarEvent
 from apps.feed.models import DailyBriefing
-from apps.tasks.services import prioritized_tasks_for_user
+from apps.tasks.services import pending_transitions_version, prioritized_tasks_for_user, task_list_version
+
+
+def today_briefing_version(user) -> list:
+    """Validator covering every input of build_today_briefing without building it."""
+    next_event = (
+        CalendarEvent.objects.filter(owner=user, starts_at__gte=timezone.now())
+        .order_by("starts_at")
+        .values_list("id", "updated_at")
+        .first()
+    )
+    return [timezone.localdate(), task_list_version(user), pending_transitions_version(user), next_event]
 
 
 def build_today_briefing(user):
@@ -36,9 +47,12 @@ def build_today_briefing(user):
         ),
     }
 
-    briefing, _ = DailyBriefing.objects.update_or_create(
+    briefing, created = DailyBriefing.objects.get_or_create(
         owner=user,
         date=today,
         defaults={"summary": summary},
     )
+    if not created and briefing.summary != summary:
+        briefing.summary = summary
+        briefing.save(update_fields=["summary", "updated_at"])
     return briefing
@@ -0,0 +1,142 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Task, TaskActivityLog
+
+
+logger = logging.getLogger(__name__)
+
+_default_buffer = None
+_default_buffer_lock = threading.Lock()
+
+
+class ActivityLogBuffer:
+    """In-process queue of TaskActivityLog rows written in batches.
+
+    Entries are queued when the surrounding transaction commits (so rolled-back mutations leave no
+    audit trail) and inserted with one ``bulk_create`` when the batch fills or the flush interval
+    elapses. A batch that fails to write, including the final flush at shutdown, is appended to a
+    JSONL spool file that ``python manage.py replay_activity_spool`` loads later.
+    """
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        flush_interval_seconds: float | None = None,
+        spool_path: str | Path | None = None,
+    ):
+        self.batch_size = settings.CUE_ACTIVITY_LOG_BATCH_SIZE if batch_size is None else batch_size
+        self.flush_interval_seconds = (
+            settings.CUE_ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS
+            if flush_interval_seconds is None
+            else flush_interval_seconds
+        )
+        self.spool_path = Path(spool_path or settings.CUE_ACTIVITY_LOG_SPOOL_PATH)
+        self._entries: list[TaskActivityLog] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def add(self, entry: TaskActivityLog) -> None:
+        transaction.on_commit(lambda: self._enqueue(entry))
+
+    def _enqueue(self, entry: TaskActivityLog) -> None:
+        with self._lock:
+            self._entries.append(entry)
+            pending = len(self._entries)
+        self._ensure_worker()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> int:
+        """Write every queued entry now; returns the number of rows inserted.
+
+        If the database write fails the batch is spooled to disk rather than retried in memory.
+        """
+        with self._flush_lock:
+            with self._lock:
+                entries, self._entries = self._entries, []
+            if not entries:
+                return 0
+            try:
+                return write_activity_entries(entries)
+            except Exception:
+                logger.exception("TASK_ACTIVITY_FLUSH_FAILED entries=%s", len(entries))
+                self.spool(entries)
+                return 0
+
+    def spool(self, entries: list[TaskActivityLog]) -> None:
+        self.spool_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.spool_path.open("a", encoding="utf-8") as handle:
+            for entry in entries:
+                handle.write(json.dumps(serialize_entry(entry), default=str) + "\n")
+        logger.warning("TASK_ACTIVITY_SPOOLED entries=%s path=%s", len(entries), self.spool_path)
+
+    def _ensure_worker(self) -> None:
+        # Re-create the thread after a fork (e.g. gunicorn/celery prefork), since threads are not inherited.
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="task-activity-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+def write_activity_entries(entries: list[TaskActivityLog]) -> int:
+    # A task deleted after its entry was queued takes its activity log with it, as CASCADE would.
+    existing = set(Task.objects.filter(id__in={entry.task_id for entry in entries}).values_list("id", flat=True))
+    rows = [entry for entry in entries if entry.task_id in existing]
+    TaskActivityLog.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def serialize_entry(entry: TaskActivityLog) -> dict:
+    return {
+        "task_id": entry.task_id,
+        "actor": entry.actor,
+        "action": entry.action,
+        "metadata": entry.metadata,
+        "created_at": entry.created_at.isoformat() if entry.created_at else None,
+    }
+
+
+def deserialize_entry(data: dict) -> TaskActivityLog:
+    return TaskActivityLog(
+        task_id=data["task_id"],
+        actor=data.get("actor") or "assistant",
+        action=data["action"],
+        metadata=data.get("metadata") or {},
+        created_at=parse_datetime(data["created_at"]) if data.get("created_at") else timezone.now(),
+    )
+
+
+def get_activity_buffer() -> ActivityLogBuffer:
+    """Process-wide buffer; anything still queued is flushed (or spooled) at interpreter exit."""
+    global _default_buffer
+    with _default_buffer_lock:
+        if _default_buffer is None:
+            _default_buffer = ActivityLogBuffer()
+            atexit.register(_default_buffer.flush)
+        return _default_buffer
@@ -0,0 +1,81 @@
+from django.db import models
+from django.utils import timezone
+
+from apps.tasks.api.serializers import TaskSerializer
+from apps.tasks.models import Task
+from apps.tasks.services import subtask_progress
+
+
+class TaskRowSerializer:
+    """Fast path for task lists: ``.values()`` rows to the exact TaskSerializer representation.
+
+    The per-field converters are picked once per instance rather than per row, and no model
+    instances or DRF field objects are created. Output must stay identical to TaskSerializer;
+    ``python manage.py benchmark_task_serialization`` checks that.
+    """
+
+    # Serializer fields read from TaskArtifact, and the related column each one comes from.
+    ARTIFACT_COLUMNS = {"metadata_html": "artifact__html", "render_spec": "artifact__render_spec"}
+    # Always selected: the cursor paginator reads its position from these.
+    PAGINATION_COLUMNS = ("id", "created_at")
+    # Serializer fields computed per page rather than read from a column.
+    COMPUTED_FIELDS = ("progress",)
+
+    def __init__(self, fields: list[str] | None = None):
+        self.fields = [name for name in TaskSerializer.Meta.fields if fields is None or name in fields]
+        columns = list(self.PAGINATION_COLUMNS)
+        for name in self.fields:
+            if name in self.COMPUTED_FIELDS:
+                continue
+            column = self.ARTIFACT_COLUMNS.get(name, name)
+            if column not in columns:
+                columns.append(column)
+        if "metadata_json" in self.fields:
+            columns.append(self.ARTIFACT_COLUMNS["render_spec"])
+        self.columns = columns
+        self._datetime_fields = {
+            name
+            for name in self.fields
+            if name not in self.ARTIFACT_COLUMNS
+            and name not in self.COMPUTED_FIELDS
+            and isinstance(Task._meta.get_field(name), models.DateTimeField)
+        }
+
+    def values(self, queryset):
+        return queryset.values(*self.columns)
+
+    def to_representation(self, rows) -> list[dict]:
+        tz = timezone.get_current_timezone()
+        render_spec_column = self.ARTIFACT_COLUMNS["render_spec"]
+        html_column = self.ARTIFACT_COLUMNS["metadata_html"]
+        rows = list(rows)
+        progress = subtask_progress([row["id"] for row in rows]) if "progress" in self.fields else {}
+        converters = []
+        for name in self.fields:
+            if name == "progress":
+                converters.append((name, "id", progress.get))
+            elif name in self._datetime_fields:
+                converters.append((name, name, lambda value: _datetime_string(value, tz)))
+            elif name == "metadata_html":
+                converters.append((name, html_column, lambda value: value or ""))
+            else:
+                converters.append((name, name, None))
+
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in converters:
+                value = row[column]
+                item[name] = convert(value) if convert is not None else value
+            if "metadata_json" in item and row[render_spec_column]:
+                item["metadata_json"] = {**(item["metadata_json"] or {}), "render_spec": row[render_spec_column]}
+            data.append(item)
+        return data
+
+
+def _datetime_string(value, tz) -> str | None:
+    # Same as DRF's DateTimeField: current timezone, ISO 8601, "Z" for UTC.
+    if value is None:
+        return None
+    text = value.astimezone(tz).isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
@@ -1,11 +1,57 @@
 from rest_framework import serializers
 
-from apps.tasks.models import Task
-from apps.tasks.services import task_priority_score
+from apps.tasks.metadata import DEFAULT_ITEMS_PATH, ITEM_OPS
+from apps.core.services import get_request_user
+from apps.tasks.imports import IMPORT_FORMATS
+from apps.tasks.models import Task, TaskClosure, TaskImportJob
+from apps.tasks.services import attach_subtask_progress
+from apps.tasks.recurrence import InvalidRecurrenceRule, normalize_rule
 
 
 class TaskSerializer(serializers.ModelSerializer):
-    priority_score = serializers.SerializerMethodField()
+    # Stored on TaskArtifact (see Task.get_artifact); select_related("artifact") avoids a query per task.
+    metadata_html = serializers.CharField(required=False, allow_blank=True)
+    parent = serializers.PrimaryKeyRelatedField(queryset=Task.objects.all(), required=False, allow_null=True)
+    # {"done", "total"} over all subtasks, or None. Lists attach it in one query (attach_subtask_progress).
+    progress = serializers.SerializerMethodField()
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def validate_recurrence_rule(self, value):
+        try:
+            return normalize_rule(value)
+        except InvalidRecurrenceRule as exc:
+            raise serializers.ValidationError(str(exc))
+
+    def validate(self, attrs):
+        parent = attrs.get("parent")
+        if parent is not None:
+            request = self.context.get("request")
+            owner_id = self.instance.owner_id if self.instance else get_request_user(request).id
+            if parent.owner_id != owner_id:
+                raise serializers.ValidationError({"parent": "Task not found."})
+            if self.instance and (
+                parent.id == self.instance.id
+                or TaskClosure.objects.filter(ancestor=self.instance, descendant=parent).exists()
+            ):
+                raise serializers.ValidationError({"parent": "A task cannot be nested under itself or its subtasks."})
+        return attrs
+
+    def get_progress(self, instance):
+        if not hasattr(instance, "subtask_progress"):
+            attach_subtask_progress([instance])
+        return instance.subtask_progress
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Clients still read the render spec from metadata_json.
+        if "metadata_json" in data and instance.render_spec:
+            data["metadata_json"] = {**(data["metadata_json"] or {}), "render_spec": instance.render_spec}
+        return data
 
     class Meta:
         model = Task
@@ -15,6 +61,7 @@ class TaskSerializer(serializers.ModelSerializer):
             "notes",
             "metadata_json",
             "metadata_html",
+            "metadata_version",
             "due_at",
             "is_hard_deadline",
             "estimated_minutes",
@@ -23,11 +70,98 @@ class TaskSerializer(serializers.ModelSerializer):
             "status",
             "follow_up_state",
             "snoozed_until",
+            "recurrence_rule",
+            "recurrence_source",
+            "occurrence_at",
+            "parent",
+            "progress",
+            "duplicate_of",
             "priority_score",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at", "priority_score"]
+        read_only_fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "priority_score",
+            "metadata_version",
+            "recurrence_source",
+            "occurrence_at",
+            "duplicate_of",
+        ]
+
+
+class BulkTaskOperationSerializer(serializers.Serializer):
+    OPS = ["create", "update", "complete", "snooze", "delete"]
+
+    op = serializers.ChoiceField(choices=OPS)
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+    hours = serializers.IntegerField(required=False, min_value=1, max_value=24 * 365)
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if attrs["op"] != "create" and "id" not in attrs:
+            raise serializers.ValidationError({"id": "This field is required."})
+        if attrs["op"] in {"create", "update"} and not attrs.get("data"):
+            raise serializers.ValidationError({"data": "This field is required."})
+        return attrs
+
 
-    def get_priority_score(self, obj: Task) -> int:
-        return task_priority_score(obj)
+class MetadataItemOpSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=ITEM_OPS)
+    index = serializers.IntegerField(required=False, allow_null=True, min_value=0)
+    label = serializers.CharField(required=False, max_length=200)
+    done = serializers.BooleanField(required=False, allow_null=True, default=None)
+    to = serializers.IntegerField(required=False, min_value=0)
+
+    def validate(self, attrs):
+        if attrs["op"] == "add" and not attrs.get("label"):
+            raise serializers.ValidationError({"label": "This field is required."})
+        if attrs["op"] != "add" and attrs.get("index") is None and not attrs.get("label"):
+            raise serializers.ValidationError({"index": "Provide an item index or label."})
+        if attrs["op"] == "reorder" and "to" not in attrs:
+            raise serializers.ValidationError({"to": "This field is required."})
+        return attrs
+
+
+class TaskMetadataPatchSerializer(serializers.Serializer):
+    version = serializers.IntegerField(min_value=0)
+    path = serializers.RegexField(r"^[A-Za-z_]\w*(\.[A-Za-z_]\w*)*$", max_length=100, default=DEFAULT_ITEMS_PATH)
+    ops = MetadataItemOpSerializer(many=True, allow_empty=False, max_length=100)
+
+    def validate_path(self, value):
+        if value.split(".")[0] == "render_spec":
+            raise serializers.ValidationError("The render spec is not patchable.")
+        return value
+
+
+class TaskImportRequestSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=IMPORT_FORMATS, required=False)
+    timezone = serializers.CharField(required=False, allow_blank=True, max_length=64)
+
+
+class TaskImportJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.IntegerField(source="id", read_only=True)
+    bytes_read = serializers.IntegerField(source="offset", read_only=True)
+    progress = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = TaskImportJob
+        fields = [
+            "job_id",
+            "status",
+            "format",
+            "size",
+            "bytes_read",
+            "progress",
+            "imported_count",
+            "skipped_count",
+            "row_errors",
+            "error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
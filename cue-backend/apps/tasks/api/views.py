@@ -1,13 +1,60 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
 
+from apps.core.api.conditional import conditional_get
 from apps.core.services import get_request_user
-from apps.tasks.api.serializers import TaskSerializer
-from apps.tasks.models import Task, TaskStatus
-from apps.tasks.services import log_task_activity
+from apps.tasks.api.pagination import TaskCursorPagination
+from apps.tasks.api.rows import TaskRowSerializer
+from apps.tasks.api.serializers import (
+    BulkTaskOperationSerializer,
+    TaskImportJobSerializer,
+    TaskImportRequestSerializer,
+    TaskMetadataPatchSerializer,
+    TaskSerializer,
+)
+from apps.tasks.dedup import near_duplicate_id
+from apps.tasks.imports import ImportFileError, detect_import_format
+from apps.tasks.metadata import MetadataPatchError
+from apps.tasks.models import Task, TaskImportJob, TaskImportStatus, TaskStatus
+from apps.tasks.services import (
+    after_task_write,
+    apply_bulk_task_operations,
+    attach_subtask_progress,
+    delete_task,
+    enqueue_task_import,
+    log_task_activity,
+    patch_task_metadata,
+    resume_task_import,
+    task_snapshot,
+    task_changes_since,
+    search_task_ids,
+    task_list_version,
+)
+
+
+def _task_etag_parts(view, request, *args, **kwargs):
+    user = get_request_user(request)
+    return [user.id, task_list_version(user), kwargs.get("pk")]
 
 
 class TaskViewSet(viewsets.ModelViewSet):
     serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
+
+    # Columns the cursor paginator orders by; always loaded even when not requested.
+    PAGINATION_FIELDS = ("id", "created_at")
+    CHANGES_MAX_LIMIT = 1000
+    BULK_MAX_OPERATIONS = 200
+    IMPORT_POLL_INTERVAL_SECONDS = 2
+    SEARCH_PAGE_SIZE = 20
+    SEARCH_MAX_PAGE_SIZE = 100
+    SEARCH_MAX_MATCHES = 1000
+    # Serializer fields backed by TaskArtifact, and the artifact column each one reads.
+    ARTIFACT_COLUMNS = {"metadata_html": "artifact__html", "metadata_json": "artifact__render_spec"}
 
     def get_queryset(self):
         user = get_request_user(self.request)
@@ -21,12 +68,296 @@ class TaskViewSet(viewsets.ModelViewSet):
         elif not include_done:
             queryset = queryset.exclude(status=TaskStatus.DONE)
 
+        parent = self.request.query_params.get("parent")
+        if parent == "none":
+            queryset = queryset.filter(parent__isnull=True)
+        elif parent:
+            if not parent.isdigit():
+                raise ValidationError({"parent": "Expected a task id or 'none'."})
+            queryset = queryset.filter(parent_id=int(parent))
+
+        # ?kind=shopping_list,note filters on the indexed (lowercased) metadata_kind column, not metadata_json.
+        kinds = [kind.lower() for kind in self._split_param(self.request.query_params.get("kind"))]
+        if kinds:
+            queryset = queryset.filter(metadata_kind__in=kinds)
+
+        fields = self.get_requested_fields()
+        # The detail view loads the artifact on demand; search joins it only when it is serialized.
+        # (list reads .values() through TaskRowSerializer, which selects the artifact columns itself.)
+        join_artifact = self.action == "search" and (fields is None or bool(set(fields) & set(self.ARTIFACT_COLUMNS)))
+        if join_artifact:
+            queryset = queryset.select_related("artifact")
+        if fields is not None:
+            queryset = queryset.only(*self._model_fields_for(fields, join_artifact))
+
         return queryset.order_by("-created_at")
 
+    def get_requested_fields(self) -> list[str] | None:
+        """Serializer fields selected by ``?fields=`` / ``?exclude=`` on reads, or None for all of them."""
+        if self.request.method not in {"GET", "HEAD"}:
+            return None
+        params = self.request.query_params
+        if "fields" not in params and "exclude" not in params:
+            return None
+
+        available = list(TaskSerializer.Meta.fields)
+        requested = self._split_param(params.get("fields")) or available
+        excluded = set(self._split_param(params.get("exclude")))
+        unknown = (set(requested) | excluded) - set(available)
+        if unknown:
+            raise ValidationError({"fields": f"Unknown field(s): {', '.join(sorted(unknown))}"})
+        return [name for name in requested if name not in excluded]
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_requested_fields())
+        if kwargs.get("many") and args and "progress" in (kwargs["fields"] or TaskSerializer.Meta.fields):
+            attach_subtask_progress(args[0])
+        return super().get_serializer(*args, **kwargs)
+
+    def paginate_queryset(self, queryset):
+        # Opt-in so existing clients that expect a bare list keep working.
+        params = self.request.query_params
+        if "cursor" not in params and "page_size" not in params:
+            return None
+        return super().paginate_queryset(queryset)
+
     def perform_create(self, serializer):
-        task = serializer.save(owner=get_request_user(self.request))
+        owner = get_request_user(self.request)
+        # Explicit creates are kept; a near-duplicate is only flagged so the client can offer a merge.
+        duplicate_id = near_duplicate_id(owner.id, serializer.validated_data["title"])
+        task = serializer.save(owner=owner, duplicate_of_id=duplicate_id)
         log_task_activity(task, action="task_created", actor="user")
+        after_task_write(task)
 
     def perform_update(self, serializer):
+        before = task_snapshot(serializer.instance)
         task = serializer.save()
         log_task_activity(task, action="task_updated", actor="user")
+        after_task_write(task, before)
+
+    def perform_destroy(self, instance):
+        delete_task(instance)
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """Delta sync: tasks written and ids deleted since ``?since=<token>``, plus the next token."""
+        try:
+            since = int(request.query_params.get("since") or 0)
+            limit = int(request.query_params.get("limit") or 500)
+        except ValueError:
+            raise ValidationError({"since": "Expected a token returned by a previous sync."})
+        if since < 0:
+            raise ValidationError({"since": "Expected a token returned by a previous sync."})
+        limit = min(max(limit, 1), self.CHANGES_MAX_LIMIT)
+
+        user = get_request_user(request)
+        result = task_changes_since(user, since=since, limit=limit)
+        return Response(
+            {
+                "changes": self.get_serializer(result["tasks"], many=True).data,
+                "deleted": result["deleted"],
+                "next_token": str(result["next_token"]),
+                "has_more": result["has_more"],
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path="search")
+    def search(self, request):
+        """Ranked full-text search over title, notes and metadata text: ``?q=milk&page=2``.
+
+        Honours the list filters (``status``, ``include_done``) and ``fields``/``exclude``.
+        """
+        query = (request.query_params.get("q") or "").strip()
+        if not query:
+            raise ValidationError({"q": "This parameter is required."})
+        try:
+            page = max(int(request.query_params.get("page") or 1), 1)
+            page_size = int(request.query_params.get("page_size") or self.SEARCH_PAGE_SIZE)
+        except ValueError:
+            raise ValidationError({"page": "Expected integers for page and page_size."})
+        page_size = min(max(page_size, 1), self.SEARCH_MAX_PAGE_SIZE)
+
+        user = get_request_user(request)
+        ranked_ids = search_task_ids(user, query, limit=self.SEARCH_MAX_MATCHES)
+        # The index knows nothing about status, so apply the list filters with a narrow id-only query.
+        visible = set(self.get_queryset().filter(id__in=ranked_ids).values_list("id", flat=True))
+        matching = [task_id for task_id in ranked_ids if task_id in visible]
+        page_ids = matching[(page - 1) * page_size : page * page_size]
+
+        tasks = self.get_queryset().filter(id__in=page_ids).in_bulk()
+        return Response(
+            {
+                "count": len(matching),
+                "next_page": page + 1 if page * page_size < len(matching) else None,
+                "results": self.get_serializer([tasks[task_id] for task_id in page_ids], many=True).data,
+            }
+        )
+
+    @action(detail=True, methods=["get"], url_path="subtree")
+    def subtree(self, request, pk=None):
+        """Every subtask below this task at any depth, nearest levels first (one closure-table join)."""
+        task = self.get_object()
+        descendants = list(
+            Task.objects.filter(ancestor_links__ancestor=task)
+            .select_related("artifact")
+            .order_by("ancestor_links__depth", "created_at", "id")
+        )
+        return Response(self.get_serializer(descendants, many=True).data)
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Apply a list of create/update/complete/snooze/delete operations atomically.
+
+        Every operation is validated first; if any is invalid nothing is written and the response
+        lists errors aligned with the input.
+        """
+        operations = request.data.get("operations") if isinstance(request.data, dict) else request.data
+        if not isinstance(operations, list) or not operations:
+            raise ValidationError({"operations": "Expected a non-empty list of operations."})
+        if len(operations) > self.BULK_MAX_OPERATIONS:
+            raise ValidationError({"operations": f"At most {self.BULK_MAX_OPERATIONS} operations per request."})
+
+        op_serializer = BulkTaskOperationSerializer(data=operations, many=True)
+        if not op_serializer.is_valid():
+            raise ValidationError({"operations": op_serializer.errors})
+
+        user = get_request_user(request)
+        ids = {item["id"] for item in op_serializer.validated_data if "id" in item}
+        tasks = Task.objects.filter(owner=user).select_related("artifact").in_bulk(ids)
+
+        prepared, errors, deleted_ids = [], [], set()
+        for item in op_serializer.validated_data:
+            kind = item["op"]
+            task = tasks.get(item.get("id"))
+            values = {key: item[key] for key in ("hours", "until") if key in item}
+            error = {}
+            if kind != "create" and task is None:
+                error = {"id": "Task not found."}
+            elif kind != "create" and task.id in deleted_ids:
+                error = {"id": "Task is deleted earlier in this request."}
+            elif kind in {"create", "update"}:
+                serializer = TaskSerializer(
+                    task, data=item["data"], partial=kind == "update", context=self.get_serializer_context()
+                )
+                if serializer.is_valid():
+                    values = serializer.validated_data
+                else:
+                    error = {"data": serializer.errors}
+            if kind == "delete" and task is not None:
+                deleted_ids.add(task.id)
+            errors.append(error)
+            prepared.append({"op": kind, "task": task, "values": values})
+        if any(errors):
+            raise ValidationError({"operations": errors})
+
+        results = apply_bulk_task_operations(user, prepared)
+        attach_subtask_progress([result["task"] for result in results if result["task"].id not in deleted_ids])
+        return Response(
+            {
+                "results": [
+                    {
+                        "index": index,
+                        "op": result["op"],
+                        "id": result["task"].id,
+                        "task": None if result["task"].id in deleted_ids else TaskSerializer(result["task"]).data,
+                    }
+                    for index, result in enumerate(results)
+                ]
+            }
+        )
+
+    @action(detail=False, methods=["post"], url_path="imports", parser_classes=[MultiPartParser, FormParser])
+    def imports(self, request):
+        """Import tasks from an uploaded CSV or iCalendar (VTODO) file in a background worker."""
+        serializer = TaskImportRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+        try:
+            import_format = detect_import_format(upload.name, serializer.validated_data.get("format"))
+        except ImportFileError as exc:
+            raise ValidationError({"format": str(exc)})
+
+        job = enqueue_task_import(
+            get_request_user(request),
+            upload,
+            import_format,
+            user_timezone=serializer.validated_data.get("timezone") or getattr(request, "cue_timezone", None),
+        )
+        return self._import_job_response(request, job, status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=["get"], url_path=r"imports/(?P<job_id>[0-9]+)")
+    def import_status(self, request, job_id=None):
+        job = TaskImportJob.objects.filter(owner=get_request_user(request), id=job_id).first()
+        if not job:
+            return Response({"detail": "Import not found."}, status=404)
+        return self._import_job_response(request, job)
+
+    @action(detail=False, methods=["post"], url_path=r"imports/(?P<job_id>[0-9]+)/resume")
+    def resume_import(self, request, job_id=None):
+        """Continue a failed import after its last committed batch."""
+        job = TaskImportJob.objects.filter(owner=get_request_user(request), id=job_id).first()
+        if not job:
+            return Response({"detail": "Import not found."}, status=404)
+        if not resume_task_import(job):
+            return Response({"detail": "Only failed imports can be resumed."}, status=409)
+        return self._import_job_response(request, job, status.HTTP_202_ACCEPTED)
+
+    def _import_job_response(self, request, job: TaskImportJob, status_code: int = 200) -> Response:
+        status_url = reverse("tasks-import-status", kwargs={"job_id": job.id}, request=request)
+        headers = {"Location": status_url} if status_code == status.HTTP_202_ACCEPTED else {}
+        if job.status in {TaskImportStatus.QUEUED, TaskImportStatus.PROCESSING}:
+            headers["Retry-After"] = str(self.IMPORT_POLL_INTERVAL_SECONDS)
+        return Response({**TaskImportJobSerializer(job).data, "status_url": status_url}, status=status_code, headers=headers)
+
+    @action(detail=True, methods=["patch"], url_path="metadata")
+    def metadata(self, request, pk=None):
+        """Add, remove, toggle or reorder items of a metadata list without resending the whole task.
+
+        ``version`` must be the task's current ``metadata_version``; a stale version gets 409 with
+        the current metadata so the client can rebase its ops and retry.
+        """
+        serializer = TaskMetadataPatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        task = self.get_object()
+        try:
+            applied = patch_task_metadata(task, data["ops"], data["version"], path=data["path"])
+        except MetadataPatchError as exc:
+            raise ValidationError({"ops": {exc.index: str(exc)}})
+        if not applied:
+            task.refresh_from_db(fields=["metadata_json", "metadata_version"])
+            return Response(
+                {
+                    "detail": "Task metadata changed since this version.",
+                    "metadata_version": task.metadata_version,
+                    "metadata_json": task.metadata_json,
+                },
+                status=409,
+            )
+        return Response(TaskSerializer(task).data)
+
+    @staticmethod
+    def _split_param(value: str | None) -> list[str]:
+        return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+    def _model_fields_for(self, fields: list[str], join_artifact: bool = False) -> list[str]:
+        concrete = {field.name for field in Task._meta.concrete_fields}
+        columns = [*self.PAGINATION_FIELDS, *(name for name in fields if name in concrete)]
+        if join_artifact:
+            columns += [self.ARTIFACT_COLUMNS[name] for name in fields if name in self.ARTIFACT_COLUMNS]
+        return columns
+
+    # Defined last: inside the class body these names shadow the builtin used in annotations above.
+    @conditional_get(_task_etag_parts)
+    def list(self, request, *args, **kwargs):
+        # Rows go straight from .values() to dicts; see TaskRowSerializer.
+        rows = TaskRowSerializer(self.get_requested_fields())
+        queryset = rows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.to_representation(page))
+        return Response(rows.to_representation(queryset))
+
+    @conditional_get(_task_etag_parts)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
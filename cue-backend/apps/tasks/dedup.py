@@ -0,0 +1,157 @@
+"""Near-duplicate task titles: normalized shingles, MinHash signatures and LSH band buckets.
+
+Each task's title is stored as ``BANDS`` bucket keys (TaskTitleBand). A new title is looked up by
+its own buckets with one indexed query; the tasks sharing the most buckets are confirmed by the
+exact Jaccard similarity of their shingles, so the cost does not grow with the number of tasks.
+"""
+
+import hashlib
+import re
+
+from django.db import connection, models
+
+
+BANDS = 16
+ROWS = 2
+NUM_PERM = BANDS * ROWS
+# Titles at or above this shingle Jaccard similarity are treated as the same task.
+SIMILARITY_THRESHOLD = 0.6
+# Candidates must share this many buckets; a title at the threshold shares about six on average.
+MIN_SHARED_BANDS = 2
+MAX_CANDIDATES = 10
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = {"a", "an", "the", "some", "my", "to", "for", "please", "more"}
+# Verbs that mean the same thing in a task title.
+_SYNONYMS = {
+    "get": "buy",
+    "grab": "buy",
+    "purchase": "buy",
+    "pickup": "buy",
+    "phone": "call",
+    "ring": "call",
+    "e-mail": "email",
+    "mail": "email",
+}
+
+
+def normalize_title(title: str) -> str:
+    tokens = [_SYNONYMS.get(token, token) for token in _TOKEN_PATTERN.findall((title or "").casefold())]
+    return " ".join(token for token in tokens if token not in _STOPWORDS)
+
+
+def shingles(title: str) -> set[str]:
+    """Character trigrams of the normalized title (padded, so one-word titles still match)."""
+    text = f" {normalize_title(title)} "
+    if len(text.strip()) == 0:
+        return set()
+    return {text[index : index + 3] for index in range(len(text) - 2)}
+
+
+def jaccard(left: set[str], right: set[str]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def minhash(items: set[str]) -> list[tuple[int, int]]:
+    """One-permutation MinHash: each item is hashed once into one of ``NUM_PERM`` bins.
+
+    Empty bins borrow the next non-empty bin to their right (with the distance, so borrowed values
+    only match other borrowed values), which keeps short titles' signatures comparable.
+    """
+    bins: list[int | None] = [None] * NUM_PERM
+    for item in items:
+        value = int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+        index, value = value % NUM_PERM, value // NUM_PERM
+        if bins[index] is None or value < bins[index]:
+            bins[index] = value
+    signature = []
+    for index in range(NUM_PERM):
+        offset = 0
+        while bins[(index + offset) % NUM_PERM] is None:
+            offset += 1
+        signature.append((bins[(index + offset) % NUM_PERM], offset))
+    return signature
+
+
+def band_buckets(title: str) -> list[int]:
+    """One signed 64-bit bucket key per LSH band; empty for titles without any text."""
+    items = shingles(title)
+    if not items:
+        return []
+    signature = minhash(items)
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS : (band + 1) * ROWS]
+        digest = hashlib.blake2b(repr((band, rows)).encode("ascii"), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "big", signed=True))
+    return buckets
+
+
+def index_titles(tasks, band_model=None) -> None:
+    """(Re)write the band buckets of ``tasks``; call after their titles were written."""
+    band_table = (band_model or _band_model())._meta.db_table
+    tasks = [task for task in tasks if task.id is not None]
+    if not tasks:
+        return
+    # Sixteen rows per task: written with plain executemany rather than one model instance per row.
+    rows = [(task.owner_id, task.id, bucket) for task in tasks for bucket in set(band_buckets(task.title))]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {band_table} WHERE task_id IN ({', '.join(['%s'] * len(tasks))})",
+            [task.id for task in tasks],
+        )
+        cursor.executemany(f"INSERT INTO {band_table} (owner_id, task_id, bucket) VALUES (%s, %s, %s)", rows)
+
+
+def near_duplicate_id(owner_id: int, title: str, exclude_id: int | None = None) -> int | None:
+    """Id of the open task of ``owner_id`` whose title is most similar to ``title``, if any passes the threshold."""
+    from .models import Task, TaskStatus
+
+    buckets = band_buckets(title)
+    if not buckets:
+        return None
+    # Hand-written so a miss (the common case) costs one small indexed query and no ORM compilation.
+    band_table, task_table = _band_model()._meta.db_table, Task._meta.db_table
+    placeholders = ", ".join(["%s"] * len(buckets))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT band.task_id, task.title FROM {band_table} AS band "
+            f"INNER JOIN {task_table} AS task ON task.id = band.task_id "
+            f"WHERE band.owner_id = %s AND band.bucket IN ({placeholders}) AND task.status <> %s AND task.id <> %s "
+            "GROUP BY band.task_id, task.title HAVING COUNT(*) >= %s ORDER BY COUNT(*) DESC LIMIT %s",
+            [owner_id, *buckets, TaskStatus.DONE, exclude_id or 0, MIN_SHARED_BANDS, MAX_CANDIDATES],
+        )
+        candidates = cursor.fetchall()
+
+    target = shingles(title)
+    best_id, best_score = None, SIMILARITY_THRESHOLD
+    for task_id, candidate_title in candidates:
+        score = jaccard(target, shingles(candidate_title))
+        if score >= best_score:
+            best_id, best_score = task_id, score
+    return best_id
+
+
+def rebuild_title_index(task_model, band_model, batch_size: int = 500) -> int:
+    """Index every task's title. Used by the migration that creates the index."""
+    band_model.objects.all().delete()
+    indexed = 0
+    batch = []
+    for task in task_model.objects.only("id", "owner_id", "title").order_by("id").iterator(chunk_size=batch_size):
+        batch.append(task)
+        if len(batch) >= batch_size:
+            index_titles(batch, band_model)
+            indexed += len(batch)
+            batch = []
+    if batch:
+        index_titles(batch, band_model)
+        indexed += len(batch)
+    return indexed
+
+
+def _band_model() -> type[models.Model]:
+    from .models import TaskTitleBand
+
+    return TaskTitleBand
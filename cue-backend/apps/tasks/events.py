@@ -1 +1,12 @@
-# Task domain events can be emitted from services for async processing.
+"""Task domain events, sent after the transaction that caused them commits.
+
+Receivers get ``tasks``: the affected Task instances.
+"""
+
+from django.dispatch import Signal
+
+
+# Snoozed tasks whose snoozed_until passed and that are active again.
+tasks_woken = Signal()
+# Tasks whose materialized priority_score changed because a due/nudge threshold was crossed.
+tasks_rescored = Signal()
@@ -0,0 +1,269 @@
+"""Streaming parsers for task imports: CSV rows and iCalendar VTODO components.
+
+Files are read from a binary stream one line at a time. Every record carries the byte offset and
+line number just after it, so an interrupted import can seek back to the last committed record.
+"""
+
+import csv
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, time, tzinfo
+from pathlib import PurePath
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from dateutil.parser import isoparse
+
+from .models import TaskStatus
+from .recurrence import InvalidRecurrenceRule, normalize_rule
+
+
+IMPORT_FORMATS = ("csv", "ics")
+MAX_LINE_BYTES = 64 * 1024
+MAX_TITLE_LENGTH = 200
+
+# Accepted CSV header names (case-insensitive) for each imported field.
+CSV_COLUMNS = {
+    "title": ("title", "name", "task", "subject", "content"),
+    "notes": ("notes", "note", "description"),
+    "due_at": ("due_at", "due", "due date", "due_date", "deadline"),
+    "status": ("status", "completed", "done"),
+    "urgency": ("urgency",),
+    "importance": ("importance",),
+    "estimated_minutes": ("estimated_minutes", "estimate", "minutes"),
+    "recurrence_rule": ("recurrence_rule", "rrule", "recurrence"),
+}
+_DONE_VALUES = {"done", "completed", "complete", "true", "yes", "x", "1"}
+_OPEN_VALUES = {"", "active", "open", "todo", "needs-action", "in-process", "false", "no", "0"}
+_ICS_TEXT_ESCAPES = {"n": "\n", "N": "\n", ",": ",", ";": ";", "\\": "\\"}
+
+
+class ImportFileError(ValueError):
+    """The file cannot be imported at all (unknown format, no title column, oversized or non-UTF-8 line)."""
+
+
+class ImportRowError(ValueError):
+    """One record is invalid; it is skipped and reported with its line number."""
+
+
+@dataclass
+class ImportRecord:
+    line: int
+    end_line: int
+    end_offset: int
+    fields: dict[str, str] = field(default_factory=dict)
+
+
+def detect_import_format(filename: str, declared: str | None = None) -> str:
+    if declared:
+        return declared
+    suffix = PurePath(filename or "").suffix.lower().lstrip(".")
+    if suffix in {"ics", "ical", "ifb", "icalendar"}:
+        return "ics"
+    if suffix in {"csv", "txt"}:
+        return "csv"
+    raise ImportFileError("Could not tell the file format; pass format=csv or format=ics.")
+
+
+def iter_task_records(stream, import_format: str, offset: int = 0, line: int = 0) -> Iterator[ImportRecord]:
+    """Records of ``stream`` starting at byte ``offset`` (which must be a record boundary)."""
+    if import_format == "csv":
+        return iter_csv_records(stream, offset, line)
+    if import_format == "ics":
+        return iter_ics_records(stream, offset, line)
+    raise ImportFileError(f"Unsupported import format: {import_format}")
+
+
+class _LineSource:
+    """Decoded lines of a binary stream; ``offset``/``line`` always point just past the last line handed out."""
+
+    def __init__(self, stream, offset: int = 0, line: int = 0):
+        self.stream = stream
+        self.offset = offset
+        self.line = line
+
+    def __iter__(self) -> Iterator[str]:
+        self.stream.seek(self.offset)
+        while True:
+            raw = self.stream.readline(MAX_LINE_BYTES + 1)
+            if not raw:
+                return
+            if len(raw) > MAX_LINE_BYTES:
+                raise ImportFileError(f"Line {self.line + 1} is longer than {MAX_LINE_BYTES} bytes.")
+            try:
+                text = raw.decode("utf-8")
+            except UnicodeDecodeError as exc:
+                raise ImportFileError(f"Line {self.line + 1} is not valid UTF-8.") from exc
+            if self.offset == 0:
+                text = text.removeprefix("\ufeff")
+            self.offset += len(raw)
+            self.line += 1
+            yield text
+
+
+def iter_csv_records(stream, offset: int = 0, line: int = 0) -> Iterator[ImportRecord]:
+    """One record per CSV row, keyed by the CSV_COLUMNS field names; quoted fields may span lines."""
+    header_source = _LineSource(stream)
+    header = next(csv.reader(header_source), None)
+    if header is None:
+        return
+    columns = {}
+    for index, name in enumerate(header):
+        name = name.strip().casefold()
+        for field_name, aliases in CSV_COLUMNS.items():
+            if name in aliases and field_name not in columns.values():
+                columns[index] = field_name
+    if "title" not in columns.values():
+        raise ImportFileError(f"The CSV header needs a title column (one of: {', '.join(CSV_COLUMNS['title'])}).")
+
+    source = _LineSource(stream, max(offset, header_source.offset), max(line, header_source.line))
+    start_line = source.line + 1
+    for row in csv.reader(source):
+        if any(value.strip() for value in row):
+            fields = {name: row[index] for index, name in columns.items() if index < len(row)}
+            yield ImportRecord(line=start_line, end_line=source.line, end_offset=source.offset, fields=fields)
+        start_line = source.line + 1
+
+
+def iter_ics_records(stream, offset: int = 0, line: int = 0) -> Iterator[ImportRecord]:
+    """One record per VTODO component; folded lines are joined and text values unescaped."""
+    source = _LineSource(stream, offset, line)
+    pending, pending_line, pending_end = None, 0, (offset, line)
+    todo, todo_line, depth = None, 0, 0
+
+    for text in source:
+        text = text.rstrip("\r\n")
+        if text[:1] in {" ", "\t"} and pending is not None:
+            pending += text[1:]
+            pending_end = (source.offset, source.line)
+            continue
+        if pending is not None:
+            record = _ics_content_line(pending, pending_line, pending_end, todo, todo_line, depth)
+            todo, todo_line, depth, completed = record
+            if completed is not None:
+                yield completed
+        pending, pending_line, pending_end = text, source.line, (source.offset, source.line)
+
+    if pending is not None:
+        _, _, _, completed = _ics_content_line(pending, pending_line, pending_end, todo, todo_line, depth)
+        if completed is not None:
+            yield completed
+
+
+def _ics_content_line(text: str, line: int, end: tuple[int, int], todo: dict | None, todo_line: int, depth: int):
+    """Apply one unfolded content line; returns the new parser state and a finished record, if any."""
+    name_part, _, value = text.partition(":")
+    name, *params = name_part.split(";")
+    name = name.strip().upper()
+    value = value.strip()
+
+    if name == "BEGIN":
+        if todo is None and value.upper() == "VTODO":
+            return {}, line, 0, None
+        return todo, todo_line, depth + (todo is not None), None
+    if todo is None:
+        return None, 0, 0, None
+    if name == "END":
+        if depth:
+            return todo, todo_line, depth - 1, None
+        return None, 0, 0, ImportRecord(line=todo_line, end_line=end[1], end_offset=end[0], fields=todo)
+    if depth:
+        # Properties of nested components (e.g. a VALARM's DESCRIPTION) are not the task's.
+        return todo, todo_line, depth, None
+
+    param_map = {}
+    for param in params:
+        key, _, param_value = param.partition("=")
+        param_map[key.strip().upper()] = param_value.strip().strip('"')
+    if name == "SUMMARY":
+        todo["title"] = _ics_unescape(value)
+    elif name == "DESCRIPTION":
+        todo["notes"] = _ics_unescape(value)
+    elif name == "DUE":
+        todo["due_at"] = value
+        if param_map.get("TZID"):
+            todo["due_tz"] = param_map["TZID"]
+    elif name == "STATUS":
+        todo.setdefault("status", "done" if value.upper() in {"COMPLETED", "CANCELLED"} else "active")
+    elif name == "COMPLETED":
+        todo["status"] = "done"
+    elif name == "PRIORITY" and value.isdigit() and 1 <= int(value) <= 9:
+        # iCalendar priority runs 1 (highest) to 9 (lowest); 0 means undefined.
+        todo["urgency"] = str(5 - (int(value) - 1) // 2)
+    elif name == "RRULE":
+        todo["recurrence_rule"] = value
+    return todo, todo_line, depth, None
+
+
+def _ics_unescape(value: str) -> str:
+    chars = []
+    index = 0
+    while index < len(value):
+        char = value[index]
+        if char == "\\" and index + 1 < len(value):
+            chars.append(_ICS_TEXT_ESCAPES.get(value[index + 1], value[index + 1]))
+            index += 2
+            continue
+        chars.append(char)
+        index += 1
+    return "".join(chars)
+
+
+def task_values(fields: dict[str, str], tz: tzinfo) -> dict:
+    """Validated Task field values for one record; raises ImportRowError when it cannot be imported."""
+    title = " ".join((fields.get("title") or "").split())
+    if not title:
+        raise ImportRowError("Title is required.")
+    if len(title) > MAX_TITLE_LENGTH:
+        raise ImportRowError(f"Title is longer than {MAX_TITLE_LENGTH} characters.")
+    values = {"title": title, "notes": (fields.get("notes") or "").strip()}
+
+    due_at = (fields.get("due_at") or "").strip()
+    if due_at:
+        values["due_at"] = _parse_due_at(due_at, _zone(fields.get("due_tz"), tz))
+
+    status = (fields.get("status") or "").strip().casefold()
+    if status in _DONE_VALUES:
+        values["status"] = TaskStatus.DONE
+    elif status not in _OPEN_VALUES:
+        raise ImportRowError(f"Unknown status {fields['status']!r}.")
+
+    for name, low, high in (("urgency", 1, 5), ("importance", 1, 5), ("estimated_minutes", 5, 24 * 60)):
+        raw = (fields.get(name) or "").strip()
+        if not raw:
+            continue
+        try:
+            number = int(raw)
+        except ValueError:
+            raise ImportRowError(f"{name} must be a whole number, not {raw!r}.") from None
+        if not low <= number <= high:
+            raise ImportRowError(f"{name} must be between {low} and {high}.")
+        values[name] = number
+
+    rule = (fields.get("recurrence_rule") or "").strip()
+    if rule:
+        try:
+            values["recurrence_rule"] = normalize_rule(rule)
+        except InvalidRecurrenceRule as exc:
+            raise ImportRowError(str(exc)) from None
+    return values
+
+
+def _parse_due_at(value: str, tz: tzinfo) -> datetime:
+    try:
+        parsed = isoparse(value)
+    except (ValueError, OverflowError):
+        raise ImportRowError(f"Due date {value!r} is not an ISO 8601 date or date-time.") from None
+    if len(value) <= len("YYYY-MM-DD"):
+        # A due date without a time is due by the end of that day.
+        return datetime.combine(parsed.date(), time(23, 59), tzinfo=tz)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=tz)
+
+
+def _zone(name: str | None, default: tzinfo) -> tzinfo:
+    if not name:
+        return default
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        # Some calendar apps use their own zone names; fall back to the user's timezone.
+        return default
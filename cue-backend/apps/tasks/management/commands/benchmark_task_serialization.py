@@ -0,0 +1,98 @@
+import json
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.api.renderers import ORJSONRenderer
+from apps.tasks.api.rows import TaskRowSerializer
+from apps.tasks.api.serializers import TaskSerializer
+from apps.tasks.models import Task, TaskArtifact
+from apps.tasks.services import attach_subtask_progress
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare TaskSerializer + JSONRenderer against TaskRowSerializer + ORJSONRenderer on synthetic task lists. "
+        "Runs inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+        parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing per measurement.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = get_user_model().objects.create(username=f"bench-{time.time_ns()}")
+            created = 0
+            for size in sorted(options["sizes"]):
+                self._create_tasks(user, size - created)
+                created = size
+                self._report(user, size, options["repeat"])
+            transaction.set_rollback(True)
+
+    def _report(self, user, size: int, repeat: int) -> None:
+        queryset = Task.objects.filter(owner=user).order_by("-created_at", "-id")[:size]
+
+        def baseline():
+            tasks = list(queryset.select_related("artifact"))
+            attach_subtask_progress(tasks)
+            data = TaskSerializer(tasks, many=True).data
+            return JSONRenderer().render(data)
+
+        def fast():
+            rows = TaskRowSerializer()
+            return ORJSONRenderer().render(rows.to_representation(rows.values(queryset)))
+
+        baseline_ms, baseline_body = self._best_of(baseline, repeat)
+        fast_ms, fast_body = self._best_of(fast, repeat)
+        if json.loads(baseline_body) != json.loads(fast_body):
+            raise CommandError(f"Fast path output differs from TaskSerializer at {size} tasks.")
+
+        self.stdout.write(
+            f"{size} tasks: serializer+json {baseline_ms:.1f}ms ({len(baseline_body)} bytes), "
+            f"values+orjson {fast_ms:.1f}ms ({len(fast_body)} bytes), {baseline_ms / fast_ms:.1f}x faster"
+        )
+
+    @staticmethod
+    def _best_of(func, repeat: int) -> tuple[float, bytes]:
+        best = None
+        body = b""
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            body = func()
+            elapsed = (time.perf_counter() - started) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        return best, body
+
+    @staticmethod
+    def _create_tasks(user, count: int) -> None:
+        now = timezone.now()
+        tasks = [
+            Task(
+                owner=user,
+                title=f"Benchmark task {index}",
+                notes="Pick up the dry cleaning and drop off the parcel." if index % 3 == 0 else "",
+                metadata_json={"kind": "shopping_list", "shopping_list": {"items": [{"label": "Milk"}]}}
+                if index % 5 == 0
+                else {},
+                due_at=now + timedelta(hours=index % 96) if index % 2 == 0 else None,
+                urgency=index % 5 + 1,
+                importance=(index * 7) % 5 + 1,
+            )
+            for index in range(count)
+        ]
+        for task in tasks:
+            task.refresh_priority(now)
+        Task.objects.bulk_create(tasks, batch_size=1000)
+        TaskArtifact.objects.bulk_create(
+            [
+                TaskArtifact(task=task, html="<ul><li>Milk</li></ul>", render_spec={"title": task.title, "blocks": []})
+                for task in tasks[::4]
+            ],
+            batch_size=1000,
+        )
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.imports import IMPORT_FORMATS, ImportFileError, detect_import_format
+from apps.tasks.models import TaskImportJob
+from apps.tasks.services import enqueue_task_import, resume_task_import, run_task_import
+
+
+class Command(BaseCommand):
+    help = "Import tasks from a CSV or iCalendar (VTODO) file, or resume an interrupted import, in this process."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="CSV or .ics file to import.")
+        parser.add_argument("--user", help="Username that will own the imported tasks.")
+        parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--timezone", default="", help="Timezone for due dates without one.")
+        parser.add_argument("--resume", type=int, metavar="JOB_ID", help="Continue a failed or interrupted import.")
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        if options["resume"]:
+            job = TaskImportJob.objects.filter(id=options["resume"]).first()
+            if job is None:
+                raise CommandError(f"Import {options['resume']} does not exist.")
+            # An operator resuming by hand is asserting that no worker still runs the job.
+            if not resume_task_import(job, include_processing=True, dispatch=False):
+                raise CommandError(f"Import {job.id} is {job.status}; only failed or interrupted imports resume.")
+        else:
+            job = self._create_job(options)
+
+        self.stdout.write(f"Importing job {job.id} from line {job.line + 1}.")
+        job = run_task_import(job.id, batch_size=options["batch_size"], on_progress=self._report)
+        if job is None:
+            raise CommandError("The import was claimed by another worker.")
+        self.stdout.write(
+            f"Import {job.id} {job.status}: {job.imported_count} imported, {job.skipped_count} skipped."
+        )
+        for row_error in job.row_errors:
+            self.stdout.write(f"  line {row_error['line']}: {row_error['error']}")
+        if job.error:
+            raise CommandError(f"{job.error} Resume with --resume {job.id}.")
+
+    def _create_job(self, options) -> TaskImportJob:
+        if not options["path"] or not options["user"]:
+            raise CommandError("Pass a file path and --user, or --resume JOB_ID.")
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"{path} is not a file.")
+        user = get_user_model().objects.filter(username=options["user"]).first()
+        if user is None:
+            raise CommandError(f"User {options['user']} does not exist.")
+        try:
+            import_format = detect_import_format(path.name, options["format"])
+        except ImportFileError as exc:
+            raise CommandError(str(exc)) from exc
+        with path.open("rb") as handle:
+            return enqueue_task_import(
+                user, File(handle, name=path.name), import_format, user_timezone=options["timezone"], dispatch=False
+            )
+
+    def _report(self, job: TaskImportJob) -> None:
+        self.stdout.write(
+            f"  {job.progress:.0%} ({job.offset}/{job.size} bytes): "
+            f"{job.imported_count} imported, {job.skipped_count} skipped"
+        )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.tasks.services import materialize_recurring_tasks
+
+
+class Command(BaseCommand):
+    help = "Create occurrences of recurring tasks that fall inside the rolling window (CUE_RECURRENCE_WINDOW_DAYS)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        created = materialize_recurring_tasks(batch_size=options["batch_size"])
+        self.stdout.write(f"Created {created} occurrence(s).")
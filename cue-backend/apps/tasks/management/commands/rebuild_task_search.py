@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.tasks.models import Task
+from apps.tasks.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Drop and rebuild the task full-text search index from every task."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index(Task, batch_size=options["batch_size"])
+        self.stdout.write(f"Indexed {indexed} task(s).")
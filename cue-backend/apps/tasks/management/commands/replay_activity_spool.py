@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.tasks.activity import deserialize_entry, write_activity_entries
+
+
+class Command(BaseCommand):
+    help = "Insert task activity entries spooled to disk when the buffered writer could not reach the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default=settings.CUE_ACTIVITY_LOG_SPOOL_PATH)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            self.stdout.write("Spool is empty.")
+            return
+
+        # Claim the file first so writers that spool meanwhile start a fresh one.
+        claimed = path.with_name(f"{path.name}.replaying")
+        if claimed.exists():
+            raise CommandError(f"{claimed} exists; a previous replay did not finish. Move it back to retry.")
+        path.rename(claimed)
+
+        inserted = 0
+        batch = []
+        with claimed.open(encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    batch.append(deserialize_entry(json.loads(line)))
+                except (ValueError, KeyError) as exc:
+                    self.stderr.write(f"Skipping line {line_number}: {exc}")
+                    continue
+                if len(batch) >= options["batch_size"]:
+                    inserted += write_activity_entries(batch)
+                    batch = []
+        if batch:
+            inserted += write_activity_entries(batch)
+
+        claimed.unlink()
+        self.stdout.write(f"Inserted {inserted} activity entr{'y' if inserted == 1 else 'ies'}.")
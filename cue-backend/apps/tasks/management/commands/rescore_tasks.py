@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.tasks.models import Task
+from apps.tasks.services import rescore_due_tasks
+
+
+class Command(BaseCommand):
+    help = "Refresh materialized task priority scores whose next_rescore_at has passed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every task instead of only those due for rescoring.",
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            Task.objects.update(next_rescore_at=timezone.now())
+        rescored = rescore_due_tasks(batch_size=options["batch_size"])
+        self.stdout.write(f"Rescored {rescored} task(s).")
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from apps.tasks.waker import TaskWaker
+
+
+class Command(BaseCommand):
+    help = "Wake snoozed tasks and refresh priority scores exactly when they become due (long-running)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lookahead", type=int, default=500, help="Upcoming transitions kept in memory.")
+        parser.add_argument(
+            "--refresh-seconds",
+            type=float,
+            default=30.0,
+            help="Reload upcoming transitions at least this often to see other processes' writes.",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--once", action="store_true", help="Apply what is due now and exit.")
+
+    def handle(self, *args, **options):
+        waker = TaskWaker(
+            lookahead=options["lookahead"],
+            refresh_seconds=options["refresh_seconds"],
+            batch_size=options["batch_size"],
+        )
+        if options["once"]:
+            counts = waker.step()
+            self.stdout.write(f"Woke {counts.get('woken', 0)} task(s), rescored {counts.get('rescored', 0)}.")
+            return
+        self.stdout.write("Task waker running.")
+        waker.run()
@@ -0,0 +1,116 @@
+"""Item-level edits to lists inside ``Task.metadata_json`` (e.g. shopping list items)."""
+
+import copy
+
+
+DEFAULT_ITEMS_PATH = "shopping_list.items"
+ITEM_OPS = ("add", "remove", "toggle", "reorder")
+MAX_ITEMS = 200
+
+
+class MetadataPatchError(ValueError):
+    def __init__(self, index: int, message: str):
+        super().__init__(message)
+        self.index = index
+
+
+def apply_item_ops(metadata_json: dict | None, ops: list[dict], path: str = DEFAULT_ITEMS_PATH) -> tuple[dict, list]:
+    """Apply ``ops`` to the list at dotted ``path``; returns the new metadata and the new item list.
+
+    Items are ``{"label": str, "done": bool}``; an op addresses one by ``index`` or by ``label``
+    (first case-insensitive match). The input is not modified.
+    """
+    metadata = copy.deepcopy(metadata_json) if isinstance(metadata_json, dict) else {}
+    parent = metadata
+    *parents, leaf = path.split(".")
+    for key in parents:
+        if not isinstance(parent.get(key), dict):
+            parent[key] = {}
+        parent = parent[key]
+    items = _normalize_items(parent.get(leaf))
+
+    for index, op in enumerate(ops):
+        kind = op["op"]
+        if kind == "add":
+            if len(items) >= MAX_ITEMS:
+                raise MetadataPatchError(index, f"A list holds at most {MAX_ITEMS} items.")
+            position = len(items) if op.get("index") is None else op["index"]
+            items.insert(min(max(position, 0), len(items)), {"label": op["label"], "done": bool(op.get("done", False))})
+        elif kind == "remove":
+            items.pop(_locate(items, op, index))
+        elif kind == "toggle":
+            item = items[_locate(items, op, index)]
+            item["done"] = not item["done"] if op.get("done") is None else bool(op["done"])
+        elif kind == "reorder":
+            position = _locate(items, op, index)
+            if not 0 <= op["to"] < len(items):
+                raise MetadataPatchError(index, f"Target index {op['to']} is out of range.")
+            items.insert(op["to"], items.pop(position))
+
+    parent[leaf] = items
+    return metadata, items
+
+
+def get_items(metadata_json: dict | None, path: str = DEFAULT_ITEMS_PATH) -> list[dict]:
+    """The list at dotted ``path`` as ``{"label", "done"}`` items; empty when missing."""
+    value = metadata_json
+    for key in path.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return _normalize_items(value)
+
+
+def with_items_unchecked(metadata_json: dict | None, path: str = DEFAULT_ITEMS_PATH) -> dict:
+    """Copy of the metadata with every item at ``path`` unchecked, e.g. for the next occurrence of a list."""
+    items = get_items(metadata_json, path)
+    if not any(item["done"] for item in items):
+        return copy.deepcopy(metadata_json) if isinstance(metadata_json, dict) else {}
+    ops = [{"op": "toggle", "index": index, "done": False} for index in range(len(items))]
+    return apply_item_ops(metadata_json, ops, path)[0]
+
+
+def render_items_block(render_spec: dict | None, path: str, items: list[dict]) -> dict:
+    """Re-render only the checklist block showing ``path``; every other block is kept as is.
+
+    The block is the one tagged with ``source == path``, else the first checklist, else a new one.
+    """
+    spec = dict(render_spec) if isinstance(render_spec, dict) else {}
+    blocks = [dict(block) if isinstance(block, dict) else block for block in spec.get("blocks") or []]
+    block_items = [{"label": item["label"], "done": item["done"]} for item in items]
+
+    target = next((block for block in blocks if isinstance(block, dict) and block.get("source") == path), None)
+    if target is None:
+        target = next((block for block in blocks if isinstance(block, dict) and block.get("type") == "checklist"), None)
+    if target is None:
+        target = {"type": "checklist", "label": "Items"}
+        blocks.append(target)
+    target["items"] = block_items
+    target["source"] = path
+
+    spec["blocks"] = blocks
+    return spec
+
+
+def _normalize_items(value) -> list[dict]:
+    if not isinstance(value, list):
+        return []
+    return [normalized for item in value if (normalized := _normalize_item(item))]
+
+
+def _normalize_item(item) -> dict | None:
+    if isinstance(item, str):
+        return {"label": item, "done": False}
+    if isinstance(item, dict) and isinstance(item.get("label"), str):
+        return {**item, "done": bool(item.get("done", False))}
+    return None
+
+
+def _locate(items: list[dict], op: dict, op_index: int) -> int:
+    if op.get("index") is not None:
+        if not 0 <= op["index"] < len(items):
+            raise MetadataPatchError(op_index, f"Item index {op['index']} is out of range.")
+        return op["index"]
+    label = (op.get("label") or "").casefold()
+    for position, item in enumerate(items):
+        if item["label"].casefold() == label:
+            return position
+    raise MetadataPatchError(op_index, f"No item labelled {op.get('label')!r}.")
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:25
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+from apps.tasks.scoring import next_rescore_at, task_priority_score
+
+
+def backfill_priority_scores(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    now = timezone.now()
+    batch = []
+    fields = ["id", "importance", "urgency", "due_at", "last_nudged_at"]
+    for task in Task.objects.only(*fields).iterator(chunk_size=1000):
+        task.priority_score = task_priority_score(task, now)
+        task.next_rescore_at = next_rescore_at(task, now)
+        batch.append(task)
+        if len(batch) >= 1000:
+            Task.objects.bulk_update(batch, ["priority_score", "next_rescore_at"])
+            batch = []
+    if batch:
+        Task.objects.bulk_update(batch, ["priority_score", "next_rescore_at"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_task_metadata_fields'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='next_rescore_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority_score',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_priority_scores, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'status', '-priority_score'], name='tasks_task_owner_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'next_rescore_at'], name='tasks_task_owner_rescore_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['next_rescore_at'], name='tasks_task_rescore_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_priority_score'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='tasks_task_owner_created_idx'),
+        ),
+    ]
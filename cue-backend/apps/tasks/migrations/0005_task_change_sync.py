@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_change_seqs(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskSyncState = apps.get_model("tasks", "TaskSyncState")
+    owner_ids = Task.objects.order_by().values_list("owner_id", flat=True).distinct()
+    for owner_id in owner_ids:
+        batch = []
+        seq = 0
+        for task in Task.objects.filter(owner_id=owner_id).order_by("updated_at", "id").only("id").iterator():
+            seq += 1
+            task.change_seq = seq
+            batch.append(task)
+        Task.objects.bulk_update(batch, ["change_seq"], batch_size=1000)
+        TaskSyncState.objects.update_or_create(owner_id=owner_id, defaults={"last_seq": seq})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('tasks', '0004_task_owner_created_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskSyncState',
+            fields=[
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='task_sync_state', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_seq', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task_id', models.BigIntegerField()),
+                ('change_seq', models.PositiveBigIntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='change_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'change_seq'], name='tasks_task_owner_change_idx'),
+        ),
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_tombstones', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['owner', 'change_seq'], name='tasks_tombstone_owner_seq_idx'),
+        ),
+        migrations.RunPython(backfill_change_seqs, migrations.RunPython.noop),
+    ]
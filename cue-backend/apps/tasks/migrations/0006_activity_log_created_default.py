@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:31
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_task_change_sync'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskactivitylog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def move_artifacts_out(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskArtifact = apps.get_model("tasks", "TaskArtifact")
+    artifacts, tasks = [], []
+    queryset = Task.objects.only("id", "metadata_json", "metadata_html").order_by("id")
+    for task in queryset.iterator(chunk_size=500):
+        metadata = task.metadata_json if isinstance(task.metadata_json, dict) else {}
+        render_spec = metadata.pop("render_spec", None)
+        if not task.metadata_html and render_spec is None:
+            continue
+        artifacts.append(
+            TaskArtifact(
+                task_id=task.id,
+                html=task.metadata_html or "",
+                render_spec=render_spec if isinstance(render_spec, dict) else {},
+            )
+        )
+        task.metadata_json = metadata
+        tasks.append(task)
+        if len(artifacts) >= 500:
+            TaskArtifact.objects.bulk_create(artifacts)
+            Task.objects.bulk_update(tasks, ["metadata_json"])
+            artifacts, tasks = [], []
+    TaskArtifact.objects.bulk_create(artifacts)
+    Task.objects.bulk_update(tasks, ["metadata_json"])
+
+
+def move_artifacts_back(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskArtifact = apps.get_model("tasks", "TaskArtifact")
+    for artifact in TaskArtifact.objects.select_related("task").iterator(chunk_size=500):
+        task = artifact.task
+        metadata = task.metadata_json if isinstance(task.metadata_json, dict) else {}
+        if artifact.render_spec:
+            metadata["render_spec"] = artifact.render_spec
+        Task.objects.filter(id=task.id).update(metadata_json=metadata, metadata_html=artifact.html)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_activity_log_created_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskArtifact',
+            fields=[
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='artifact', serialize=False, to='tasks.task')),
+                ('html', models.TextField(blank=True)),
+                ('render_spec', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(move_artifacts_out, move_artifacts_back),
+        migrations.RemoveField(
+            model_name='task',
+            name='metadata_html',
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:35
+
+import apps.core.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_artifact'),
+    ]
+
+    operations = [
+        apps.core.fields.AlterToCompressedField(
+            model_name='taskartifact',
+            name='html',
+            field=apps.core.fields.CompressedTextField(blank=True, default=''),
+        ),
+        apps.core.fields.AlterToCompressedField(
+            model_name='taskartifact',
+            name='render_spec',
+            field=apps.core.fields.CompressedJSONField(blank=True, default=dict),
+        ),
+    ]
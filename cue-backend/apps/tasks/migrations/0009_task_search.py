@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from apps.tasks.search import get_search_backend, rebuild_index
+
+
+def create_search_index(apps, schema_editor):
+    rebuild_index(apps.get_model("tasks", "Task"), connection=schema_editor.connection)
+
+
+def drop_search_index(apps, schema_editor):
+    get_search_backend(schema_editor.connection).uninstall()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_compressed_artifacts'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
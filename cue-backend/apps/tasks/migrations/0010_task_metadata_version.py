@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='metadata_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:44
+
+import django.db.models.fields.json
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_task_metadata_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='metadata_kind',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.fields.json.KeyTextTransform('kind', 'metadata_json'), output_field=models.TextField(null=True)),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'metadata_kind'], name='tasks_task_owner_kind_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_task_recurrence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'snoozed')), fields=['owner', 'snoozed_until'], name='tasks_task_owner_snooze_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('status', 'snoozed')), fields=['snoozed_until'], name='tasks_task_snooze_idx'),
+        ),
+    ]
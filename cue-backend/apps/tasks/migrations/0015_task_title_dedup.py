@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.tasks.dedup import rebuild_title_index
+
+
+def index_task_titles(apps, schema_editor):
+    rebuild_title_index(apps.get_model("tasks", "Task"), apps.get_model("tasks", "TaskTitleBand"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0014_task_subtasks'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='duplicate_of',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='tasks.task'),
+        ),
+        migrations.CreateModel(
+            name='TaskTitleBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField()),
+                ('owner', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='title_bands', to='tasks.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['owner', 'bucket'], name='tasks_titleband_bucket_idx')],
+            },
+        ),
+        migrations.RunPython(index_task_titles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:40
+
+from django.db import migrations
+
+
+def clear_done_rescores(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    Task.objects.filter(status="done", next_rescore_at__isnull=False).update(next_rescore_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0016_task_import_job'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_done_rescores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:05
+
+import django.db.models.fields.json
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0017_clear_done_rescore'),
+    ]
+
+    # A generated column's expression cannot be altered in place, so it is dropped and re-added
+    # (the database recomputes it for every row) together with its index.
+    operations = [
+        migrations.RemoveIndex(
+            model_name='task',
+            name='tasks_task_owner_kind_idx',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='metadata_kind',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='metadata_kind',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower(django.db.models.fields.json.KeyTextTransform('kind', 'metadata_json')), output_field=models.TextField(null=True)),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['owner', 'metadata_kind'], name='tasks_task_owner_kind_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+from apps.tasks.search import rebuild_index
+
+
+def reindex_tasks(apps, schema_editor):
+    rebuild_index(apps.get_model("tasks", "Task"), connection=schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0018_task_metadata_kind_lower'),
+    ]
+
+    # Search documents no longer include metadata_json's kind tag; re-index existing tasks.
+    operations = [
+        migrations.RunPython(reindex_tasks, migrations.RunPython.noop),
+    ]
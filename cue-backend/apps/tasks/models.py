@@ -1,5 +1,15 @@
+import copy
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from apps.core.fields import CompressedJSONField, CompressedTextField
+
+from .scoring import next_rescore_at, task_priority_score
 
 
 class TaskStatus(models.TextChoices):
@@ -16,6 +26,36 @@ class FollowUpState(models.TextChoices):
     CLOSED = "closed", "Closed"
 
 
+class TaskSyncState(models.Model):
+    """Per-user monotonic change counter backing task delta sync."""
+
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="task_sync_state",
+    )
+    last_seq = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def allocate(cls, owner_id: int, count: int = 1) -> int:
+        """Reserve ``count`` sequence numbers for the owner and return the highest one.
+
+        Call inside the transaction that writes the changed rows: the counter row stays locked
+        until commit, so sequence numbers become visible in order.
+        """
+        with transaction.atomic():
+            updated = cls.objects.filter(owner_id=owner_id).update(last_seq=F("last_seq") + count)
+            if not updated:
+                cls.objects.get_or_create(owner_id=owner_id)
+                cls.objects.filter(owner_id=owner_id).update(last_seq=F("last_seq") + count)
+            return cls.objects.filter(owner_id=owner_id).values_list("last_seq", flat=True).get()
+
+    @classmethod
+    def current(cls, owner_id: int) -> int:
+        return cls.objects.filter(owner_id=owner_id).values_list("last_seq", flat=True).first() or 0
+
+
 class Task(models.Model):
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -24,8 +64,16 @@ class Task(models.Model):
     )
     title = models.CharField(max_length=200)
     notes = models.TextField(blank=True)
+    # Small structured metadata only; the rendered artifacts live in TaskArtifact (see get_artifact).
     metadata_json = models.JSONField(default=dict, blank=True)
-    metadata_html = models.TextField(blank=True)
+    # lower(metadata_json->>'kind'), computed by the database so "all shopping lists" is an index lookup.
+    metadata_kind = models.GeneratedField(
+        expression=Lower(KeyTextTransform("kind", "metadata_json")),
+        output_field=models.TextField(null=True),
+        db_persist=True,
+    )
+    # Bumped on every metadata write; item patches compare-and-swap on it (see patch_task_metadata).
+    metadata_version = models.PositiveIntegerField(default=0)
     due_at = models.DateTimeField(null=True, blank=True)
     is_hard_deadline = models.BooleanField(default=False)
     estimated_minutes = models.PositiveIntegerField(default=30)
@@ -40,23 +88,275 @@ class Task(models.Model):
     snoozed_until = models.DateTimeField(null=True, blank=True)
     last_nudged_at = models.DateTimeField(null=True, blank=True)
     nudge_count_today = models.PositiveSmallIntegerField(default=0)
+    # Subtasks; TaskClosure mirrors the tree so subtree reads are a single indexed join.
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="children",
+    )
+    # RRULE text (see recurrence.py). The task holding it is the series and its own first occurrence;
+    # later occurrences are separate tasks pointing back at it, materialized up to recurrence_cursor.
     recurrence_rule = models.CharField(max_length=120, blank=True)
+    recurrence_source = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="occurrences",
+    )
+    occurrence_at = models.DateTimeField(null=True, blank=True)
+    recurrence_cursor = models.DateTimeField(null=True, blank=True)
+    # Open task with a near-identical title at creation time (see dedup.py); a hint for the client.
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    # Materialized task_priority_score; next_rescore_at is when it next changes (see rescore_due_tasks).
+    priority_score = models.IntegerField(default=0)
+    next_rescore_at = models.DateTimeField(null=True, blank=True)
+    change_seq = models.PositiveBigIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Attributes stored on TaskArtifact rather than as columns of this table.
+    ARTIFACT_ATTRIBUTES = ("metadata_html", "render_spec")
+
     class Meta:
         ordering = ["due_at", "-urgency", "-importance", "created_at"]
+        indexes = [
+            models.Index(fields=["owner", "status", "-priority_score"], name="tasks_task_owner_priority_idx"),
+            models.Index(fields=["owner", "next_rescore_at"], name="tasks_task_owner_rescore_idx"),
+            models.Index(fields=["next_rescore_at"], name="tasks_task_rescore_idx"),
+            models.Index(fields=["owner", "-created_at", "-id"], name="tasks_task_owner_created_idx"),
+            models.Index(fields=["owner", "change_seq"], name="tasks_task_owner_change_idx"),
+            models.Index(fields=["owner", "metadata_kind"], name="tasks_task_owner_kind_idx"),
+            models.Index(
+                fields=["owner", "snoozed_until"],
+                name="tasks_task_owner_snooze_idx",
+                condition=models.Q(status="snoozed"),
+            ),
+            models.Index(fields=["snoozed_until"], name="tasks_task_snooze_idx", condition=models.Q(status="snoozed")),
+            models.Index(
+                fields=["recurrence_cursor"],
+                name="tasks_task_recurring_idx",
+                condition=~models.Q(recurrence_rule=""),
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recurrence_source", "occurrence_at"],
+                name="tasks_task_unique_occurrence",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def get_artifact(self) -> "TaskArtifact":
+        """The task's heavy rendered content, loaded on first access.
+
+        Costs one query unless the queryset used ``select_related("artifact")``. Tasks without a
+        stored artifact get an empty unsaved one, which save() persists once it is written to.
+        """
+        try:
+            return self.artifact
+        except TaskArtifact.DoesNotExist:
+            artifact = TaskArtifact(task=self)
+            self.artifact = artifact
+            return artifact
+
+    @property
+    def metadata_html(self) -> str:
+        return self.get_artifact().html
+
+    @metadata_html.setter
+    def metadata_html(self, value: str):
+        self.get_artifact().html = value or ""
+        self._artifact_changed = True
+
+    @property
+    def render_spec(self) -> dict:
+        return self.get_artifact().render_spec
+
+    @render_spec.setter
+    def render_spec(self, value: dict):
+        self.get_artifact().render_spec = value or {}
+        self._artifact_changed = True
+
+    def pending_artifact(self) -> "TaskArtifact | None":
+        """Artifact to write with this task, if any.
+
+        A ``render_spec`` placed in ``metadata_json`` (API clients and LLM patches still send it
+        there) is moved onto the artifact first.
+        """
+        metadata_loaded = "metadata_json" not in self.get_deferred_fields()
+        if metadata_loaded and isinstance(self.metadata_json, dict) and "render_spec" in self.metadata_json:
+            render_spec = self.metadata_json.pop("render_spec")
+            self.render_spec = render_spec if isinstance(render_spec, dict) else {}
+        if not getattr(self, "_artifact_changed", False):
+            return None
+        return self.get_artifact()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        task = super().from_db(db, field_names, values)
+        # Kept to tell whether a full save() really changed the metadata (see metadata_changed).
+        if "metadata_json" not in task.get_deferred_fields():
+            task._loaded_metadata = copy.deepcopy(task.metadata_json)
+        return task
+
+    def metadata_changed(self) -> bool:
+        """Whether ``metadata_json`` differs from the value loaded from the database (new tasks: True)."""
+        if self._state.adding:
+            return True
+        if "metadata_json" in self.get_deferred_fields() or not hasattr(self, "_loaded_metadata"):
+            return False
+        return self.metadata_json != self._loaded_metadata
+
+    def refresh_priority(self, now=None):
+        now = now or timezone.now()
+        self.priority_score = task_priority_score(self, now)
+        # A done task is never ranked again, so it has no threshold left to wait for.
+        self.next_rescore_at = None if self.status == TaskStatus.DONE else next_rescore_at(self, now)
+
+    def save(self, *args, **kwargs):
+        self.refresh_priority()
+        artifact = self.pending_artifact()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            bump_version = "metadata_json" in update_fields
+        else:
+            # A full save only invalidates the client's metadata version when the metadata changed.
+            bump_version = self.metadata_changed()
+        if bump_version:
+            self.metadata_version += 1
+        if update_fields is not None:
+            columns = set(update_fields) - set(self.ARTIFACT_ATTRIBUTES)
+            if "metadata_json" in columns:
+                columns.add("metadata_version")
+            kwargs["update_fields"] = {*columns, "priority_score", "next_rescore_at", "change_seq"}
+        with transaction.atomic():
+            self.change_seq = TaskSyncState.allocate(self.owner_id)
+            super().save(*args, **kwargs)
+            if artifact is not None:
+                artifact.save()
+                self._artifact_changed = False
+        if "metadata_json" not in self.get_deferred_fields():
+            self._loaded_metadata = copy.deepcopy(self.metadata_json)
+
+
+class TaskArtifact(models.Model):
+    """Rendered task content kept out of the task row so scheduling queries stay narrow."""
+
+    task = models.OneToOneField(Task, on_delete=models.CASCADE, primary_key=True, related_name="artifact")
+    html = CompressedTextField(default="", blank=True)
+    render_spec = CompressedJSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
 
 class TaskActivityLog(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="activity_logs")
     actor = models.CharField(max_length=24, default="assistant")
     action = models.CharField(max_length=64)
     metadata = models.JSONField(default=dict, blank=True)
+    # Not auto_now_add: buffered entries keep the time the action happened, not the time of the flush.
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+
+class TaskClosure(models.Model):
+    """Every ancestor/descendant pair of the subtask tree (``depth`` >= 1), maintained on writes."""
+
+    # Both columns lead a composite index below, so the default single-column FK indexes are skipped.
+    ancestor = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="descendant_links", db_index=False)
+    descendant = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="ancestor_links", db_index=False)
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["ancestor", "descendant"], name="tasks_closure_unique_pair"),
+        ]
+        indexes = [
+            models.Index(fields=["descendant", "depth"], name="tasks_closure_descendant_idx"),
+        ]
+
+
+class TaskTitleBand(models.Model):
+    """One LSH band bucket of a task's title MinHash (see dedup.py), for near-duplicate lookups."""
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+", db_index=False)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="title_bands")
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "bucket"], name="tasks_titleband_bucket_idx"),
+        ]
+
+
+class TaskTombstone(models.Model):
+    """Marks a deleted task so delta sync can tell clients to drop it."""
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="task_tombstones")
+    task_id = models.BigIntegerField()
+    change_seq = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "change_seq"], name="tasks_tombstone_owner_seq_idx"),
+        ]
+
+
+class TaskImportStatus(models.TextChoices):
+    QUEUED = "queued", "Queued"
+    PROCESSING = "processing", "Processing"
+    SUCCEEDED = "succeeded", "Succeeded"
+    FAILED = "failed", "Failed"
+
+
+class TaskImportJob(models.Model):
+    """A CSV or iCalendar file imported as tasks in batches.
+
+    ``offset`` and ``line`` point just past the last committed record; they are saved in the same
+    transaction as each batch, so a failed import resumes there without duplicating tasks.
+    """
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="task_import_jobs")
+    status = models.CharField(max_length=16, choices=TaskImportStatus.choices, default=TaskImportStatus.QUEUED)
+    format = models.CharField(max_length=8, choices=[("csv", "CSV"), ("ics", "iCalendar")])
+    source = models.FileField(upload_to="task_imports/%Y/%m/%d/", blank=True)
+    timezone = models.CharField(max_length=64, blank=True)
+    size = models.PositiveBigIntegerField(default=0)
+    offset = models.PositiveBigIntegerField(default=0)
+    line = models.PositiveIntegerField(default=0)
+    imported_count = models.PositiveIntegerField(default=0)
+    skipped_count = models.PositiveIntegerField(default=0)
+    # The first MAX_REPORTED_ERRORS skipped records, as {"line", "error"}.
+    row_errors = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    MAX_REPORTED_ERRORS = 100
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["owner", "-created_at"], name="tasks_import_owner_idx"),
+        ]
+
+    @property
+    def progress(self) -> float:
+        if self.status == TaskImportStatus.SUCCEEDED:
+            return 1.0
+        return min(self.offset / self.size, 1.0) if self.size else 0.0
@@ -0,0 +1,61 @@
+"""RRULE parsing and lazy occurrence generation for recurring tasks."""
+
+from collections.abc import Iterator
+from datetime import datetime, tzinfo
+
+from dateutil.rrule import DAILY, rrule, rrulestr
+
+
+class InvalidRecurrenceRule(ValueError):
+    pass
+
+
+def normalize_rule(text: str) -> str:
+    """Validate an RRULE (``FREQ=WEEKLY;BYDAY=MO,WE``, optionally prefixed ``RRULE:``) and return it bare.
+
+    Rules more frequent than daily are rejected: each occurrence becomes a task row.
+    """
+    text = (text or "").strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[len("RRULE:") :]
+    text = text.upper()
+    if not text:
+        return ""
+    parse_rule(text, datetime(2000, 1, 1))
+    return text
+
+
+def parse_rule(text: str, dtstart: datetime) -> rrule:
+    try:
+        rule = rrulestr(text, dtstart=dtstart)
+    except (ValueError, TypeError) as exc:
+        raise InvalidRecurrenceRule(f"Invalid recurrence rule: {exc}") from exc
+    if not isinstance(rule, rrule):
+        raise InvalidRecurrenceRule("Only a single RRULE is supported.")
+    if rule._freq > DAILY:
+        raise InvalidRecurrenceRule("Tasks can recur at most daily.")
+    return rule
+
+
+def iter_occurrences(
+    text: str,
+    series_start: datetime,
+    after: datetime,
+    tz: tzinfo,
+    cursor: datetime | None = None,
+) -> Iterator[datetime]:
+    """Occurrences strictly after ``after``, generated lazily as aware datetimes.
+
+    Rules are evaluated in ``tz`` wall-clock time, so "daily at 09:00" stays at 09:00 across DST
+    changes. ``cursor`` is the latest occurrence already materialized; expansion restarts from it
+    instead of the series start, unless the rule has a COUNT (which counts from the start).
+    """
+    rule = parse_rule(text, _wall_clock(series_start, tz))
+    if cursor is not None and rule._count is None:
+        rule = rule.replace(dtstart=_wall_clock(cursor, tz))
+    for occurrence in rule.xafter(_wall_clock(after, tz), inc=False):
+        yield occurrence.replace(tzinfo=tz)
+
+
+def _wall_clock(value: datetime, tz: tzinfo) -> datetime:
+    return value.astimezone(tz).replace(tzinfo=None)
@@ -0,0 +1,78 @@
+"""Deterministic render specs for well-known ``metadata_json["kind"]`` values.
+
+The assistant asks the LLM for a render spec only when no renderer is registered for a task's kind.
+"""
+
+from collections.abc import Callable
+
+from .metadata import DEFAULT_ITEMS_PATH, get_items, render_items_block
+
+
+SUMMARY_KIND = "summary"
+
+RENDERERS: dict[str, Callable] = {}
+
+
+def register_renderer(kind: str):
+    def decorator(func):
+        RENDERERS[kind] = func
+        return func
+
+    return decorator
+
+
+def metadata_kind(metadata_json) -> str:
+    """The task's kind; tasks without one and without other metadata render as a summary."""
+    if not isinstance(metadata_json, dict):
+        return SUMMARY_KIND
+    kind = metadata_json.get("kind")
+    if isinstance(kind, str) and kind.strip():
+        return kind.strip().lower()
+    if isinstance(metadata_json.get("shopping_list"), dict):
+        return "shopping_list"
+    if not any(key != "render_spec" for key in metadata_json):
+        return SUMMARY_KIND
+    return ""
+
+
+def render_task_spec(task) -> dict | None:
+    """Render spec from the registry, or None when the task's kind has no local renderer."""
+    renderer = RENDERERS.get(metadata_kind(task.metadata_json))
+    if renderer is None:
+        return None
+    return renderer(task)
+
+
+def _status_blocks(task) -> list[dict]:
+    blocks = []
+    if task.due_at:
+        blocks.append({"type": "key_value", "key": "Due", "value": task.due_at.isoformat()})
+    blocks.append({"type": "key_value", "key": "Status", "value": task.status})
+    return blocks
+
+
+@register_renderer(SUMMARY_KIND)
+def render_summary(task) -> dict:
+    blocks = []
+    if task.notes:
+        blocks.append({"type": "text", "label": "Notes", "content": task.notes})
+    return {"title": task.title, "blocks": blocks + _status_blocks(task)}
+
+
+@register_renderer("note")
+def render_note(task) -> dict:
+    metadata_json = task.metadata_json if isinstance(task.metadata_json, dict) else {}
+    content = metadata_json.get("content") if isinstance(metadata_json.get("content"), str) else ""
+    blocks = [{"type": "text", "content": text} for text in (task.notes, content) if text]
+    return {"title": task.title, "blocks": blocks + _status_blocks(task)}
+
+
+@register_renderer("shopping_list")
+def render_shopping_list(task) -> dict:
+    spec = {"title": task.title, "blocks": []}
+    if task.notes:
+        spec["blocks"].append({"type": "text", "label": "Notes", "content": task.notes})
+    spec = render_items_block(spec, DEFAULT_ITEMS_PATH, get_items(task.metadata_json, DEFAULT_ITEMS_PATH))
+    spec["blocks"][-1]["label"] = "Shopping list"
+    spec["blocks"].extend(_status_blocks(task))
+    return spec
@@ -0,0 +1,55 @@
+"""Pure priority scoring helpers shared by the Task model, services and migrations."""
+
+from datetime import timedelta
+
+from django.utils import timezone
+
+
+DUE_SOON_WINDOW = timedelta(days=3)
+DUE_TODAY_WINDOW = timedelta(hours=24)
+RECENT_NUDGE_WINDOW = timedelta(hours=2)
+OVERDUE_BONUS = 12
+DUE_TODAY_BONUS = 8
+DUE_SOON_BONUS = 4
+RECENT_NUDGE_PENALTY = 4
+# Scores only rise as time passes: at most from no due bonus to overdue, plus a nudge penalty expiring.
+MAX_SCORE_RISE = OVERDUE_BONUS + RECENT_NUDGE_PENALTY
+# Smallest step past a boundary; scores use strict comparisons at "overdue" and "nudge expired".
+_EPSILON = timedelta(microseconds=1)
+
+
+def task_priority_score(task, now=None) -> int:
+    score = (task.importance * 3) + (task.urgency * 2)
+    now = now or timezone.now()
+
+    if task.due_at:
+        if task.due_at < now:
+            score += OVERDUE_BONUS
+        elif task.due_at <= now + DUE_TODAY_WINDOW:
+            score += DUE_TODAY_BONUS
+        elif task.due_at <= now + DUE_SOON_WINDOW:
+            score += DUE_SOON_BONUS
+
+    if task.last_nudged_at and task.last_nudged_at >= now - RECENT_NUDGE_WINDOW:
+        score -= RECENT_NUDGE_PENALTY
+
+    return max(score, 0)
+
+
+def next_rescore_at(task, now=None):
+    """The next instant at which task_priority_score(task) can change, or None if it never will."""
+    now = now or timezone.now()
+    candidates = []
+    if task.due_at:
+        candidates.extend(
+            [
+                task.due_at - DUE_SOON_WINDOW,
+                task.due_at - DUE_TODAY_WINDOW,
+                task.due_at + _EPSILON,
+            ]
+        )
+    if task.last_nudged_at:
+        candidates.append(task.last_nudged_at + RECENT_NUDGE_WINDOW + _EPSILON)
+
+    upcoming = [candidate for candidate in candidates if candidate > now]
+    return min(upcoming) if upcoming else None
@@ -0,0 +1,170 @@
+import logging
+import re
+
+from django.db import connection as default_connection
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "tasks_task_search"
+# Fields whose changes require re-indexing a task.
+INDEXED_FIELDS = {"title", "notes", "metadata_json"}
+MAX_BODY_CHARS = 20000
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def metadata_text(value) -> list[str]:
+    """Every string leaf of a metadata value, e.g. the labels of shopping list items."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [text for item in value.values() for text in metadata_text(item)]
+    if isinstance(value, list):
+        return [text for item in value for text in metadata_text(item)]
+    return []
+
+
+def search_document(title: str, notes: str, metadata_json) -> tuple[str, str]:
+    metadata = metadata_json or {}
+    if isinstance(metadata, dict):
+        # The top-level kind is a type tag ("shopping_list"), not content, and would match every task of that kind.
+        metadata = {key: value for key, value in metadata.items() if key != "kind"}
+    body = "\n".join([notes or "", *metadata_text(metadata)]).strip()
+    return title or "", body[:MAX_BODY_CHARS]
+
+
+def query_terms(query: str) -> list[str]:
+    return _TOKEN_PATTERN.findall((query or "").casefold())[:12]
+
+
+class SQLiteTaskSearchBackend:
+    """FTS5 table keyed by task id; matches every term as a prefix, ranked by bm25 (title weighted up)."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5("
+                "owner_id UNINDEXED, title, body, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+
+    def uninstall(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+    def index(self, rows: list[tuple[int, int, str, str]]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (rowid, owner_id, title, body) VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, task_ids: list[int]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = %s", [(task_id,) for task_id in task_ids])
+
+    def search(self, owner_id: int, terms: list[str], limit: int) -> list[tuple[int, float]]:
+        match = " ".join(f'"{term}"*' for term in terms)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, bm25({SEARCH_TABLE}, 0.0, 10.0, 1.0) AS rank FROM {SEARCH_TABLE} "
+                f"WHERE {SEARCH_TABLE} MATCH %s AND owner_id = %s ORDER BY rank, rowid DESC LIMIT %s",
+                [match, owner_id, limit],
+            )
+            # bm25 is lower-is-better; flip it so every backend returns higher-is-better.
+            return [(task_id, -rank) for task_id, rank in cursor.fetchall()]
+
+
+class PostgresTaskSearchBackend:
+    """tsvector table with a GIN index; title terms weigh A, notes and metadata B, ranked by ts_rank_cd."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {SEARCH_TABLE} ("
+                "task_id bigint PRIMARY KEY REFERENCES tasks_task (id) ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+                "owner_id integer NOT NULL, "
+                "document tsvector NOT NULL)"
+            )
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document_idx ON {SEARCH_TABLE} USING gin (document)")
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_owner_idx ON {SEARCH_TABLE} (owner_id)")
+
+    def uninstall(self) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+    def index(self, rows: list[tuple[int, int, str, str]]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SEARCH_TABLE} (task_id, owner_id, document) VALUES (%s, %s, "
+                "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')) "
+                "ON CONFLICT (task_id) DO UPDATE SET owner_id = EXCLUDED.owner_id, document = EXCLUDED.document",
+                rows,
+            )
+
+    def remove(self, task_ids: list[int]) -> None:
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE task_id = ANY(%s)", [list(task_ids)])
+
+    def search(self, owner_id: int, terms: list[str], limit: int) -> list[tuple[int, float]]:
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT task_id, ts_rank_cd(document, query) AS rank "
+                f"FROM {SEARCH_TABLE}, to_tsquery('simple', %s) AS query "
+                "WHERE owner_id = %s AND document @@ query ORDER BY rank DESC, task_id DESC LIMIT %s",
+                [tsquery, owner_id, limit],
+            )
+            return [(task_id, float(rank)) for task_id, rank in cursor.fetchall()]
+
+
+def get_search_backend(connection=None):
+    connection = connection or default_connection
+    if connection.vendor == "postgresql":
+        return PostgresTaskSearchBackend(connection)
+    if connection.vendor == "sqlite":
+        return SQLiteTaskSearchBackend(connection)
+    raise NotImplementedError(f"Task search is not supported on {connection.vendor}")
+
+
+def index_rows(tasks) -> list[tuple[int, int, str, str]]:
+    return [(task.id, task.owner_id, *search_document(task.title, task.notes, task.metadata_json)) for task in tasks]
+
+
+def index_tasks(tasks, connection=None) -> None:
+    rows = index_rows(tasks)
+    if rows:
+        get_search_backend(connection).index(rows)
+
+
+def remove_tasks(task_ids, connection=None) -> None:
+    task_ids = list(task_ids)
+    if task_ids:
+        get_search_backend(connection).remove(task_ids)
+
+
+def rebuild_index(task_model, connection=None, batch_size: int = 500) -> int:
+    """Re-create the index from every task. Used by the migration and ``rebuild_task_search``."""
+    backend = get_search_backend(connection)
+    backend.uninstall()
+    backend.install()
+    indexed = 0
+    batch = []
+    queryset = task_model.objects.only("id", "owner_id", "title", "notes", "metadata_json").order_by("id")
+    for task in queryset.iterator(chunk_size=batch_size):
+        batch.append(task)
+        if len(batch) >= batch_size:
+            backend.index(index_rows(batch))
+            indexed += len(batch)
+            batch = []
+    if batch:
+        backend.index(index_rows(batch))
+        indexed += len(batch)
+    return indexed
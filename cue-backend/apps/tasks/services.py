@@ -1,43 +1,947 @@
-from datetime import timedelta
+import logging
+from collections import defaultdict
+from datetime import timedelta, tzinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from django.db.models import QuerySet
+from django.conf import settings
+from django.db import reset_queries, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, QuerySet
 from django.utils import timezone
 
-from .models import Task, TaskActivityLog, TaskStatus
+from apps.preferences.models import UserPreference
+
+from .activity import get_activity_buffer
+from .dedup import index_titles, near_duplicate_id
+from .events import tasks_rescored, tasks_woken
+from .imports import ImportFileError, ImportRowError, iter_task_records, task_values
+from .metadata import (
+    DEFAULT_ITEMS_PATH,
+    MAX_ITEMS,
+    apply_item_ops,
+    get_items,
+    render_items_block,
+    with_items_unchecked,
+)
+from .models import (
+    Task,
+    TaskActivityLog,
+    TaskArtifact,
+    TaskClosure,
+    TaskImportJob,
+    TaskImportStatus,
+    TaskStatus,
+    TaskSyncState,
+    TaskTombstone,
+)
+from .recurrence import InvalidRecurrenceRule, iter_occurrences
+from .scoring import MAX_SCORE_RISE
+from .search import get_search_backend, index_tasks, query_terms
+
+
+logger = logging.getLogger(__name__)
 
 
 def log_task_activity(task: Task, action: str, actor: str = "assistant", metadata=None) -> TaskActivityLog:
-    return TaskActivityLog.objects.create(
+    """Record an activity entry; in buffered mode it is written after commit, in a batch."""
+    entry = TaskActivityLog(
         task=task,
         action=action,
         actor=actor,
         metadata=metadata or {},
     )
+    if settings.CUE_ACTIVITY_LOG_MODE == "buffered":
+        get_activity_buffer().add(entry)
+    else:
+        entry.save()
+    return entry
+
+
+def delete_task(task: Task) -> None:
+    """Delete a task and its subtasks, leaving a tombstone for each so delta sync drops them too."""
+    with transaction.atomic():
+        tombstones = [
+            TaskTombstone(owner_id=task.owner_id, task_id=task_id) for task_id in [task.id, *descendant_ids([task.id])]
+        ]
+        assign_change_seqs(tombstones)
+        TaskTombstone.objects.bulk_create(tombstones)
+        task.delete()
+
+
+def assign_change_seqs(rows: list[Task | TaskTombstone]) -> None:
+    """Give each task or tombstone a fresh change sequence number. Call inside the transaction that writes them."""
+    by_owner = defaultdict(list)
+    for row in rows:
+        by_owner[row.owner_id].append(row)
+    for owner_id, owner_rows in by_owner.items():
+        last_seq = TaskSyncState.allocate(owner_id, count=len(owner_rows))
+        for offset, row in enumerate(owner_rows):
+            row.change_seq = last_seq - len(owner_rows) + 1 + offset
+
+
+BULK_ACTIVITY_ACTIONS = {
+    "create": "task_created",
+    "update": "task_updated",
+    "complete": "task_completed",
+    "snooze": "task_snoozed",
+}
+
+
+def apply_bulk_task_operations(user, operations: list[dict], actor: str = "user") -> list[dict]:
+    """Apply already-validated task operations for ``user`` in one transaction.
+
+    Each operation is ``{"op", "task", "values"}``: ``task`` is the owned instance (None for creates),
+    ``values`` the validated field values for create/update, or ``hours``/``until`` for snooze.
+    Operations on the same task accumulate on one instance. Returns ``{"op", "task"}`` per operation,
+    in input order, with ``task`` reflecting the final written state.
+    """
+    now = timezone.now()
+    created: list[Task] = []
+    updated: dict[int, Task] = {}
+    deleted: dict[int, Task] = {}
+    update_fields = {"updated_at", "priority_score", "next_rescore_at", "change_seq"}
+    activity = []
+    results = []
+    before = {}
+
+    for operation in operations:
+        kind = operation["op"]
+        task = operation.get("task")
+        values = operation.get("values") or {}
+        if task is not None:
+            before.setdefault(task.id, task_snapshot(task))
+
+        if kind == "create":
+            # Same starting state as a single create: version 1 (Task.save) and a flagged near-duplicate.
+            # Tasks created in the same batch are not checked against each other.
+            task = Task(
+                owner=user,
+                metadata_version=1,
+                duplicate_of_id=near_duplicate_id(user.id, values.get("title", "")),
+                **values,
+            )
+            created.append(task)
+        elif kind == "delete":
+            updated.pop(task.id, None)
+            deleted[task.id] = task
+        else:
+            if kind == "update":
+                for name, value in values.items():
+                    setattr(task, name, value)
+                update_fields.update(values)
+                if "metadata_json" in values:
+                    task.metadata_version += 1
+                    update_fields.add("metadata_version")
+            elif kind == "complete":
+                task.status = TaskStatus.DONE
+                update_fields.add("status")
+            elif kind == "snooze":
+                task.status = TaskStatus.SNOOZED
+                task.snoozed_until = values.get("until") or now + timedelta(hours=values.get("hours", 24))
+                update_fields.update({"status", "snoozed_until"})
+            task.updated_at = now
+            updated[task.id] = task
+
+        if kind in BULK_ACTIVITY_ACTIONS:
+            metadata = {"hours": values["hours"]} if kind == "snooze" and "hours" in values else {}
+            activity.append((task, BULK_ACTIVITY_ACTIONS[kind], metadata))
+        results.append({"op": kind, "task": task})
+
+    written = [*created, *updated.values()]
+    for task in written:
+        task.refresh_priority(now)
+    artifacts = [artifact for artifact in (task.pending_artifact() for task in written) if artifact is not None]
+    update_fields -= set(Task.ARTIFACT_ATTRIBUTES)
+    # Deleting a task deletes its subtasks (parent is CASCADE), so they need tombstones as well.
+    removed_ids = [*deleted, *(set(descendant_ids(deleted)) - set(deleted))] if deleted else []
+    tombstones = [TaskTombstone(owner_id=user.id, task_id=task_id) for task_id in removed_ids]
+
+    with transaction.atomic():
+        assign_change_seqs([*written, *tombstones])
+        Task.objects.bulk_create(created)
+        if updated:
+            Task.objects.bulk_update(list(updated.values()), sorted(update_fields))
+        if artifacts:
+            TaskArtifact.objects.bulk_create(
+                artifacts,
+                update_conflicts=True,
+                unique_fields=["task"],
+                update_fields=["html", "render_spec", "updated_at"],
+            )
+        TaskTombstone.objects.bulk_create(tombstones)
+        TaskActivityLog.objects.bulk_create(
+            TaskActivityLog(task=task, action=action, actor=actor, metadata=metadata)
+            for task, action, metadata in activity
+            if task.id not in deleted
+        )
+        # Bulk writes skip post_save, so index here; the delete below still sends post_delete.
+        index_tasks(written)
+        index_titles(written)
+        if deleted:
+            Task.objects.filter(owner=user, id__in=deleted).delete()
+
+    for task in written:
+        if task.id not in removed_ids:
+            after_task_write(task, before.get(task.id), now)
+    return results
+
+
+def task_changes_since(user, since: int, limit: int = 500) -> dict:
+    """Tasks written and tasks deleted after change sequence ``since``, oldest change first.
+
+    ``next_token`` is the sequence to pass as ``since`` on the next call; when ``has_more`` is set the
+    client should call again immediately.
+    """
+    # Rows at or below the committed counter are fully written, so nothing can appear behind the token.
+    upper = TaskSyncState.current(user.id)
+    tasks = list(
+        Task.objects.filter(owner=user, change_seq__gt=since, change_seq__lte=upper)
+        .select_related("artifact")
+        .order_by("change_seq")[: limit + 1]
+    )
+    tombstones = list(
+        TaskTombstone.objects.filter(owner=user, change_seq__gt=since, change_seq__lte=upper)
+        .order_by("change_seq")
+        .values("task_id", "change_seq")[: limit + 1]
+    )
+
+    merged = sorted(
+        [(task.change_seq, "task", task) for task in tasks]
+        + [(row["change_seq"], "tombstone", row["task_id"]) for row in tombstones],
+        key=lambda item: item[0],
+    )
+    has_more = len(merged) > limit
+    merged = merged[:limit]
+    next_token = merged[-1][0] if has_more else max(upper, since)
+    return {
+        "tasks": [item for _, kind, item in merged if kind == "task"],
+        "deleted": [item for _, kind, item in merged if kind == "tombstone"],
+        "next_token": next_token,
+        "has_more": has_more,
+    }
+
+
+def patch_task_metadata(task: Task, ops: list[dict], expected_version: int, path: str = DEFAULT_ITEMS_PATH) -> bool:
+    """Apply item ops to a list in the task's metadata, if ``metadata_version`` is still ``expected_version``.
+
+    Written with a compare-and-swap UPDATE; returns False without writing when another write won.
+    Only the checklist block showing the list is re-rendered, without an LLM call. Raises
+    MetadataPatchError for ops that do not apply to the current items.
+    """
+    if task.metadata_version != expected_version:
+        return False
+    metadata, items = apply_item_ops(task.metadata_json, ops, path)
+    now = timezone.now()
+
+    with transaction.atomic():
+        change_seq = TaskSyncState.allocate(task.owner_id)
+        updated = Task.objects.filter(id=task.id, metadata_version=expected_version).update(
+            metadata_json=metadata,
+            metadata_version=F("metadata_version") + 1,
+            change_seq=change_seq,
+            updated_at=now,
+        )
+        if not updated:
+            transaction.set_rollback(True)
+            return False
+
+        task.metadata_json = metadata
+        task.metadata_version = expected_version + 1
+        task.change_seq = change_seq
+        task.updated_at = now
+        task.render_spec = render_items_block(task.render_spec, path, items)
+        task.get_artifact().save()
+        index_tasks([task])
+        log_task_activity(
+            task,
+            action="task_metadata_items_patched",
+            actor="user",
+            metadata={"path": path, "ops": [op["op"] for op in ops]},
+        )
+    return True
+
+
+def merge_into_duplicate(task: Task, notes: str = "", metadata_json=None, due_at=None, actor: str = "assistant") -> list[str]:
+    """Fold a would-be new task into its near-duplicate ``task`` instead of creating a second one.
+
+    Fills ``due_at`` when the task has none, appends notes it does not contain yet and adds the
+    shopping list items it is missing. Returns the names of the fields that changed (possibly none).
+    """
+    fields = []
+    if due_at is not None and task.due_at is None:
+        task.due_at = due_at
+        fields.append("due_at")
+    notes = (notes or "").strip()
+    if notes and notes.casefold() not in task.notes.casefold():
+        task.notes = f"{task.notes}\n{notes}".strip()
+        fields.append("notes")
+    items = get_items(task.metadata_json)
+    labels = {item["label"].casefold() for item in items}
+    missing = [item for item in get_items(metadata_json) if item["label"].casefold() not in labels]
+    missing = missing[: max(MAX_ITEMS - len(items), 0)]
+    if missing:
+        task.metadata_json, _ = apply_item_ops(task.metadata_json, [{"op": "add", "label": item["label"]} for item in missing])
+        fields.append("metadata_json")
+
+    if fields:
+        task.save(update_fields=[*fields, "updated_at"])
+    log_task_activity(task, action="task_merged_duplicate", actor=actor, metadata={"fields": fields})
+    return fields
+
+
+def recurrence_horizon(now=None):
+    return (now or timezone.now()) + timedelta(days=settings.CUE_RECURRENCE_WINDOW_DAYS)
+
+
+def materialize_occurrences(series_id: int, until=None, limit: int | None = None, now=None, tz: tzinfo | None = None) -> list[Task]:
+    """Create the next occurrences of a recurring task, up to ``until`` and at most ``limit`` of them.
+
+    Generation resumes after the series' ``recurrence_cursor``; occurrences already in the past are
+    skipped rather than back-filled. The series row is locked, so the scheduled job and completions
+    never create the same occurrence twice.
+    """
+    if until is None and limit is None:
+        raise ValueError("Pass until or limit; recurrence rules may be unbounded.")
+    now = now or timezone.now()
+    with transaction.atomic():
+        series = Task.objects.select_for_update().filter(id=series_id).exclude(recurrence_rule="").first()
+        if series is None:
+            return []
+        tz = tz or owner_timezones([series.owner_id])[series.owner_id]
+        series_start = series.due_at or series.created_at
+        after = max(series.recurrence_cursor or series_start, now)
+
+        planned = []
+        try:
+            for occurrence_at in iter_occurrences(
+                series.recurrence_rule, series_start, after, tz, cursor=series.recurrence_cursor
+            ):
+                if until is not None and occurrence_at > until:
+                    break
+                planned.append(occurrence_at)
+                if limit is not None and len(planned) >= limit:
+                    break
+        except InvalidRecurrenceRule:
+            logger.warning("TASK_RECURRENCE_INVALID_RULE task_id=%s rule=%s", series.id, series.recurrence_rule)
+            return []
+        if not planned:
+            return []
+
+        existing = set(
+            Task.objects.filter(recurrence_source=series, occurrence_at__in=planned).values_list("occurrence_at", flat=True)
+        )
+        occurrences = [
+            _occurrence_of(series, occurrence_at, now) for occurrence_at in planned if occurrence_at not in existing
+        ]
+        assign_change_seqs(occurrences)
+        Task.objects.bulk_create(occurrences)
+        Task.objects.filter(id=series.id).update(recurrence_cursor=planned[-1])
+        TaskActivityLog.objects.bulk_create(
+            TaskActivityLog(task=occurrence, action="task_occurrence_created", actor="system")
+            for occurrence in occurrences
+        )
+        index_tasks(occurrences)
+        index_titles(occurrences)
+    return occurrences
+
+
+def _occurrence_of(series: Task, occurrence_at, now) -> Task:
+    occurrence = Task(
+        owner_id=series.owner_id,
+        title=series.title,
+        notes=series.notes,
+        metadata_json=with_items_unchecked(series.metadata_json),
+        due_at=occurrence_at,
+        is_hard_deadline=series.is_hard_deadline,
+        estimated_minutes=series.estimated_minutes,
+        urgency=series.urgency,
+        importance=series.importance,
+        recurrence_source_id=series.id,
+        occurrence_at=occurrence_at,
+    )
+    occurrence.refresh_priority(now)
+    return occurrence
+
+
+def materialize_recurring_tasks(now=None, batch_size: int = 200) -> int:
+    """Scheduled job: materialize every recurring task's occurrences inside the rolling window."""
+    now = now or timezone.now()
+    horizon = recurrence_horizon(now)
+    queryset = (
+        Task.objects.exclude(recurrence_rule="")
+        .filter(Q(recurrence_cursor__isnull=True) | Q(recurrence_cursor__lt=horizon))
+        .order_by("id")
+        .only("id", "owner_id")
+    )
+    created = 0
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        zones = owner_timezones({series.owner_id for series in batch})
+        for series in batch:
+            created += len(materialize_occurrences(series.id, until=horizon, now=now, tz=zones[series.owner_id]))
+        last_id = batch[-1].id
+    return created
+
+
+def advance_recurrence(task: Task, now=None) -> list[Task]:
+    """After ``task`` is completed, make sure its series still has an open occurrence after it."""
+    series_id = task.recurrence_source_id or (task.id if task.recurrence_rule else None)
+    if series_id is None:
+        return []
+    upcoming = Task.objects.filter(recurrence_source_id=series_id).exclude(status=TaskStatus.DONE)
+    if task.occurrence_at or task.due_at:
+        upcoming = upcoming.filter(occurrence_at__gt=task.occurrence_at or task.due_at)
+    if upcoming.exists():
+        return []
+    return materialize_occurrences(series_id, limit=1, now=now)
+
+
+def reschedule_series(series: Task, now=None) -> list[Task]:
+    """Replace a series' open future occurrences after its rule or start time changed."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        stale_ids = list(
+            Task.objects.filter(recurrence_source=series, occurrence_at__gt=now)
+            .exclude(status=TaskStatus.DONE)
+            .values_list("id", flat=True)
+        )
+        tombstones = [TaskTombstone(owner_id=series.owner_id, task_id=task_id) for task_id in stale_ids]
+        assign_change_seqs(tombstones)
+        TaskTombstone.objects.bulk_create(tombstones)
+        Task.objects.filter(id__in=stale_ids).delete()
+        Task.objects.filter(id=series.id).update(recurrence_cursor=None)
+        if not series.recurrence_rule:
+            return []
+        return materialize_occurrences(series.id, until=recurrence_horizon(now), now=now)
+
+
+# Fields whose changes have side effects beyond the task row (see after_task_write).
+TRACKED_FIELDS = ("recurrence_rule", "due_at", "status", "parent_id")
+
+
+def task_snapshot(task: Task) -> dict:
+    return {name: getattr(task, name) for name in TRACKED_FIELDS}
+
+
+def after_task_write(task: Task, before: dict | None = None, now=None) -> None:
+    """Keep a task's subtask tree and recurrence series in step with a write to it.
+
+    ``before`` is the task's task_snapshot() from before the write, or None for a new task.
+    """
+    if before is None:
+        if task.parent_id:
+            set_task_parent(task)
+        if task.recurrence_rule:
+            materialize_occurrences(task.id, until=recurrence_horizon(now), now=now)
+        return
+    if task.parent_id != before["parent_id"]:
+        set_task_parent(task)
+    if (task.recurrence_rule or before["recurrence_rule"]) and (
+        task.recurrence_rule != before["recurrence_rule"] or task.due_at != before["due_at"]
+    ):
+        reschedule_series(task, now)
+    if task.status == TaskStatus.DONE and before["status"] != TaskStatus.DONE:
+        complete_subtasks(task, now)
+        advance_recurrence(task, now)
+
+
+def owner_timezones(owner_ids) -> dict[int, tzinfo]:
+    """Each owner's preferred timezone, for evaluating recurrence rules in local time."""
+    names = dict(UserPreference.objects.filter(user_id__in=owner_ids).values_list("user_id", "timezone"))
+    zones = {}
+    for owner_id in owner_ids:
+        try:
+            zones[owner_id] = ZoneInfo(names.get(owner_id) or settings.TIME_ZONE)
+        except (ZoneInfoNotFoundError, ValueError):
+            zones[owner_id] = ZoneInfo(settings.TIME_ZONE)
+    return zones
+
+
+def descendant_ids(task_ids) -> list[int]:
+    return list(
+        TaskClosure.objects.filter(ancestor_id__in=task_ids).values_list("descendant_id", flat=True).distinct()
+    )
+
+
+def set_task_parent(task: Task) -> None:
+    """Rewrite the closure rows of ``task``'s subtree after its ``parent`` was set or changed.
+
+    Callers validate that the new parent is not inside the subtree (see TaskSerializer.validate).
+    """
+    with transaction.atomic():
+        subtree = [(task.id, 0), *TaskClosure.objects.filter(ancestor=task).values_list("descendant_id", "depth")]
+        subtree_ids = [task_id for task_id, _ in subtree]
+        TaskClosure.objects.filter(descendant_id__in=subtree_ids).exclude(ancestor_id__in=subtree_ids).delete()
+        if task.parent_id is None:
+            return
+        ancestors = [
+            (task.parent_id, 0),
+            *TaskClosure.objects.filter(descendant_id=task.parent_id).values_list("ancestor_id", "depth"),
+        ]
+        TaskClosure.objects.bulk_create(
+            TaskClosure(ancestor_id=ancestor_id, descendant_id=task_id, depth=ancestor_depth + 1 + depth)
+            for ancestor_id, ancestor_depth in ancestors
+            for task_id, depth in subtree
+        )
+
+
+def create_subtasks(parent: Task, steps: list[dict], actor: str = "assistant") -> list[Task]:
+    """Create ``steps`` (``{"title", "estimated_minutes"?}``) as children of ``parent`` in one batch.
+
+    Steps inherit the parent's deadline and weights, so they score like the parent does.
+    """
+    now = timezone.now()
+    children = []
+    for step in steps:
+        child = Task(
+            owner_id=parent.owner_id,
+            parent=parent,
+            title=step["title"][:200],
+            estimated_minutes=step.get("estimated_minutes") or parent.estimated_minutes,
+            due_at=parent.due_at,
+            is_hard_deadline=parent.is_hard_deadline,
+            urgency=parent.urgency,
+            importance=parent.importance,
+        )
+        child.refresh_priority(now)
+        children.append(child)
+    if not children:
+        return []
+
+    ancestors = [(parent.id, 0), *TaskClosure.objects.filter(descendant=parent).values_list("ancestor_id", "depth")]
+    with transaction.atomic():
+        assign_change_seqs(children)
+        Task.objects.bulk_create(children)
+        TaskClosure.objects.bulk_create(
+            TaskClosure(ancestor_id=ancestor_id, descendant=child, depth=depth + 1)
+            for child in children
+            for ancestor_id, depth in ancestors
+        )
+        TaskActivityLog.objects.bulk_create(
+            TaskActivityLog(task=child, action="task_created_as_step", actor=actor, metadata={"parent_id": parent.id})
+            for child in children
+        )
+        index_tasks(children)
+        index_titles(children)
+    return children
+
+
+def subtask_progress(task_ids) -> dict[int, dict]:
+    """``{"done", "total"}`` over every descendant of each task that has subtasks, in one grouped query."""
+    rows = (
+        TaskClosure.objects.filter(ancestor_id__in=task_ids)
+        .values("ancestor_id")
+        .annotate(total=Count("id"), done=Count("id", filter=Q(descendant__status=TaskStatus.DONE)))
+    )
+    return {row["ancestor_id"]: {"done": row["done"], "total": row["total"]} for row in rows}
+
+
+def attach_subtask_progress(tasks) -> None:
+    progress = subtask_progress([task.id for task in tasks])
+    for task in tasks:
+        task.subtask_progress = progress.get(task.id)
+
+
+def complete_subtasks(task: Task, now=None) -> int:
+    """Complete every open descendant of ``task``: one subtree query and one batched update."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        descendants = list(
+            Task.objects.filter(ancestor_links__ancestor=task)
+            .exclude(status=TaskStatus.DONE)
+            .select_for_update()
+            .only("id", "owner_id", "status", "next_rescore_at", "change_seq")
+        )
+        if not descendants:
+            return 0
+        for descendant in descendants:
+            descendant.status = TaskStatus.DONE
+            descendant.next_rescore_at = None
+            descendant.updated_at = now
+        assign_change_seqs(descendants)
+        Task.objects.bulk_update(descendants, ["status", "next_rescore_at", "updated_at", "change_seq"])
+        TaskActivityLog.objects.bulk_create(
+            TaskActivityLog(
+                task=descendant,
+                action="task_completed_with_parent",
+                actor="system",
+                metadata={"parent_id": task.id},
+            )
+            for descendant in descendants
+        )
+    return len(descendants)
+
+
+def search_task_ids(user, query: str, limit: int) -> list[int]:
+    """Ids of the user's tasks matching every term of ``query`` (as prefixes), best match first."""
+    terms = query_terms(query)
+    if not terms:
+        return []
+    return [task_id for task_id, _ in get_search_backend().search(user.id, terms, limit)]
+
+
+def task_list_version(user) -> int:
+    """Cheap validator for any stored task representation of ``user``: bumps on every write, delete or rescore."""
+    return TaskSyncState.current(user.id)
+
+
+def pending_transitions_version(user, now=None) -> list:
+    """The latest snooze expiry and priority threshold of ``user`` that have passed but not been applied yet.
+
+    prioritized_tasks_for_user ranks by these before the waker writes them, so validators of prioritized
+    reads include this alongside task_list_version. Both come off the owner indexes.
+    """
+    now = now or timezone.now()
+    woken = (
+        Task.objects.filter(owner=user, status=TaskStatus.SNOOZED, snoozed_until__lte=now)
+        .order_by("-snoozed_until")
+        .values_list("snoozed_until", flat=True)
+        .first()
+    )
+    rescored = (
+        Task.objects.filter(owner=user, next_rescore_at__lte=now)
+        .exclude(status=TaskStatus.DONE)
+        .order_by("-next_rescore_at")
+        .values_list("next_rescore_at", flat=True)
+        .first()
+    )
+    return [woken, rescored]
 
 
 def active_tasks_for_user(user) -> QuerySet[Task]:
     return Task.objects.filter(owner=user, status=TaskStatus.ACTIVE)
 
 
-def task_priority_score(task: Task) -> int:
-    score = (task.importance * 3) + (task.urgency * 2)
+def rescore_due_tasks(now=None, owner=None, batch_size: int = 500) -> int:
+    """Refresh the materialized priority of tasks whose next_rescore_at has passed."""
+    now = now or timezone.now()
+    queryset = Task.objects.filter(next_rescore_at__lte=now).exclude(status=TaskStatus.DONE)
+    if owner is not None:
+        queryset = queryset.filter(owner=owner)
+
+    rescored = 0
+    while True:
+        batch = list(
+            queryset.order_by("next_rescore_at").only(
+                "id",
+                "owner_id",
+                "status",
+                "importance",
+                "urgency",
+                "due_at",
+                "last_nudged_at",
+                "priority_score",
+                "change_seq",
+            )[:batch_size]
+        )
+        if not batch:
+            break
+        changed = []
+        for task in batch:
+            previous_score = task.priority_score
+            task.refresh_priority(now)
+            if task.priority_score != previous_score:
+                changed.append(task)
+        with transaction.atomic():
+            # A changed score is a change clients must sync.
+            assign_change_seqs(changed)
+            Task.objects.bulk_update(batch, ["priority_score", "next_rescore_at", "change_seq"])
+            if changed:
+                transaction.on_commit(lambda changed=changed: tasks_rescored.send(sender=Task, tasks=changed))
+        rescored += len(batch)
+        if len(batch) < batch_size:
+            break
+    return rescored
+
+
+def wake_snoozed_tasks(now=None, owner=None, batch_size: int = 500) -> int:
+    """Return snoozed tasks whose snoozed_until has passed to active, in batches; sends tasks_woken."""
+    now = now or timezone.now()
+    queryset = Task.objects.filter(status=TaskStatus.SNOOZED, snoozed_until__lte=now)
+    if owner is not None:
+        queryset = queryset.filter(owner=owner)
+
+    woken = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                queryset.order_by("snoozed_until")
+                .select_for_update(skip_locked=True)
+                .only(
+                    "id",
+                    "owner_id",
+                    "status",
+                    "snoozed_until",
+                    "importance",
+                    "urgency",
+                    "due_at",
+                    "last_nudged_at",
+                    "priority_score",
+                    "next_rescore_at",
+                    "change_seq",
+                )[:batch_size]
+            )
+            if not batch:
+                break
+            for task in batch:
+                task.status = TaskStatus.ACTIVE
+                task.snoozed_until = None
+                task.updated_at = now
+                task.refresh_priority(now)
+            assign_change_seqs(batch)
+            Task.objects.bulk_update(
+                batch,
+                ["status", "snoozed_until", "updated_at", "priority_score", "next_rescore_at", "change_seq"],
+            )
+            TaskActivityLog.objects.bulk_create(
+                TaskActivityLog(task=task, action="task_woken", actor="system") for task in batch
+            )
+            transaction.on_commit(lambda batch=batch: tasks_woken.send(sender=Task, tasks=batch))
+        woken += len(batch)
+        if len(batch) < batch_size:
+            break
+    if woken:
+        logger.info("TASKS_WOKEN count=%s owner_id=%s", woken, getattr(owner, "id", None))
+    return woken
+
+
+def next_task_transitions(limit: int = 500) -> list[tuple]:
+    """The earliest upcoming snooze expiries and priority thresholds, as ``(at, kind)`` pairs.
+
+    Both come straight off partial indexes, so this never scans the task table.
+    """
+    wakes = (
+        Task.objects.filter(status=TaskStatus.SNOOZED, snoozed_until__isnull=False)
+        .order_by("snoozed_until")
+        .values_list("snoozed_until", flat=True)[:limit]
+    )
+    rescores = (
+        Task.objects.filter(next_rescore_at__isnull=False)
+        .exclude(status=TaskStatus.DONE)
+        .order_by("next_rescore_at")
+        .values_list("next_rescore_at", flat=True)[:limit]
+    )
+    return [(at, "wake") for at in wakes] + [(at, "rescore") for at in rescores]
+
+
+PRIORITY_ORDERING = ("-priority_score", F("due_at").asc(nulls_last=True), "-urgency", "-importance", "created_at")
+# Most tasks with an unapplied transition a prioritized read re-scores; past this the waker is lagging badly.
+MAX_STALE_CANDIDATES = 200
+
+
+def prioritized_tasks_for_user(user, limit: int = 5, with_metadata: bool = False) -> list[Task]:
+    """Top ``limit`` active tasks by priority score, as of now.
+
+    Reads never write: snoozes that expired and scores that crossed a threshold since the waker last ran
+    are applied in memory only (TaskWaker and the beat jobs persist them), so the ranking always matches
+    task_priority_score. Ties go to the earliest due date (undated last), then urgency, importance and age.
+    Artifacts are never loaded and ``metadata_json`` is deferred unless ``with_metadata`` is set.
+    """
+    now = timezone.now()
+    # A task broken into steps is worked through its steps, so it gives way to them while any is open.
+    open_steps = TaskClosure.objects.filter(ancestor=OuterRef("pk"), descendant__status=TaskStatus.ACTIVE)
+    queryset = Task.objects.filter(owner=user).filter(~Exists(open_steps))
+    if not with_metadata:
+        queryset = queryset.defer("metadata_json")
+
+    # Only a task with a passed transition can rank differently from its stored score, and only upwards
+    # by at most MAX_SCORE_RISE. So the stored top ``limit`` plus the stale tasks that could still reach
+    # its lowest score (both read off owner indexes) contain the true top ``limit``.
+    ranked = list(queryset.filter(status=TaskStatus.ACTIVE).order_by(*PRIORITY_ORDERING)[:limit])
+    floor = ranked[-1].priority_score - MAX_SCORE_RISE if ranked and len(ranked) == limit else 0
+    passed = Q(status=TaskStatus.ACTIVE, next_rescore_at__lte=now) | Q(
+        status=TaskStatus.SNOOZED, snoozed_until__lte=now
+    )
+    stale = list(
+        queryset.filter(passed, priority_score__gte=floor).order_by(*PRIORITY_ORDERING)[: MAX_STALE_CANDIDATES + 1]
+    )
+    if len(stale) > MAX_STALE_CANDIDATES:
+        # Best effort until the waker catches up: the highest stored scores are the likeliest to rank.
+        logger.warning("TASKS_PRIORITY_STALE_BACKLOG owner_id=%s limit=%s", user.id, MAX_STALE_CANDIDATES)
+        stale = stale[:MAX_STALE_CANDIDATES]
+    candidates = {task.id: task for task in ranked}
+    for task in stale:
+        candidates.setdefault(task.id, task)
+    for task in candidates.values():
+        if task.status == TaskStatus.SNOOZED:
+            task.status = TaskStatus.ACTIVE
+            task.snoozed_until = None
+        task.refresh_priority(now)
+    return sorted(candidates.values(), key=_priority_sort_key)[:limit]
+
+
+def _priority_sort_key(task: Task) -> tuple:
+    """PRIORITY_ORDERING as a Python sort key."""
+    return (
+        -task.priority_score,
+        task.due_at is None,
+        task.due_at or task.created_at,
+        -task.urgency,
+        -task.importance,
+        task.created_at,
+    )
+
+
+def enqueue_task_import(
+    user,
+    upload,
+    import_format: str,
+    user_timezone: str | None = None,
+    dispatch: bool = True,
+) -> TaskImportJob:
+    """Store the uploaded file and queue its import; with ``dispatch=False`` the caller runs it."""
+    job = TaskImportJob.objects.create(
+        owner=user,
+        format=import_format,
+        source=upload,
+        size=upload.size or 0,
+        timezone=user_timezone or "",
+    )
+    if dispatch:
+        _dispatch_task_import(job)
+    logger.info("TASK_IMPORT_QUEUED user_id=%s job_id=%s format=%s bytes=%s", user.id, job.id, job.format, job.size)
+    return job
+
+
+def resume_task_import(job: TaskImportJob, include_processing: bool = False, dispatch: bool = True) -> bool:
+    """Queue a failed import again; it continues after the last committed batch.
+
+    ``include_processing`` also takes over a job left processing by a worker that died; only pass it
+    when no worker can still be running the job.
+    """
+    statuses = [TaskImportStatus.FAILED, *([TaskImportStatus.PROCESSING] if include_processing else [])]
+    resumed = TaskImportJob.objects.filter(id=job.id, status__in=statuses).update(
+        status=TaskImportStatus.QUEUED,
+        error="",
+        finished_at=None,
+        updated_at=timezone.now(),
+    )
+    if resumed:
+        job.refresh_from_db()
+        if dispatch:
+            _dispatch_task_import(job)
+    return bool(resumed)
+
+
+def _dispatch_task_import(job: TaskImportJob) -> None:
+    from .tasks import import_tasks_job
+
+    def dispatch():
+        try:
+            import_tasks_job.delay(job.id)
+        except Exception as exc:
+            logger.exception("TASK_IMPORT_ENQUEUE_FAILED job_id=%s", job.id)
+            TaskImportJob.objects.filter(id=job.id, status=TaskImportStatus.QUEUED).update(
+                status=TaskImportStatus.FAILED,
+                error=f"Could not queue import: {exc}"[:2000],
+                finished_at=timezone.now(),
+                updated_at=timezone.now(),
+            )
+
+    transaction.on_commit(dispatch)
+
+
+def run_task_import(job_id: int, batch_size: int | None = None, on_progress=None) -> TaskImportJob | None:
+    """Import a queued job's file, streaming it record by record and committing every ``batch_size`` records.
+
+    Invalid records are skipped and reported; a file-level error or an exception fails the job, which
+    keeps the position of the last committed batch so resume_task_import() can continue from there.
+    ``on_progress`` is called with the job after each batch.
+    """
     now = timezone.now()
+    # Claim the job atomically so a redelivered message cannot import it twice.
+    claimed = TaskImportJob.objects.filter(id=job_id, status=TaskImportStatus.QUEUED).update(
+        status=TaskImportStatus.PROCESSING,
+        started_at=now,
+        updated_at=now,
+    )
+    if not claimed:
+        logger.info("TASK_IMPORT_SKIPPED job_id=%s", job_id)
+        return None
 
-    if task.due_at:
-        if task.due_at < now:
-            score += 12
-        elif task.due_at <= now + timedelta(hours=24):
-            score += 8
-        elif task.due_at <= now + timedelta(days=3):
-            score += 4
+    job = TaskImportJob.objects.get(id=job_id)
+    batch_size = batch_size or settings.CUE_TASK_IMPORT_BATCH_SIZE
+    tz = owner_timezones([job.owner_id])[job.owner_id]
+    if job.timezone:
+        try:
+            tz = ZoneInfo(job.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
 
-    if task.last_nudged_at and task.last_nudged_at >= now - timedelta(hours=2):
-        score -= 4
+    try:
+        with job.source.open("rb") as stream:
+            tasks, errors, last = [], [], None
+            for record in iter_task_records(stream, job.format, job.offset, job.line):
+                try:
+                    tasks.append(Task(owner_id=job.owner_id, **task_values(record.fields, tz)))
+                except ImportRowError as exc:
+                    errors.append({"line": record.line, "error": str(exc)})
+                last = record
+                if len(tasks) + len(errors) >= batch_size:
+                    _commit_import_batch(job, tasks, errors, last)
+                    tasks, errors = [], []
+                    if on_progress:
+                        on_progress(job)
+            if last is not None and (tasks or errors):
+                _commit_import_batch(job, tasks, errors, last)
+                if on_progress:
+                    on_progress(job)
+        job.status = TaskImportStatus.SUCCEEDED
+    except ImportFileError as exc:
+        job.status = TaskImportStatus.FAILED
+        job.error = str(exc)
+    except Exception as exc:
+        logger.exception("TASK_IMPORT_FAILED job_id=%s offset=%s", job.id, job.offset)
+        job.status = TaskImportStatus.FAILED
+        job.error = str(exc)[:2000]
 
-    return max(score, 0)
+    job.finished_at = timezone.now()
+    update_fields = ["status", "error", "finished_at", "updated_at"]
+    if job.status == TaskImportStatus.SUCCEEDED and job.source:
+        job.source.delete(save=False)
+        update_fields.append("source")
+    job.save(update_fields=update_fields)
+    logger.info(
+        "TASK_IMPORT_DONE job_id=%s status=%s imported=%s skipped=%s total_ms=%s",
+        job.id,
+        job.status,
+        job.imported_count,
+        job.skipped_count,
+        int((job.finished_at - job.started_at).total_seconds() * 1000) if job.started_at else None,
+    )
+    return job
 
 
-def prioritized_tasks_for_user(user, limit: int = 5):
-    tasks = list(active_tasks_for_user(user))
-    ranked = sorted(tasks, key=task_priority_score, reverse=True)
-    return ranked[:limit]
+def _commit_import_batch(job: TaskImportJob, tasks: list[Task], errors: list[dict], last) -> None:
+    """Write one batch of imported tasks together with the job's new position."""
+    now = timezone.now()
+    for task in tasks:
+        task.refresh_priority(now)
+    with transaction.atomic():
+        assign_change_seqs(tasks)
+        Task.objects.bulk_create(tasks)
+        TaskActivityLog.objects.bulk_create(
+            TaskActivityLog(task=task, action="task_imported", actor="user", metadata={"import_job_id": job.id})
+            for task in tasks
+        )
+        # Bulk writes skip post_save, so index here.
+        index_tasks(tasks)
+        index_titles(tasks)
+        job.offset = last.end_offset
+        job.line = last.end_line
+        job.imported_count += len(tasks)
+        job.skipped_count += len(errors)
+        job.row_errors = [*job.row_errors, *errors][: TaskImportJob.MAX_REPORTED_ERRORS]
+        job.save(update_fields=["offset", "line", "imported_count", "skipped_count", "row_errors", "updated_at"])
+    # With DEBUG on, every batch's SQL would otherwise stay in connection.queries until the import ends.
+    reset_queries()
+    logger.info(
+        "TASK_IMPORT_PROGRESS job_id=%s imported=%s skipped=%s bytes=%s/%s",
+        job.id,
+        job.imported_count,
+        job.skipped_count,
+        job.offset,
+        job.size,
+    )
@@ -0,0 +1,31 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .dedup import index_titles
+from .models import Task
+from .search import INDEXED_FIELDS, index_tasks, remove_tasks
+
+
+@receiver(post_save, sender=Task, dispatch_uid="tasks_index_task_search")
+def index_task_search(sender, instance: Task, update_fields=None, raw=False, using=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not INDEXED_FIELDS & set(update_fields):
+        return
+    index_tasks([instance], connection=connections[using])
+
+
+@receiver(post_save, sender=Task, dispatch_uid="tasks_index_task_title")
+def index_task_title(sender, instance: Task, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and "title" not in update_fields:
+        return
+    index_titles([instance])
+
+
+@receiver(post_delete, sender=Task, dispatch_uid="tasks_remove_task_search")
+def remove_task_search(sender, instance: Task, using=None, **kwargs):
+    remove_tasks([instance.id], connection=connections[using])
+
@@ -0,0 +1,29 @@
+from celery import shared_task
+
+
+@shared_task(name="tasks.rescore_due_tasks")
+def rescore_due_tasks_job():
+    from apps.tasks.services import rescore_due_tasks
+
+    return rescore_due_tasks()
+
+
+@shared_task(name="tasks.wake_snoozed_tasks")
+def wake_snoozed_tasks_job():
+    from apps.tasks.services import wake_snoozed_tasks
+
+    return wake_snoozed_tasks()
+
+
+@shared_task(name="tasks.materialize_recurring_tasks")
+def materialize_recurring_tasks_job():
+    from apps.tasks.services import materialize_recurring_tasks
+
+    return materialize_recurring_tasks()
+
+
+@shared_task(name="tasks.import_tasks")
+def import_tasks_job(job_id: int):
+    from apps.tasks.services import run_task_import
+
+    run_task_import(job_id)
@@ -0,0 +1,116 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.tasks.activity import ActivityLogBuffer
+from apps.tasks.models import Task, TaskActivityLog, TaskStatus, TaskSyncState
+from apps.tasks.services import log_task_activity, prioritized_tasks_for_user
+
+
+class ActivityLogSpoolTests(TestCase):
+    def setUp(self):
+        spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, spool_dir, ignore_errors=True)
+        self.spool_path = Path(spool_dir) / "activity.jsonl"
+        owner = get_user_model().objects.create_user(username="activity-owner")
+        self.task = Task.objects.create(owner=owner, title="Water the plants")
+        # Flushed by hand below; the interval only keeps the background worker from flushing first.
+        self.buffer = ActivityLogBuffer(batch_size=100, flush_interval_seconds=3600, spool_path=self.spool_path)
+
+    def queue(self, *actions: str) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            for action in actions:
+                self.buffer.add(TaskActivityLog(task=self.task, action=action, actor="user", metadata={"n": 1}))
+
+    def test_failed_flush_is_spooled_and_replayed(self):
+        self.queue("task_updated", "task_snoozed")
+        with (
+            mock.patch("apps.tasks.activity.write_activity_entries", side_effect=DatabaseError("database is down")),
+            self.assertLogs("apps.tasks.activity", level="WARNING") as logs,
+        ):
+            self.assertEqual(self.buffer.flush(), 0)
+        self.assertIn("TASK_ACTIVITY_SPOOLED entries=2", logs.output[-1])
+
+        self.assertEqual(len(self.spool_path.read_text().splitlines()), 2)
+        self.assertFalse(TaskActivityLog.objects.filter(task=self.task).exists())
+
+        output = StringIO()
+        call_command("replay_activity_spool", path=str(self.spool_path), stdout=output)
+        self.assertIn("Inserted 2 activity entries.", output.getvalue())
+        self.assertEqual(
+            sorted(TaskActivityLog.objects.filter(task=self.task).values_list("action", flat=True)),
+            ["task_snoozed", "task_updated"],
+        )
+        self.assertFalse(self.spool_path.exists())
+        self.assertFalse(self.spool_path.with_name(f"{self.spool_path.name}.replaying").exists())
+
+    def test_flush_writes_queued_entries(self):
+        self.queue("task_updated")
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertFalse(self.spool_path.exists())
+
+    @override_settings(CUE_ACTIVITY_LOG_MODE="sync")
+    def test_sync_mode_writes_immediately(self):
+        entry = log_task_activity(self.task, action="task_completed", actor="user")
+        self.assertIsNotNone(entry.pk)
+
+
+class PrioritizedTasksTests(TestCase):
+    def setUp(self):
+        self.owner = get_user_model().objects.create_user(username="priority-owner")
+        self.now = timezone.now()
+
+    def create(self, count: int, **values) -> list[Task]:
+        tasks = [Task(owner=self.owner, title=f"Task {index}", **values) for index in range(count)]
+        for task in tasks:
+            task.refresh_priority(self.now)
+        return Task.objects.bulk_create(tasks)
+
+    def test_passed_transitions_are_ranked_at_their_current_score_without_writing(self):
+        (steady,) = self.create(1, urgency=3, importance=3)
+        (due,) = self.create(1, urgency=1, importance=1, due_at=self.now + timedelta(days=2))
+        (snoozed,) = self.create(1, urgency=4, importance=4, status=TaskStatus.SNOOZED)
+        # The waker has not run since the task became overdue and the snooze expired.
+        Task.objects.filter(id=due.id).update(due_at=self.now - timedelta(minutes=1), next_rescore_at=self.now)
+        Task.objects.filter(id=snoozed.id).update(snoozed_until=self.now - timedelta(minutes=1))
+        version = TaskSyncState.current(self.owner.id)
+
+        top = prioritized_tasks_for_user(self.owner, limit=2)
+
+        self.assertEqual([task.id for task in top], [snoozed.id, due.id])
+        self.assertEqual([task.priority_score for task in top], [20, 17])
+        self.assertEqual(Task.objects.get(id=due.id).priority_score, 9)
+        self.assertEqual(Task.objects.get(id=snoozed.id).status, TaskStatus.SNOOZED)
+        self.assertEqual(TaskSyncState.current(self.owner.id), version)
+        self.assertNotIn(steady.id, [task.id for task in top])
+
+    def test_stale_tasks_that_cannot_reach_the_top_are_not_loaded(self):
+        important = self.create(3, urgency=5, importance=5)
+        # Recently nudged (score 1): even with every bonus they stay below the third task's 25.
+        stale = self.create(300, urgency=1, importance=1, last_nudged_at=self.now - timedelta(hours=1))
+        Task.objects.filter(id__in=[task.id for task in stale]).update(next_rescore_at=self.now)
+
+        with self.assertNoLogs("apps.tasks.services", level="WARNING"), self.assertNumQueries(2):
+            top = prioritized_tasks_for_user(self.owner, limit=3)
+        self.assertEqual({task.id for task in top}, {task.id for task in important})
+
+    def test_stale_backlog_is_capped(self):
+        stale = self.create(300, urgency=1, importance=1, due_at=self.now + timedelta(days=2))
+        Task.objects.filter(id__in=[task.id for task in stale]).update(
+            due_at=self.now - timedelta(minutes=1), next_rescore_at=self.now
+        )
+
+        with self.assertLogs("apps.tasks.services", level="WARNING") as logs:
+            top = prioritized_tasks_for_user(self.owner, limit=5)
+        self.assertIn("TASKS_PRIORITY_STALE_BACKLOG", logs.output[0])
+        self.assertEqual(len(top), 5)
+        self.assertTrue(all(task.priority_score == 17 for task in top))
@@ -0,0 +1,85 @@
+import heapq
+import logging
+import time
+
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .services import next_task_transitions, rescore_due_tasks, wake_snoozed_tasks
+
+
+logger = logging.getLogger(__name__)
+
+
+class TaskWaker:
+    """Sleeps until the next snooze expiry or priority threshold and applies whatever is due.
+
+    Upcoming transitions sit in a min-heap loaded from the ``snoozed_until`` / ``next_rescore_at``
+    indexes (at most ``lookahead`` of each). Transitions written by other processes after the load
+    are picked up by reloading at least every ``refresh_seconds``.
+    """
+
+    def __init__(
+        self,
+        lookahead: int = 500,
+        refresh_seconds: float = 30.0,
+        batch_size: int = 500,
+        clock=timezone.now,
+        sleep=time.sleep,
+    ):
+        self.lookahead = lookahead
+        self.refresh_seconds = refresh_seconds
+        self.batch_size = batch_size
+        self.clock = clock
+        self.sleep = sleep
+        self._heap: list[tuple] = []
+        self._loaded_at = None
+
+    def load(self, now) -> None:
+        self._heap = next_task_transitions(self.lookahead)
+        heapq.heapify(self._heap)
+        self._loaded_at = now
+
+    def run_due(self, now) -> dict:
+        """Pop every transition at or before ``now`` and apply them; returns counts per kind."""
+        kinds = set()
+        while self._heap and self._heap[0][0] <= now:
+            kinds.add(heapq.heappop(self._heap)[1])
+        counts = {}
+        if "wake" in kinds:
+            counts["woken"] = wake_snoozed_tasks(now, batch_size=self.batch_size)
+        if "rescore" in kinds:
+            counts["rescored"] = rescore_due_tasks(now, batch_size=self.batch_size)
+        return counts
+
+    def seconds_until_next(self, now) -> float:
+        refresh_at = self.refresh_seconds - (now - self._loaded_at).total_seconds()
+        if not self._heap:
+            return max(refresh_at, 0.0)
+        return max(min((self._heap[0][0] - now).total_seconds(), refresh_at), 0.0)
+
+    def step(self) -> dict:
+        now = self.clock()
+        if self._loaded_at is None or (now - self._loaded_at).total_seconds() >= self.refresh_seconds:
+            self.load(now)
+        counts = self.run_due(now)
+        if counts:
+            # Applying transitions schedules new ones (e.g. the next priority threshold).
+            self.load(now)
+            logger.info("TASK_WAKER_APPLIED %s", " ".join(f"{kind}={count}" for kind, count in counts.items()))
+        return counts
+
+    def run(self, iterations: int | None = None) -> None:
+        completed = 0
+        while iterations is None or completed < iterations:
+            try:
+                self.step()
+            except Exception:
+                logger.exception("TASK_WAKER_STEP_FAILED")
+                self._loaded_at = None
+            finally:
+                close_old_connections()
+            completed += 1
+            if iterations is not None and completed >= iterations:
+                break
+            self.sleep(self.seconds_until_next(self.clock()) if self._loaded_at else self.refresh_seconds)
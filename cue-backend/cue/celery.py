@@ -0,0 +1,16 @@
+"""
+Celery application for cue project.
+
+Start a worker with:
+    celery -A cue worker -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cue.settings")
+
+app = Celery("cue")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
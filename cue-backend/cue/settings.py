@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -100,6 +101,51 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CUE_REDIS_URL = os.getenv("REDIS_URL", "")
+
+if CUE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CUE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
+# Celery
+# https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html
+
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", CUE_REDIS_URL or "redis://127.0.0.1:6379/0")
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "false").lower() == "true"
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_BEAT_SCHEDULE = {
+    "materialize-recurring-tasks": {
+        "task": "tasks.materialize_recurring_tasks",
+        "schedule": 3600.0,
+    },
+    # Polling fallbacks; `manage.py run_task_waker` applies both exactly when they become due.
+    "rescore-due-tasks": {
+        "task": "tasks.rescore_due_tasks",
+        "schedule": 60.0,
+    },
+    "wake-snoozed-tasks": {
+        "task": "tasks.wake_snoozed_tasks",
+        "schedule": 60.0,
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -136,6 +182,9 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+MEDIA_URL = "media/"
+MEDIA_ROOT = Path(os.getenv("DJANGO_MEDIA_ROOT", BASE_DIR / "media"))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -143,10 +192,54 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.AllowAny",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.core.api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.core.api.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
+# MessagePack is negotiated via Accept / Content-Type: application/msgpack when the package is installed.
+if find_spec("msgpack"):
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"].insert(1, "apps.core.api.renderers.MessagePackRenderer")
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"].insert(1, "apps.core.api.parsers.MessagePackParser")
+
 CUE_OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 CUE_OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+CUE_OPENAI_FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-4.1-nano")
+# Model tiers and the ordered tiers each LLM call type may use; later tiers are latency fallbacks.
+CUE_OPENAI_MODEL_TIERS = {
+    "planner": CUE_OPENAI_MODEL,
+    "fast": CUE_OPENAI_FAST_MODEL,
+}
+CUE_OPENAI_MODEL_ROUTES = {
+    "plan_turn": ["planner", "fast"],
+    "refine_task_artifact": ["planner", "fast"],
+    "break_task_into_steps": ["planner", "fast"],
+    "build_task_render_spec": ["fast"],
+    "extract_task_title": ["fast"],
+    "rewrite_assistant_reply": ["fast"],
+}
+CUE_PLANNER_PROMPT_VERSION = os.getenv("CUE_PLANNER_PROMPT_VERSION", "v1")
+CUE_OPENAI_FAILOVER_P95_MS = int(os.getenv("CUE_OPENAI_FAILOVER_P95_MS", "8000"))
+CUE_OPENAI_LATENCY_WINDOW_SECONDS = int(os.getenv("CUE_OPENAI_LATENCY_WINDOW_SECONDS", "300"))
+CUE_OPENAI_LATENCY_MIN_SAMPLES = int(os.getenv("CUE_OPENAI_LATENCY_MIN_SAMPLES", "5"))
+CUE_LLM_CACHE_ENABLED = os.getenv("CUE_LLM_CACHE_ENABLED", "false").lower() == "true"
+CUE_LLM_CACHE_TTL_SECONDS = int(os.getenv("CUE_LLM_CACHE_TTL_SECONDS", "600"))
+CUE_LLM_CACHE_ALIAS = os.getenv("CUE_LLM_CACHE_ALIAS", "default")
+# "openai" or "local" (decodes uploaded bytes as text; for tests and offline development).
+CUE_VOICE_TRANSCRIBER = os.getenv("CUE_VOICE_TRANSCRIBER", "openai")
+CUE_ACTIVITY_LOG_MODE = os.getenv("CUE_ACTIVITY_LOG_MODE", "buffered").lower()
+CUE_ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("CUE_ACTIVITY_LOG_BATCH_SIZE", "200"))
+CUE_ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv("CUE_ACTIVITY_LOG_FLUSH_INTERVAL_SECONDS", "2"))
+CUE_ACTIVITY_LOG_SPOOL_PATH = os.getenv("CUE_ACTIVITY_LOG_SPOOL_PATH", str(BASE_DIR / "var" / "task_activity_spool.jsonl"))
+# Recurring tasks get occurrence rows only this far ahead; the rest are generated as time passes.
+CUE_RECURRENCE_WINDOW_DAYS = int(os.getenv("CUE_RECURRENCE_WINDOW_DAYS", "14"))
+CUE_TASK_IMPORT_BATCH_SIZE = int(os.getenv("CUE_TASK_IMPORT_BATCH_SIZE", "500"))
 CUE_VERBOSE_API_LOGGING = os.getenv("CUE_VERBOSE_API_LOGGING", str(DEBUG)).lower() == "true"
 CUE_SOCIAL_AUTH_RELAXED = os.getenv("CUE_SOCIAL_AUTH_RELAXED", str(DEBUG)).lower() == "true"
 GOOGLE_OAUTH_CLIENT_ID = os.getenv("GOOGLE_OAUTH_CLIENT_ID", "")